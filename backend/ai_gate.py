@@ -0,0 +1,79 @@
+"""
+AI Gate
+Decides whether a screening with enable_ai="auto" is worth a Gemini call,
+from where its local score falls relative to an uncertainty band
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from typing import Any, Dict, Optional
+
+# Gate decisions, as reported in ResumeScreeningResponse.ai_gate
+ALWAYS = 'always'              # enable_ai=True: Gemini is called regardless of the score
+UNCERTAIN = 'uncertain'        # auto, score inside the band: Gemini is called
+CLEAR_ACCEPT = 'clear_accept'  # auto, score at or above the band: local scores kept
+CLEAR_REJECT = 'clear_reject'  # auto, score below the band: local scores kept
+
+
+class AIGate:
+    """
+    Uncertainty band for adaptive Gemini calls.
+
+    The local (lexical) score already settles candidates far from the
+    decision boundary: one below ``low`` is a clear reject and one at or
+    above ``high`` a clear accept, and neither changes outcome with an LLM
+    opinion. Only scores in [low, high) are sent to Gemini.
+
+    The band defaults to AI_GATE_LOW=35 and AI_GATE_HIGH=80 (below 35 is
+    "Strongly not recommended"; 80+ sits in the recommended range).
+    """
+
+    def __init__(self, low: Optional[float] = None, high: Optional[float] = None) -> None:
+        self.low = float(os.getenv('AI_GATE_LOW', '35')) if low is None else low
+        self.high = float(os.getenv('AI_GATE_HIGH', '80')) if high is None else high
+        if self.low > self.high:
+            raise ValueError(f"AI gate band is empty: low {self.low:g} > high {self.high:g}")
+        self._lock = threading.Lock()
+        self._stats = {ALWAYS: 0, UNCERTAIN: 0, CLEAR_ACCEPT: 0, CLEAR_REJECT: 0}
+
+    def decide(self, enable_ai: Any, local_score: float) -> Optional[str]:
+        """
+        Gate decision for one screening
+
+        Args:
+            enable_ai: The request's enable_ai (True, False or "auto")
+            local_score: Final score of the local pipeline (0-100)
+
+        Returns:
+            ALWAYS or UNCERTAIN (call Gemini), CLEAR_ACCEPT or CLEAR_REJECT
+            (skip it), or None when AI was not requested
+        """
+        if enable_ai == 'auto':
+            if local_score < self.low:
+                decision = CLEAR_REJECT
+            elif local_score >= self.high:
+                decision = CLEAR_ACCEPT
+            else:
+                decision = UNCERTAIN
+        elif enable_ai:
+            decision = ALWAYS
+        else:
+            return None
+        with self._lock:
+            self._stats[decision] += 1
+        return decision
+
+    @staticmethod
+    def calls_ai(decision: Optional[str]) -> bool:
+        return decision in (ALWAYS, UNCERTAIN)
+
+    def stats(self) -> Dict[str, Any]:
+        """Decision counts, the band and the share of auto screenings that skipped Gemini"""
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+        auto = stats[UNCERTAIN] + stats[CLEAR_ACCEPT] + stats[CLEAR_REJECT]
+        stats['auto_skip_rate'] = round((stats[CLEAR_ACCEPT] + stats[CLEAR_REJECT]) / auto, 4) if auto else 0.0
+        stats['band'] = [self.low, self.high]
+        return stats
@@ -6,21 +6,21 @@ Exposes POST /chat compatible with the Next.js ChatWidget.tsx:
 - Response: { session_id: str, response: str, intent: str, context: dict }
 """
 
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 import os
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 
 from chatbot_core import HRChatbot
 from session_manager import SessionManager
 from jd_service import JDService
-from resume_screening_service import ResumeScreeningService, ResumeScreeningRequest, ResumeScreeningResponse
+from resume_screening_service import ResumeScreeningRequest, ResumeScreeningResponse, get_resume_screening_service
 
 
 class ChatRequest(BaseModel):
@@ -46,6 +46,7 @@ class JDGenerateRequest(BaseModel):
     responsibilities: list[str] | None = None
     company: str | None = None
     additional_notes: str | None = None
+    job_id: str | None = None  # Existing job being regenerated; drops its cached screening config
 
 
 class JDGenerateResponse(BaseModel):
@@ -71,7 +72,7 @@ app.add_middleware(
 session_manager = SessionManager()
 chatbot = HRChatbot(session_manager=session_manager)
 jds = JDService()
-resume_screening_service = ResumeScreeningService()
+resume_screening_service = get_resume_screening_service()
 
 
 @app.get("/health")
@@ -101,6 +102,10 @@ async def generate_jd(payload: JDGenerateRequest) -> JDGenerateResponse:
     urls = jds.upload_assets(jd_id, title, pdf, text)
     meta = {"role": payload.role, **payload.dict(exclude_none=True), "title": title, "jd_text": urls["jd_text"]}
     jds.save_metadata(jd_id, meta)
+    # Screenings must not keep using a stale cached config for a regenerated JD
+    resume_screening_service.invalidate_job_requirements(jd_id)
+    if payload.job_id:
+        resume_screening_service.invalidate_job_requirements(payload.job_id)
     return JDGenerateResponse(id=jd_id, title=title, text_url=urls["txt_url"], pdf_url=urls["pdf_url"], metadata=meta)
 
 
@@ -111,9 +116,78 @@ def get_jd(jd_id: str) -> Dict[str, Any]:
 
 
 @app.post("/resume/screen", response_model=ResumeScreeningResponse)
-def screen_resume(request: ResumeScreeningRequest) -> ResumeScreeningResponse:
+async def screen_resume(request: ResumeScreeningRequest) -> ResumeScreeningResponse:
     """Screen a resume against job requirements using AI"""
-    return resume_screening_service.screen_resume(request)
+    return await resume_screening_service.screen_resume_async(request)
+
+
+@app.post("/resume/jobs", status_code=202)
+def enqueue_resume_screening(
+    request: ResumeScreeningRequest,
+    priority: int = Query(0, description="Higher runs first"),
+) -> Dict[str, Any]:
+    """Queue a resume screening and return its job id without waiting for the result"""
+    if resume_screening_service.job_queue is None:
+        raise HTTPException(status_code=503, detail="Screening job queue is not available")
+    return resume_screening_service.enqueue_screening(request, priority=priority)
+
+
+@app.get("/resume/jobs/{job_id}")
+def resume_screening_job(job_id: str) -> Dict[str, Any]:
+    """Status of a queued screening and, once finished, its result or error"""
+    job = resume_screening_service.get_screening_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Screening job not found")
+    return job
+
+
+@app.get("/resume/leaderboard/{job_id}")
+def resume_leaderboard(
+    job_id: str,
+    limit: int = Query(10, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    min_score: Optional[float] = None,
+    max_score: Optional[float] = None,
+    skill: Optional[List[str]] = Query(None, description="Required skill; repeat for several"),
+    min_experience_years: Optional[float] = None,
+    domain: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Screened candidates of a job, best first, with optional filters"""
+    return resume_screening_service.get_leaderboard(
+        job_id, limit=limit, offset=offset, min_score=min_score, max_score=max_score,
+        skills=skill, min_experience_years=min_experience_years, domain=domain
+    )
+
+
+@app.post("/resume/leaderboard/{job_id}/rescore")
+def rescore_resume_leaderboard(job_id: str) -> Dict[str, Any]:
+    """Re-rank a job's candidates against its current requirements (no re-parsing, no LLM calls)"""
+    return resume_screening_service.rescore_job(job_id)
+
+
+@app.post("/resume/leaderboard/{job_id}/cascade")
+async def cascade_resume_leaderboard(
+    job_id: str,
+    top_k: Optional[int] = Query(None, ge=0, le=500, description="Candidates reranked by Gemini"),
+    concurrency: Optional[int] = Query(None, ge=1, le=64, description="Simultaneous Gemini calls"),
+) -> Dict[str, Any]:
+    """Rank all of a job's candidates locally, then rerank only the top-K with Gemini"""
+    return await resume_screening_service.cascade_rank(job_id, top_k=top_k, concurrency=concurrency)
+
+
+@app.get("/resume/leaderboard/{job_id}/{candidate_id}")
+def resume_leaderboard_entry(job_id: str, candidate_id: str) -> Dict[str, Any]:
+    """One candidate's leaderboard entry and rank"""
+    entry = resume_screening_service.leaderboard.get(job_id, candidate_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Candidate not found on this job's leaderboard")
+    return entry
+
+
+@app.get("/resume/cache/stats")
+def resume_cache_stats() -> Dict[str, Any]:
+    """Hit rates of the resume screening caches"""
+    return resume_screening_service.cache_stats()
 
 
 if __name__ == "__main__":
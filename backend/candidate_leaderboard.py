@@ -0,0 +1,350 @@
+"""
+Candidate Leaderboard
+Per-job index of screened candidates in SQLite, answering top-K, score-range
+and skill/experience/domain filter queries without re-scoring
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from persistent_cache import DEFAULT_CACHE_DIR
+from skill_ontology import canonical_skill_set
+
+COMPONENT_COLUMNS = ['education', 'experience', 'domain', 'language', 'skill_match']
+
+_SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS leaderboard ("
+    "job_id TEXT NOT NULL, candidate_id TEXT NOT NULL, candidate_name TEXT, score REAL NOT NULL, "
+    + ", ".join(f"{column} REAL" for column in COMPONENT_COLUMNS) + ", "
+    "experience_years REAL, candidate_domain TEXT, recommendation TEXT, details TEXT, screened_at REAL, "
+    "PRIMARY KEY (job_id, candidate_id))",
+    "CREATE INDEX IF NOT EXISTS leaderboard_by_score ON leaderboard (job_id, score DESC, candidate_id)",
+    "CREATE TABLE IF NOT EXISTS leaderboard_skills ("
+    "job_id TEXT NOT NULL, skill_id TEXT NOT NULL, candidate_id TEXT NOT NULL, "
+    "PRIMARY KEY (job_id, skill_id, candidate_id)) WITHOUT ROWID",
+    # Replacing or removing a candidate deletes their skill rows
+    "CREATE INDEX IF NOT EXISTS leaderboard_skills_by_candidate ON leaderboard_skills (job_id, candidate_id)",
+    "CREATE TABLE IF NOT EXISTS candidate_features ("
+    "candidate_id TEXT PRIMARY KEY, features TEXT NOT NULL, stored_at REAL NOT NULL)",
+    # Fitted JD relevance document frequencies per job (see jd_relevance.py)
+    "CREATE TABLE IF NOT EXISTS jd_relevance_fits ("
+    "job_id TEXT PRIMARY KEY, text_hash TEXT NOT NULL, state TEXT NOT NULL, fitted_at REAL NOT NULL)",
+]
+
+_ENTRY_COLUMNS = (['candidate_id', 'candidate_name', 'score'] + COMPONENT_COLUMNS
+                  + ['experience_years', 'candidate_domain', 'recommendation', 'details', 'screened_at'])
+
+
+def _number(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class CandidateLeaderboard:
+    """
+    Sorted per-job store of screening results.
+
+    Each candidate is one row keyed by (job_id, candidate_id) with the final
+    score, component scores and a few filterable features; an index on
+    (job_id, score DESC) serves top-K and score-range queries, and a
+    (job_id, skill_id) table serves "has skill X" filters. Skills are stored
+    as canonical skill IDs, so 'Node.js' and 'nodejs' filter alike.
+    Re-screening a candidate replaces their row.
+
+    The parsed resume behind each entry is kept once per candidate (shared
+    by every job they applied to), so a job can be re-scored against new
+    requirements without the PDF. The job's fitted JD relevance model is
+    kept here too, so its scores survive a restart.
+
+    The database defaults to LEADERBOARD_DB_PATH or
+    backend/.cache/leaderboard.sqlite3; if it cannot be opened the
+    leaderboard lives in memory for the life of the process.
+    """
+
+    def __init__(self, db_path: Optional[str] = None) -> None:
+        self.db_path = db_path or os.getenv('LEADERBOARD_DB_PATH') or os.path.join(DEFAULT_CACHE_DIR, "leaderboard.sqlite3")
+        self._lock = threading.Lock()
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+            self._conn = self._connect(self.db_path)
+        except Exception as e:
+            print(f"⚠ Leaderboard: disk store unavailable, using memory only ({e})")
+            self._conn = self._connect(":memory:")
+
+    @staticmethod
+    def _connect(path: str) -> sqlite3.Connection:
+        conn = sqlite3.connect(path, check_same_thread=False)
+        if path != ":memory:":
+            conn.execute("PRAGMA journal_mode=WAL")
+        for statement in _SCHEMA:
+            conn.execute(statement)
+        conn.commit()
+        return conn
+
+    def record(self, job_id: str, candidate_id: str, candidate_name: str, result: Dict[str, Any],
+               unless_newer_than: Optional[float] = None) -> bool:
+        """
+        Store (or replace) a candidate's screening result
+
+        Args:
+            job_id: Job the candidate was screened for
+            candidate_id: Stable candidate key (e.g. resume content hash)
+            candidate_name: Display name
+            result: Screening response fields (ai_score, component_scores,
+                skill_analysis, analysis, parsed_data)
+            unless_newer_than: Keep an existing entry written after this time
+                (time.time()) instead of replacing it
+
+        Returns:
+            False if the entry was kept or the write failed
+        """
+        return self.record_many(job_id, [(candidate_id, candidate_name, result)],
+                                unless_newer_than=unless_newer_than) == 1
+
+    def record_many(self, job_id: str, entries: Iterable[Tuple[str, str, Dict[str, Any]]],
+                    store_features: bool = True, unless_newer_than: Optional[float] = None) -> int:
+        """
+        Store several (candidate_id, candidate_name, result) entries in one transaction
+
+        With store_features, each result's parsed_data is kept as the
+        candidate's features for later re-scoring. With unless_newer_than,
+        candidates whose entry was written after that time are left as they
+        are. Returns the number of entries written.
+        """
+        prepared = []
+        now = time.time()
+        for candidate_id, candidate_name, result in entries:
+            row, skills = self._row(job_id, candidate_id, candidate_name, result, now)
+            features = None
+            if store_features and isinstance(result.get('parsed_data'), dict):
+                features = json.dumps(result['parsed_data'], default=str)
+            prepared.append((candidate_id, row, skills, features))
+
+        with self._lock:
+            if unless_newer_than is not None and prepared:
+                newer = {candidate_id for (candidate_id,) in self._conn.execute(
+                    "SELECT candidate_id FROM leaderboard WHERE job_id = ? AND screened_at > ? "
+                    f"AND candidate_id IN ({', '.join('?' * len(prepared))})",
+                    [job_id, unless_newer_than] + [candidate_id for candidate_id, _, _, _ in prepared],
+                )}
+                prepared = [entry for entry in prepared if entry[0] not in newer]
+
+            rows = [row for _, row, _, _ in prepared]
+            candidate_ids = [(job_id, candidate_id) for candidate_id, _, _, _ in prepared]
+            skill_rows = [(job_id, skill_id, candidate_id)
+                          for candidate_id, _, skills, _ in prepared for skill_id in skills]
+            feature_rows = [(candidate_id, features, now)
+                            for candidate_id, _, _, features in prepared if features is not None]
+
+            try:
+                self._conn.executemany(
+                    "DELETE FROM leaderboard_skills WHERE job_id = ? AND candidate_id = ?", candidate_ids
+                )
+                self._conn.executemany(
+                    f"INSERT OR REPLACE INTO leaderboard ({', '.join(['job_id'] + _ENTRY_COLUMNS)}) "
+                    f"VALUES ({', '.join('?' * (len(_ENTRY_COLUMNS) + 1))})",
+                    rows,
+                )
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO leaderboard_skills (job_id, skill_id, candidate_id) VALUES (?, ?, ?)",
+                    skill_rows,
+                )
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO candidate_features (candidate_id, features, stored_at) VALUES (?, ?, ?)",
+                    feature_rows,
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                self._conn.rollback()
+                print(f"⚠ Leaderboard write failed: {e}")
+                return 0
+        return len(rows)
+
+    def _row(self, job_id: str, candidate_id: str, candidate_name: str,
+             result: Dict[str, Any], screened_at: float) -> Tuple[tuple, set]:
+        """Leaderboard row and canonical skill IDs for one screening result"""
+        component_scores = result.get('component_scores') or {}
+        skill_analysis = result.get('skill_analysis') or {}
+        analysis = result.get('analysis') or {}
+        parsed_data = result.get('parsed_data') or {}
+
+        experience = parsed_data.get('experience')
+        experience_years = _number(experience.get('total_years')) if isinstance(experience, dict) else None
+
+        domain = parsed_data.get('domain')
+        if isinstance(domain, dict):
+            domain = domain.get('primary_domain') or domain.get('domain')
+
+        skills = parsed_data.get('skills')
+        if isinstance(skills, dict):
+            skills = skills.get('skills', [])
+        skill_names = list(skills or []) + list(skill_analysis.get('all_candidate_skills') or [])
+
+        details = {
+            'matched_required': skill_analysis.get('matched_required', []),
+            'missing_required': skill_analysis.get('missing_required', []),
+            'matched_optional': skill_analysis.get('matched_optional', [])
+        }
+        row = (
+            job_id, candidate_id, candidate_name, _number(result.get('ai_score')) or 0.0,
+            *(_number(component_scores.get(column)) for column in COMPONENT_COLUMNS),
+            experience_years, str(domain) if domain else None,
+            analysis.get('recommendation') if isinstance(analysis, dict) else None,
+            json.dumps(details, default=str), screened_at
+        )
+        return row, canonical_skill_set(str(skill) for skill in skill_names)
+
+    def query(self, job_id: str, limit: int = 10, offset: int = 0, min_score: Optional[float] = None,
+              max_score: Optional[float] = None, skills: Optional[List[str]] = None,
+              min_experience_years: Optional[float] = None, domain: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Candidates of a job by descending score
+
+        Args:
+            job_id: Job to query
+            limit: Maximum entries to return
+            offset: Entries to skip (for paging)
+            min_score / max_score: Inclusive final score range
+            skills: Candidate must have every one of these skills
+            min_experience_years: Minimum parsed years of experience
+            domain: Candidate's primary domain (case-insensitive)
+
+        Returns:
+            Leaderboard entries, best first (ties broken by candidate_id)
+        """
+        where, params = self._filters(job_id, min_score, max_score, skills, min_experience_years, domain)
+        sql = (f"SELECT {', '.join(_ENTRY_COLUMNS)} FROM leaderboard c WHERE {where} "
+               f"ORDER BY c.score DESC, c.candidate_id LIMIT ? OFFSET ?")
+        with self._lock:
+            rows = self._conn.execute(sql, params + [max(0, limit), max(0, offset)]).fetchall()
+        return [self._entry(row) for row in rows]
+
+    def top(self, job_id: str, k: int = 10) -> List[Dict[str, Any]]:
+        """The k best-scoring candidates of a job"""
+        return self.query(job_id, limit=k)
+
+    def count(self, job_id: str, min_score: Optional[float] = None, max_score: Optional[float] = None,
+              skills: Optional[List[str]] = None, min_experience_years: Optional[float] = None,
+              domain: Optional[str] = None) -> int:
+        """Number of candidates matching the same filters as query()"""
+        where, params = self._filters(job_id, min_score, max_score, skills, min_experience_years, domain)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM leaderboard c WHERE {where}", params).fetchone()[0]
+
+    def get(self, job_id: str, candidate_id: str) -> Optional[Dict[str, Any]]:
+        """One candidate's entry plus their 1-based rank in the job"""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(_ENTRY_COLUMNS)} FROM leaderboard WHERE job_id = ? AND candidate_id = ?",
+                (job_id, candidate_id),
+            ).fetchone()
+            if row is None:
+                return None
+            entry = self._entry(row)
+            entry['rank'] = 1 + self._conn.execute(
+                "SELECT COUNT(*) FROM leaderboard WHERE job_id = ? "
+                "AND (score > ? OR (score = ? AND candidate_id < ?))",
+                (job_id, entry['score'], entry['score'], candidate_id),
+            ).fetchone()[0]
+        return entry
+
+    def features(self, job_id: str) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """
+        Stored parsed resumes of a job's candidates
+
+        Returns:
+            (candidate_id, candidate_name, parsed_data) per candidate that has
+            stored features, in leaderboard order
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT c.candidate_id, c.candidate_name, f.features FROM leaderboard c "
+                "JOIN candidate_features f ON f.candidate_id = c.candidate_id "
+                "WHERE c.job_id = ? ORDER BY c.score DESC, c.candidate_id",
+                (job_id,),
+            ).fetchall()
+        return [(candidate_id, candidate_name, json.loads(features)) for candidate_id, candidate_name, features in rows]
+
+    def relevance_fit(self, job_id: str, text_hash: str) -> Optional[Dict[str, Any]]:
+        """A job's stored JD relevance model state, if it was fitted for this job text"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT state FROM jd_relevance_fits WHERE job_id = ? AND text_hash = ?", (job_id, text_hash)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def store_relevance_fit(self, job_id: str, text_hash: str, state: Dict[str, Any]) -> None:
+        """Keep (or replace) a job's fitted JD relevance model state"""
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO jd_relevance_fits (job_id, text_hash, state, fitted_at) VALUES (?, ?, ?, ?)",
+                    (job_id, text_hash, json.dumps(state), time.time()),
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                self._conn.rollback()
+                print(f"⚠ Leaderboard: could not store the JD relevance fit of {job_id}: {e}")
+
+    def remove(self, job_id: str, candidate_id: str) -> None:
+        """Drop a candidate from a job's leaderboard"""
+        with self._lock:
+            self._conn.execute("DELETE FROM leaderboard WHERE job_id = ? AND candidate_id = ?", (job_id, candidate_id))
+            self._conn.execute("DELETE FROM leaderboard_skills WHERE job_id = ? AND candidate_id = ?", (job_id, candidate_id))
+            self._conn.commit()
+
+    def clear_job(self, job_id: str) -> None:
+        """Drop every candidate of a job"""
+        with self._lock:
+            self._conn.execute("DELETE FROM leaderboard WHERE job_id = ?", (job_id,))
+            self._conn.execute("DELETE FROM leaderboard_skills WHERE job_id = ?", (job_id,))
+            self._conn.execute("DELETE FROM jd_relevance_fits WHERE job_id = ?", (job_id,))
+            self._conn.commit()
+
+    def _filters(self, job_id: str, min_score: Optional[float], max_score: Optional[float],
+                 skills: Optional[List[str]], min_experience_years: Optional[float],
+                 domain: Optional[str]) -> Tuple[str, List[Any]]:
+        """WHERE clause (over alias c) and parameters for the query filters"""
+        clauses, params = ["c.job_id = ?"], [job_id]
+        if min_score is not None:
+            clauses.append("c.score >= ?")
+            params.append(min_score)
+        if max_score is not None:
+            clauses.append("c.score <= ?")
+            params.append(max_score)
+        if min_experience_years is not None:
+            clauses.append("c.experience_years >= ?")
+            params.append(min_experience_years)
+        if domain:
+            clauses.append("LOWER(c.candidate_domain) = ?")
+            params.append(domain.lower())
+        for skill_id in sorted(canonical_skill_set(skills or [])):
+            clauses.append(
+                "EXISTS (SELECT 1 FROM leaderboard_skills s "
+                "WHERE s.job_id = c.job_id AND s.skill_id = ? AND s.candidate_id = c.candidate_id)"
+            )
+            params.append(skill_id)
+        return " AND ".join(clauses), params
+
+    @staticmethod
+    def _entry(row: tuple) -> Dict[str, Any]:
+        entry = dict(zip(_ENTRY_COLUMNS, row))
+        entry['component_scores'] = {column: entry.pop(column) for column in COMPONENT_COLUMNS}
+        entry.update(json.loads(entry.pop('details') or '{}'))
+        return entry
+
+    def stats(self) -> Dict[str, Any]:
+        """Number of jobs and candidates on the leaderboard"""
+        with self._lock:
+            jobs, candidates = self._conn.execute(
+                "SELECT COUNT(DISTINCT job_id), COUNT(*) FROM leaderboard"
+            ).fetchone()
+        return {'jobs': jobs, 'candidates': candidates}
@@ -1,40 +1,176 @@
 import re
-import pdfplumber
 from typing import Dict, List, Tuple, Optional
 import spacy
 from collections import Counter
+from functools import lru_cache
+from resume_sections import PhraseCounts, ResumeSection, ResumeSections, segment_resume
+from pdf_text_extractor import PDFTextExtractor
+from skill_ontology import SKILL_CATEGORIES, STRICT_SKILLS, skill_spellings
 
 # Disable language_tool_python completely to avoid slow initialization and hanging
 # Set to False to use fast fallback grammar scoring instead
+# (grammar_checker.py runs LanguageTool in the background, off the request path)
 LANGUAGE_TOOL_AVAILABLE = False
 
+_TRIE_END = None  # Trie key holding the skill indices that end at a node
+
+# Only the tagger, parser and NER are needed for noun chunks and ORG entities.
+# attribute_ruler stays: it maps tags to the coarse POS that noun_chunks reads.
+SPACY_EXCLUDE = ["lemmatizer"]
+
+# Degree abbreviations that are also common English words
+AMBIGUOUS_DEGREES = {'ma', 'ba', 'be'}
+
+# Common job title indicators
+TITLE_KEYWORDS = ['developer', 'engineer', 'manager', 'analyst', 'designer',
+                  'specialist', 'consultant', 'director', 'lead', 'architect',
+                  'intern', 'associate', 'senior', 'junior', 'trainee']
+
+# Regex stand-ins for noun chunks and ORG entities when parsing without spaCy:
+# up to three capitalised words ending in a title keyword, and capitalised
+# names followed by a company suffix or preceded by "at"/"@"
+_TITLE_PATTERN = re.compile(
+    r"(?:\b[A-Z][\w+#.&/-]*[ \t]+){0,3}\b(?i:" + '|'.join(TITLE_KEYWORDS) + r")s?\b"
+)
+_COMPANY_PATTERN = re.compile(
+    r"\b[A-Z][\w&.-]*(?:[ \t]+[A-Z0-9][\w&.-]*){0,3}[ \t]+(?:Inc|Ltd|LLC|Corp|Corporation|Company|Co|Technologies|Solutions|"
+    r"Systems|Labs|Group|GmbH|Limited|Pvt)\b\.?"
+    r"|(?<=\bat )[A-Z][\w&.-]*(?:[ \t]+[A-Z][\w&.-]*){0,3}"
+    r"|(?<=@ )[A-Z][\w&.-]*(?:[ \t]+[A-Z][\w&.-]*){0,3}"
+)
+
+
+class CompiledSkillSet:
+    """
+    Skill dictionary compiled once for single-pass matching.
+    
+    Every non-strict variant goes into one character trie. Matches must start
+    and end on a non-letter boundary, so one regex scan finds the boundary
+    positions whose character starts some variant and the trie is walked only
+    from there; every skill is found in that single pass, overlapping matches
+    included. Strict skills keep their own precompiled \\b...\\b patterns.
+    """
+    
+    def __init__(self, skills: Tuple[str, ...]):
+        self.skills = skills
+        self.trie: Dict = {}
+        self.strict_patterns: List[Tuple[int, re.Pattern]] = []
+        
+        for index, skill in enumerate(skills):
+            skill_lower = skill.lower().strip()
+            if skill_lower in STRICT_SKILLS:
+                self.strict_patterns.append((index, re.compile(r'\b' + re.escape(skill_lower) + r'\b')))
+                continue
+            for variant in skill_spellings(skill_lower):
+                node = self.trie
+                for char in variant:
+                    node = node.setdefault(char, {})
+                node.setdefault(_TRIE_END, []).append(index)
+        
+        first_chars = ''.join(re.escape(char) for char in sorted(k for k in self.trie if k is not _TRIE_END))
+        self.start_pattern = re.compile(r'(?<![a-z])[' + first_chars + ']') if first_chars else None
+    
+    def find(self, text_lower: str) -> List[str]:
+        """Return the skills present in lowercased text, in dictionary order"""
+        found = set()
+        trie = self.trie
+        length = len(text_lower)
+        
+        starts = self.start_pattern.finditer(text_lower) if self.start_pattern else ()
+        for match in starts:
+            start = match.start()
+            node = trie[text_lower[start]]
+            end = start + 1
+            while True:
+                hits = node.get(_TRIE_END)
+                if hits and (end == length or not 'a' <= text_lower[end] <= 'z'):
+                    found.update(hits)
+                if end == length:
+                    break
+                node = node.get(text_lower[end])
+                if node is None:
+                    break
+                end += 1
+        
+        for index, pattern in self.strict_patterns:
+            if pattern.search(text_lower):
+                found.add(index)
+        
+        return [skill for index, skill in enumerate(self.skills) if index in found]
+
+
+@lru_cache(maxsize=64)
+def compile_skill_set(skills: Tuple[str, ...]) -> CompiledSkillSet:
+    """Compile (and cache) a skill dictionary for reuse across resumes"""
+    return CompiledSkillSet(skills)
+
+
+class DomainPhraseIndex:
+    """
+    Domain keywords grouped by phrase.
+    
+    Each distinct (lowercased) phrase maps to every (domain, keyword) that
+    uses it, so a resume is scored with one PhraseCounts lookup per phrase
+    instead of one regex scan of the text per keyword.
+    """
+    
+    def __init__(self, domain_keywords: Dict[str, List[str]]):
+        self.domain_keywords = domain_keywords
+        self.phrases: Dict[str, List[Tuple[str, str]]] = {}
+        for domain, keywords in domain_keywords.items():
+            for keyword in keywords:
+                self.phrases.setdefault(keyword.lower(), []).append((domain, keyword))
+    
+    def score(self, phrase_counts: PhraseCounts) -> Dict[str, Dict]:
+        """Per-domain keyword hit count and matched keywords (in keyword order)"""
+        keyword_counts: Dict[Tuple[str, str], int] = {}
+        for phrase, owners in self.phrases.items():
+            count = phrase_counts.count(phrase)
+            if count:
+                for owner in owners:
+                    keyword_counts[owner] = count
+        
+        domain_scores = {}
+        for domain, keywords in self.domain_keywords.items():
+            matched_keywords = [keyword for keyword in keywords if (domain, keyword) in keyword_counts]
+            domain_scores[domain] = {
+                'score': sum(keyword_counts[(domain, keyword)] for keyword in matched_keywords),
+                'matched_keywords': matched_keywords
+            }
+        return domain_scores
+
+
 class EnhancedResumeParser:
     """
     Enhanced resume parser with comprehensive extraction capabilities
     """
     
+    # Bump whenever extraction logic changes so cached parses are invalidated
+    PARSER_VERSION = "1.5"
+    
     def __init__(self):
-        # Load spaCy model for NLP tasks
+        # Load spaCy model for NLP tasks (without components we never read)
         try:
-            self.nlp = spacy.load("en_core_web_sm")
+            self.nlp = spacy.load("en_core_web_sm", exclude=SPACY_EXCLUDE)
         except:
             print("Downloading spaCy model...")
             import os
             os.system("python -m spacy download en_core_web_sm")
-            self.nlp = spacy.load("en_core_web_sm")
+            self.nlp = spacy.load("en_core_web_sm", exclude=SPACY_EXCLUDE)
+        
+        # PDF text extraction backend (PDF_TEXT_BACKEND, PDF_MAX_PAGES, PDF_MAX_CHARS_PER_PAGE)
+        self.text_extractor = PDFTextExtractor()
         
         # Skills database (extensible)
-        self.default_skills = {
-            'programming': ['Python', 'Java', 'JavaScript', 'TypeScript', 'C++', 'C#', 'Ruby', 'PHP', 'Swift', 'Kotlin', 'Go', 'Rust', 'Scala', 'R'],
-            'web': ['HTML', 'CSS', 'React', 'Angular', 'Vue.js', 'Node.js', 'Express', 'Django', 'Flask', 'Spring', 'ASP.NET', 'jQuery', 'Bootstrap', 'Tailwind'],
-            'database': ['SQL', 'MySQL', 'PostgreSQL', 'MongoDB', 'Redis', 'Oracle', 'MS SQL Server', 'SQLite', 'Cassandra', 'DynamoDB'],
-            'cloud': ['AWS', 'Azure', 'Google Cloud', 'GCP', 'Heroku', 'DigitalOcean', 'Firebase', 'Kubernetes', 'Docker', 'Jenkins'],
-            'data_science': ['Machine Learning', 'Deep Learning', 'TensorFlow', 'PyTorch', 'Keras', 'Pandas', 'NumPy', 'Scikit-learn', 'NLP', 'Computer Vision'],
-            'tools': ['Git', 'GitHub', 'GitLab', 'Jira', 'Agile', 'Scrum', 'CI/CD', 'REST API', 'GraphQL', 'Microservices'],
-            'marketing': ['SEO', 'SEM', 'Google Analytics', 'Content Marketing', 'Social Media Marketing', 'Email Marketing', 'PPC', 'Facebook Ads', 'Google Ads'],
-            'design': ['Photoshop', 'Illustrator', 'Figma', 'Sketch', 'Adobe XD', 'UI/UX', 'InDesign', 'CorelDRAW'],
-            'business': ['Project Management', 'Business Analysis', 'Financial Analysis', 'Strategic Planning', 'Budgeting', 'Forecasting', 'Leadership']
-        }
+        self.default_skills = {category: list(skills) for category, skills in SKILL_CATEGORIES.items()}
+        
+        # Compile the default skill dictionary once for single-pass matching
+        default_skill_list = [skill for skills in self.default_skills.values() for skill in skills]
+        self._default_skill_set = compile_skill_set(tuple(default_skill_list))
+        self._skill_to_categories = {}
+        for category, skills in self.default_skills.items():
+            for skill in skills:
+                self._skill_to_categories.setdefault(skill, []).append(category)
         
         # Education levels (ranked)
         self.education_levels = {
@@ -56,6 +192,18 @@ class EnhancedResumeParser:
             'secondary': 1
         }
         
+        # Short abbreviations (phd, msc...) must be whole words; longer keywords
+        # may carry a suffix (masters, bachelor's). MA/BA/BE double as English
+        # words, so they only count when written in capitals.
+        self._education_patterns = []
+        for degree, level in self.education_levels.items():
+            if degree in AMBIGUOUS_DEGREES:
+                pattern = re.compile(r'(?<![A-Za-z])' + re.escape(degree.upper()) + r'(?![A-Za-z])')
+            else:
+                suffix = r'(?![a-z])' if len(degree) <= 4 else ''
+                pattern = re.compile(r'(?<![a-z])' + re.escape(degree) + suffix, re.IGNORECASE)
+            self._education_patterns.append((degree, level, pattern))
+        
         # Domain keywords
         self.domain_keywords = {
             'IT': ['software', 'developer', 'programmer', 'engineer', 'coding', 'technology', 'systems', 'database', 'cloud', 'devops', 'frontend', 'backend', 'fullstack'],
@@ -67,14 +215,13 @@ class EnhancedResumeParser:
             'Design': ['designer', 'ui/ux', 'graphic design', 'visual design', 'creative', 'illustration', 'branding', 'typography'],
             'Management': ['manager', 'director', 'executive', 'leadership', 'strategy', 'planning', 'operations', 'team lead']
         }
+        self._domain_index = DomainPhraseIndex(self.domain_keywords)
         
     def extract_text_from_pdf(self, pdf_path: str) -> str:
-        """Extract text from PDF file"""
+        """Extract text from PDF file (backend and limits: see PDFTextExtractor)"""
         text = ""
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                for page in pdf.pages:
-                    text += page.extract_text() + "\n"
+            text = self.text_extractor.extract(pdf_path)
         except Exception as e:
             print(f"Error extracting text from PDF: {e}")
         return text
@@ -102,76 +249,26 @@ class EnhancedResumeParser:
             'phone': phone
         }
     
-    def extract_skills(self, text: str, custom_skills: Optional[List[str]] = None) -> Dict:
+    def extract_skills(self, text: str, custom_skills: Optional[List[str]] = None,
+                       sections: Optional[ResumeSections] = None) -> Dict:
         """Extract skills from resume with categorization"""
-        text_lower = text.lower()
+        text_lower = sections.full.lower if sections else text.lower()
         
         # Use custom skills if provided, otherwise use default
-        skills_to_check = custom_skills if custom_skills else []
-        if not custom_skills:
-            for category, skills in self.default_skills.items():
-                skills_to_check.extend(skills)
+        if custom_skills:
+            found_skills = compile_skill_set(tuple(custom_skills)).find(text_lower)
+        else:
+            found_skills = self._default_skill_set.find(text_lower)
         
-        found_skills = []
         skill_categories = {}
         
-        for skill in skills_to_check:
-            skill_lower = skill.lower().strip()
-            
-            # Generate all possible variations for bidirectional matching
-            variations = set([skill_lower])
-            
-            # Handle dots: node.js <-> nodejs, node js, node
-            if '.' in skill_lower:
-                variations.add(skill_lower.replace('.', ''))  # node.js -> nodejs
-                variations.add(skill_lower.replace('.', ' '))  # node.js -> node js
-                base = skill_lower.split('.')[0]
-                variations.add(base)  # node.js -> node
-            else:
-                # Reverse: nodejs -> node.js, node js
-                if skill_lower.endswith('js') and len(skill_lower) > 2:
-                    base = skill_lower[:-2]
-                    variations.add(base + '.js')  # nodejs -> node.js
-                    variations.add(base + ' js')  # nodejs -> node js
-                    variations.add(base)  # nodejs -> node
-            
-            # Handle "js" suffix: expressjs <-> express.js, express js, express
-            if 'js' in skill_lower:
-                if skill_lower.endswith('js') and len(skill_lower) > 2:
-                    base = skill_lower[:-2]
-                    variations.add(base + '.js')  # expressjs -> express.js
-                    variations.add(base + ' js')  # expressjs -> express js
-                    variations.add(base)  # expressjs -> express
-                    
-            # Handle C/C++ special cases
-            if skill_lower in ['c', 'c++', 'c#', 'r']:
-                # For single-letter languages, be more strict
-                variations = {skill_lower}
-            
-            # Check all variations
-            found = False
-            for variant in variations:
-                if skill_lower in ['c', 'c++', 'c#', 'r']:
-                    # Strict matching for single-letter/special languages
-                    pattern = r'\b' + re.escape(variant) + r'\b'
-                else:
-                    # Flexible pattern for other skills
-                    pattern = r'(?:^|[^a-zA-Z])' + re.escape(variant) + r'(?:[^a-zA-Z]|$)'
-                
-                if re.search(pattern, text_lower):
-                    found = True
-                    break
-            
-            if found:
-                found_skills.append(skill)
-                
-                # Categorize if using default skills
-                if not custom_skills:
-                    for category, cat_skills in self.default_skills.items():
-                        if skill in cat_skills:
-                            if category not in skill_categories:
-                                skill_categories[category] = []
-                            skill_categories[category].append(skill)
+        # Categorize if using default skills
+        if not custom_skills:
+            for skill in found_skills:
+                for category in self._skill_to_categories.get(skill, []):
+                    if category not in skill_categories:
+                        skill_categories[category] = []
+                    skill_categories[category].append(skill)
         
         return {
             'skills': found_skills,
@@ -179,28 +276,27 @@ class EnhancedResumeParser:
             'categories': skill_categories
         }
     
-    def extract_education(self, text: str) -> Dict:
-        """Extract education information and level"""
-        text_lower = text.lower()
+    def extract_education(self, text: str, sections: Optional[ResumeSections] = None) -> Dict:
+        """Extract education information and level from the education section"""
+        education = (sections or segment_resume(text)).get('education')
         
         # Find education level
         max_level = 0
         degree_found = ""
         
-        for degree, level in self.education_levels.items():
-            if degree in text_lower:
-                if level > max_level:
-                    max_level = level
-                    degree_found = degree
+        for degree, level, pattern in self._education_patterns:
+            if level > max_level and pattern.search(education.text):
+                max_level = level
+                degree_found = degree
         
         # Extract years/graduation dates
         year_pattern = r'20[0-2]\d'
-        years = re.findall(year_pattern, text)
+        years = re.findall(year_pattern, education.text)
         
         # Extract institutions (using common patterns)
         institution_keywords = ['university', 'college', 'institute', 'school']
         institutions = []
-        for line in text.split('\n'):
+        for line in education.text.split('\n'):
             line_lower = line.lower()
             if any(keyword in line_lower for keyword in institution_keywords):
                 institutions.append(line.strip())
@@ -212,8 +308,21 @@ class EnhancedResumeParser:
             'institutions': institutions[:3]  # Top 3
         }
     
-    def extract_experience(self, text: str) -> Dict:
-        """Extract work experience details"""
+    def extract_experience(self, text: str, doc=None, sections: Optional[ResumeSections] = None,
+                           use_nlp: bool = True) -> Dict:
+        """
+        Extract work experience details
+        
+        Args:
+            text: Full resume text
+            doc: Optional pre-computed spaCy doc of the experience section
+                (see parse_many); computed here when omitted
+            sections: Optional pre-computed segmentation of text
+            use_nlp: False finds job titles and companies with regexes
+                instead of spaCy (fast screening tier)
+        """
+        experience = (sections or segment_resume(text)).get('experience')
+        
         # Method 1: Extract explicit years mentioned
         exp_patterns = [
             r'(\d+)[\+]?\s*(?:years?|yrs?)\s*(?:of)?\s*experience',
@@ -231,7 +340,8 @@ class EnhancedResumeParser:
         # Method 2: Calculate from date ranges if not found
         if total_years == 0:
             # Find date patterns like "2020 - 2023", "2020 - Present", "Jan 2020 - Dec 2023"
-            date_ranges = re.findall(r'(20\d{2})\s*[-–]\s*(?:(20\d{2})|present|current)', text, re.IGNORECASE)
+            # (experience section only, so degree dates don't count as work)
+            date_ranges = re.findall(r'(20\d{2})\s*[-–]\s*(?:(20\d{2})|present|current)', experience.text, re.IGNORECASE)
             
             if date_ranges:
                 current_year = 2025  # Current year
@@ -247,28 +357,28 @@ class EnhancedResumeParser:
                 if calculated_years > 0:
                     total_years = calculated_years
         
-        # Extract job titles using NLP
-        doc = self.nlp(text)
-        job_titles = []
-        
-        # Common job title indicators
-        title_keywords = ['developer', 'engineer', 'manager', 'analyst', 'designer', 
-                         'specialist', 'consultant', 'director', 'lead', 'architect',
-                         'intern', 'associate', 'senior', 'junior', 'trainee']
-        
-        for sent in doc.sents:
-            sent_text = sent.text.lower()
-            if any(keyword in sent_text for keyword in title_keywords):
-                # Extract potential job title
-                for chunk in sent.noun_chunks:
-                    if any(keyword in chunk.text.lower() for keyword in title_keywords):
-                        job_titles.append(chunk.text)
-        
-        # Extract companies (capitalize proper nouns that might be company names)
-        companies = []
-        for ent in doc.ents:
-            if ent.label_ == "ORG":
-                companies.append(ent.text)
+        if not use_nlp:
+            job_titles = [match.group().strip() for match in _TITLE_PATTERN.finditer(experience.text)]
+            companies = [match.group().strip() for match in _COMPANY_PATTERN.finditer(experience.text)]
+        else:
+            # Extract job titles using NLP (experience section only)
+            if doc is None:
+                doc = self.nlp(experience.text)
+            job_titles = []
+            
+            for sent in doc.sents:
+                sent_text = sent.text.lower()
+                if any(keyword in sent_text for keyword in TITLE_KEYWORDS):
+                    # Extract potential job title
+                    for chunk in sent.noun_chunks:
+                        if any(keyword in chunk.text.lower() for keyword in TITLE_KEYWORDS):
+                            job_titles.append(chunk.text)
+            
+            # Extract companies (capitalize proper nouns that might be company names)
+            companies = []
+            for ent in doc.ents:
+                if ent.label_ == "ORG":
+                    companies.append(ent.text)
         
         return {
             'total_years': total_years,
@@ -277,24 +387,10 @@ class EnhancedResumeParser:
             'has_experience': total_years > 0 or len(job_titles) > 0
         }
     
-    def detect_domain(self, text: str) -> Dict:
+    def detect_domain(self, text: str, sections: Optional[ResumeSections] = None) -> Dict:
         """Detect primary domain/industry alignment"""
-        text_lower = text.lower()
-        domain_scores = {}
-        
-        for domain, keywords in self.domain_keywords.items():
-            score = 0
-            matched_keywords = []
-            for keyword in keywords:
-                count = len(re.findall(r'\b' + re.escape(keyword) + r'\b', text_lower))
-                if count > 0:
-                    score += count
-                    matched_keywords.append(keyword)
-            
-            domain_scores[domain] = {
-                'score': score,
-                'matched_keywords': matched_keywords
-            }
+        full = sections.full if sections else ResumeSection('full', text)
+        domain_scores = self._domain_index.score(full.phrase_counts)
         
         # Find primary domain
         primary_domain = max(domain_scores, key=lambda x: domain_scores[x]['score'])
@@ -310,11 +406,11 @@ class EnhancedResumeParser:
             'confidence': domain_scores[primary_domain]['score'] if domain_scores[primary_domain]['score'] > 0 else 0
         }
     
-    def analyze_language_quality(self, text: str) -> Dict:
+    def analyze_language_quality(self, text: str, sections: Optional[ResumeSections] = None) -> Dict:
         """Analyze grammar and language quality"""
         try:
             # Sample first 1000 words for performance
-            words = text.split()[:1000]
+            words = (sections.full.words if sections else text.split())[:1000]
             sample_text = ' '.join(words)
             
             # Calculate basic metrics
@@ -351,7 +447,8 @@ class EnhancedResumeParser:
             # Check for professional language indicators
             professional_keywords = ['experience', 'developed', 'managed', 'led', 'created',
                                     'implemented', 'designed', 'analyzed', 'coordinated']
-            professional_count = sum(1 for kw in professional_keywords if kw in text.lower())
+            text_lower = sections.full.lower if sections else text.lower()
+            professional_count = sum(1 for kw in professional_keywords if kw in text_lower)
             if professional_count >= 5:
                 grammar_score += 5
             
@@ -381,18 +478,59 @@ class EnhancedResumeParser:
     
     def parse_resume(self, pdf_path: str, custom_skills: Optional[List[str]] = None) -> Dict:
         """Complete resume parsing with all features"""
-        text = self.extract_text_from_pdf(pdf_path)
+        return self.parse_text(self.extract_text_from_pdf(pdf_path), custom_skills)
+    
+    def parse_text(self, text: str, custom_skills: Optional[List[str]] = None, use_nlp: bool = True) -> Dict:
+        """
+        Parse already-extracted resume text (e.g. from a PDF worker process)
         
+        With use_nlp=False no spaCy model runs: job titles and companies come
+        from regexes, everything else is unchanged.
+        """
         if not text:
             return {'error': 'Could not extract text from PDF'}
         
+        return self._parse_text(text, custom_skills, use_nlp=use_nlp)
+    
+    def parse_many(self, pdf_paths: List[str], custom_skills: Optional[List[str]] = None,
+                   n_process: int = 1, batch_size: int = 16) -> List[Dict]:
+        """
+        Parse a batch of resumes, running spaCy over all of them with nlp.pipe
+        
+        Args:
+            pdf_paths: Resume PDF paths
+            custom_skills: Optional custom skill list (applied to every resume)
+            n_process: spaCy worker processes (-1 = one per CPU)
+            batch_size: Documents per spaCy batch
+            
+        Returns:
+            Parsed results in the same order and format as parse_resume
+        """
+        texts = [self.extract_text_from_pdf(path) for path in pdf_paths]
+        results: List[Dict] = [{'error': 'Could not extract text from PDF'} for _ in texts]
+        
+        valid = [i for i, text in enumerate(texts) if text]
+        segmented = {i: segment_resume(texts[i]) for i in valid}
+        experience_texts = (segmented[i].get('experience').text for i in valid)
+        docs = self.nlp.pipe(experience_texts, n_process=n_process, batch_size=batch_size)
+        
+        for i, doc in zip(valid, docs):
+            results[i] = self._parse_text(texts[i], custom_skills, doc=doc, sections=segmented[i])
+        return results
+    
+    def _parse_text(self, text: str, custom_skills: Optional[List[str]] = None, doc=None,
+                    sections: Optional[ResumeSections] = None, use_nlp: bool = True) -> Dict:
+        """Run every extractor over already-extracted resume text"""
+        # Segment once; every extractor reuses the same section views
+        sections = sections or segment_resume(text)
+        
         # Extract all information
         basic_info = self.extract_basic_info(text)
-        skills_info = self.extract_skills(text, custom_skills)
-        education_info = self.extract_education(text)
-        experience_info = self.extract_experience(text)
-        domain_info = self.detect_domain(text)
-        language_info = self.analyze_language_quality(text)
+        skills_info = self.extract_skills(text, custom_skills, sections=sections)
+        education_info = self.extract_education(text, sections=sections)
+        experience_info = self.extract_experience(text, doc=doc, sections=sections, use_nlp=use_nlp)
+        domain_info = self.detect_domain(text, sections=sections)
+        language_info = self.analyze_language_quality(text, sections=sections)
         
         return {
             'basic_info': basic_info,
@@ -403,3 +541,44 @@ class EnhancedResumeParser:
             'language_quality': language_info,
             'raw_text': text
         }
+
+
+if __name__ == "__main__":
+    # Benchmark: python enhanced_resume_parser.py resume1.pdf resume2.pdf ...
+    import sys
+    import time
+    
+    paths = sys.argv[1:]
+    if not paths:
+        print("Usage: python enhanced_resume_parser.py <resume.pdf> [...]")
+        sys.exit(1)
+    
+    parser = EnhancedResumeParser()
+    full_nlp = spacy.load("en_core_web_sm")
+    texts = [t for t in (parser.extract_text_from_pdf(p) for p in paths) if t]
+    
+    # Previous behaviour: full pipeline over the whole resume
+    start = time.perf_counter()
+    for text in texts:
+        full_nlp(text)
+    full_ms = (time.perf_counter() - start) * 1000 / len(texts)
+    
+    # Slim pipeline over the experience section only
+    start = time.perf_counter()
+    for text in texts:
+        parser.nlp(segment_resume(text).get('experience').text)
+    slim_ms = (time.perf_counter() - start) * 1000 / len(texts)
+    
+    print(f"spaCy per resume: full pipeline/full text {full_ms:.1f} ms, slim/experience section {slim_ms:.1f} ms")
+    
+    start = time.perf_counter()
+    for path in paths:
+        parser.parse_resume(path)
+    sequential = time.perf_counter() - start
+    
+    for n_process in (1, 2, 4):
+        start = time.perf_counter()
+        parser.parse_many(paths, n_process=n_process)
+        batched = time.perf_counter() - start
+        print(f"parse_many n_process={n_process}: {len(paths) / batched:.1f} resumes/s "
+              f"(sequential parse_resume: {len(paths) / sequential:.1f} resumes/s)")
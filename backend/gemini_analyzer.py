@@ -5,9 +5,20 @@ Integrates Google's Gemini AI for intelligent resume evaluation and insights
 
 import os
 import json
-from typing import Dict, List, Optional, Any
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Any, Tuple
 from dotenv import load_dotenv
 from google import genai
+from google.genai import types
+
+from gemini_limiter import gemini_limiter
+from gemini_schemas import (
+    ANALYSIS_SCHEMA, BUNDLE_SCHEMA, BUNDLE_SECTIONS, INTERVIEW_CATEGORIES, INTERVIEW_QUESTIONS_SCHEMA, SIMPLE_ANALYSIS_SCHEMA,
+    GeminiResponseError, json_config, parse_json_object
+)
+from persistent_cache import PersistentLRUCache, sha256_hex
 
 # Load environment variables
 load_dotenv()
@@ -23,6 +34,9 @@ class GeminiResumeAnalyzer:
     - Candidate comparison insights
     """
     
+    # Bump whenever the analysis prompts change so cached analyses are invalidated
+    PROMPT_VERSION = "2"
+    
     def __init__(self, api_key: Optional[str] = None):
         """
         Initialize Gemini analyzer
@@ -36,11 +50,11 @@ class GeminiResumeAnalyzer:
         if not self.api_key:
             raise ValueError("Gemini API key not found. Set GEMINI_API_KEY environment variable or pass api_key parameter.")
         
-        # Initialize client with API key (google-genai 0.3.0 format)
+        # Initialize client with API key. The HTTP timeout (milliseconds) matches the
+        # limiter's, so a call that outlives it is aborted by the transport as well
         try:
-            # Set the API key in environment for the client
-            os.environ['GOOGLE_API_KEY'] = self.api_key
-            self.client = genai.Client()
+            timeout_ms = int(gemini_limiter.timeout_seconds * 1000) or None
+            self.client = genai.Client(api_key=self.api_key, http_options=types.HttpOptions(timeout=timeout_ms))
             print("✓ Gemini client initialized successfully")
         except Exception as e:
             print(f"⚠ Gemini client initialization failed: {e}")
@@ -51,6 +65,21 @@ class GeminiResumeAnalyzer:
         self.temperature = float(os.getenv('GEMINI_TEMPERATURE', '0.7'))
         self.max_tokens = int(os.getenv('GEMINI_MAX_TOKENS', '2048'))
         
+        # Successful analyses keyed by prompt inputs + model + prompt version
+        self.analysis_cache = PersistentLRUCache(
+            'gemini_analysis',
+            db_path=os.getenv('GEMINI_CACHE_PATH'),
+            max_entries=int(os.getenv('GEMINI_CACHE_SIZE', '512'))
+        )
+        
+        # Async calls share one process-wide concurrency cap and timeout
+        self.limiter = gemini_limiter
+        
+        # Analysis call outcomes (retries = second calls after an API error)
+        self._response_counts = {'analyses': 0, 'retries': 0, 'rejected_responses': 0, 'lenient_parses': 0,
+                                 'bundles': 0, 'bundle_fallbacks': 0}
+        self._counts_lock = threading.Lock()
+        
         print(f"✓ Gemini AI initialized: {self.model_name}")
     
     def analyze_resume(self, resume_data: Dict, job_config: Dict) -> Dict[str, Any]:
@@ -66,175 +95,325 @@ class GeminiResumeAnalyzer:
         """
         return self.analyze_resume_quality(resume_data, job_config)
     
+    async def analyze_resume_async(self, resume_data: Dict, job_config: Dict) -> Dict[str, Any]:
+        """Async alias for analyze_resume_quality_async"""
+        return await self.analyze_resume_quality_async(resume_data, job_config)
+    
     def analyze_resume_quality(self, resume_data: Dict, job_config: Dict) -> Dict[str, Any]:
         """
         AI-powered resume analysis using Gemini to compare resume against job description
         
+        Successful analyses are cached (memory LRU + SQLite) under a hash of the
+        prompt inputs, model name and PROMPT_VERSION, so repeat screenings of
+        the same candidate for the same job return the stored result.
+        
         Args:
             resume_data: Parsed resume data
             job_config: Job requirements and configuration
             
         Returns:
-            Dictionary with AI insights and scores
+            Dictionary with AI insights and scores, plus cache_status
+            ('memory', 'disk' or 'miss')
+        """
+        cache_key = self._analysis_cache_key(resume_data, job_config)
+        cached, cache_status = self.analysis_cache.get_with_status(cache_key)
+        if cached is not None:
+            return {**cached, 'cache_status': cache_status}
+        
+        result = self._analyze_resume_quality_uncached(resume_data, job_config)
+        if result.get('success'):
+            self.analysis_cache.set(cache_key, result)
+        return {**result, 'cache_status': cache_status}
+    
+    async def analyze_resume_quality_async(self, resume_data: Dict, job_config: Dict) -> Dict[str, Any]:
+        """
+        Async analyze_resume_quality: same prompts, cache and result shape,
+        through the aio client under the shared limiter and timeout
+        """
+        cache_key = self._analysis_cache_key(resume_data, job_config)
+        cached, cache_status = self.analysis_cache.get_with_status(cache_key)
+        if cached is not None:
+            return {**cached, 'cache_status': cache_status}
+        
+        result = await self._analyze_resume_quality_uncached_async(resume_data, job_config)
+        if result.get('success'):
+            self.analysis_cache.set(cache_key, result)
+        return {**result, 'cache_status': cache_status}
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters of the analysis cache"""
+        return self.analysis_cache.stats()
+    
+    def response_stats(self) -> Dict[str, Any]:
+        """Analysis call outcomes and the share of analyses that needed a second call"""
+        with self._counts_lock:
+            stats = dict(self._response_counts)
+        stats['retry_rate'] = round(stats['retries'] / stats['analyses'], 4) if stats['analyses'] else 0.0
+        return stats
+    
+    def _count(self, outcome: str) -> None:
+        with self._counts_lock:
+            self._response_counts[outcome] += 1
+    
+    def _generate(self, prompt: str, schema: Optional[Dict[str, Any]] = None):
+        """Blocking Gemini call; with a schema the response is JSON following it"""
+        return self.client.models.generate_content(
+            model=self.model_name,
+            contents=prompt,
+            config=json_config(schema) if schema else None
+        )
+    
+    async def _generate_async(self, prompt: str, schema: Optional[Dict[str, Any]] = None):
+        """
+        Non-blocking Gemini call, queued behind the shared concurrency limit
+        
+        client.aio is natively async, so a call cancelled by the limiter's
+        timeout closes its request instead of leaving a thread blocked on it.
+        """
+        return await self.limiter.run(lambda: self.client.aio.models.generate_content(
+            model=self.model_name,
+            contents=prompt,
+            config=json_config(schema) if schema else None
+        ))
+    
+    def _analyze_resume_quality_uncached(self, resume_data: Dict, job_config: Dict) -> Dict[str, Any]:
+        """
+        Run the Gemini analysis in structured-output mode
+        
+        Only an API error (network, quota, timeout) earns a second call with
+        the simple prompt. A blocked or empty response is reported as
+        unavailable, and JSON that fails the strict parse is read leniently
+        from the same response.
         """
         try:
             # Build comprehensive prompt for Gemini analysis
             prompt = self._build_comprehensive_analysis_prompt(resume_data, job_config)
+            self._count('analyses')
             
             try:
-                response = self.client.models.generate_content(
-                    model=self.model_name,
-                    contents=prompt
-                )
-                
-                # Check if response is valid
-                if not response:
-                    raise Exception("No response from Gemini API")
-                
-                # Check for safety blocks or content policy violations
-                if hasattr(response, 'prompt_feedback') and response.prompt_feedback:
-                    if hasattr(response.prompt_feedback, 'block_reason'):
-                        raise Exception(f"Content blocked: {response.prompt_feedback.block_reason}")
-                
-                # Check for finish reason issues
-                if hasattr(response, 'candidates') and response.candidates:
-                    candidate = response.candidates[0]
-                    if hasattr(candidate, 'finish_reason'):
-                        if candidate.finish_reason == 2:  # SAFETY
-                            raise Exception("Response blocked due to safety concerns")
-                        elif candidate.finish_reason == 3:  # RECITATION
-                            raise Exception("Response blocked due to recitation concerns")
-                        elif candidate.finish_reason == 4:  # OTHER
-                            raise Exception("Response blocked for other reasons")
-                
-                # Check if response has text
-                if not hasattr(response, 'text') or not response.text:
-                    raise Exception("No text content in response")
-                
-                # Parse the structured response from Gemini
-                analysis = self._parse_comprehensive_response(response.text)
-                
-                return {
-                    'success': True,
-                    'analysis': analysis,
-                    'error': None
-                }
+                response = self._generate(prompt, ANALYSIS_SCHEMA)
+            except Exception as api_error:
+                print(f"Gemini API call failed: {api_error}")
+                self._count('retries')
+                try:
+                    response = self._generate(self._build_simple_analysis_prompt(resume_data, job_config),
+                                              SIMPLE_ANALYSIS_SCHEMA)
+                except Exception as fallback_error:
+                    print(f"Fallback prompt also failed: {fallback_error}")
+                    return self._analysis_unavailable(f"API error: {str(api_error)}")
+            
+            return self._analysis_success(self._response_text(response))
+        except GeminiResponseError as e:
+            print(f"⚠ Gemini response rejected: {e}")
+            self._count('rejected_responses')
+            return self._analysis_unavailable(f"Response error: {str(e)}")
+        except Exception as e:
+            print(f"Error during AI analysis: {e}")
+            return self._analysis_error(e)
+    
+    async def _analyze_resume_quality_uncached_async(self, resume_data: Dict, job_config: Dict) -> Dict[str, Any]:
+        """Async _analyze_resume_quality_uncached"""
+        try:
+            prompt = self._build_comprehensive_analysis_prompt(resume_data, job_config)
+            self._count('analyses')
+            
+            try:
+                response = await self._generate_async(prompt, ANALYSIS_SCHEMA)
             except Exception as api_error:
                 print(f"Gemini API call failed: {api_error}")
-                # Try with a simpler prompt as fallback
+                self._count('retries')
                 try:
-                    simple_prompt = self._build_simple_analysis_prompt(resume_data, job_config)
-                    response = self.client.models.generate_content(
-                        model=self.model_name,
-                        contents=simple_prompt
+                    response = await self._generate_async(
+                        self._build_simple_analysis_prompt(resume_data, job_config), SIMPLE_ANALYSIS_SCHEMA
                     )
-                    
-                    if response and hasattr(response, 'text') and response.text:
-                        analysis = self._parse_comprehensive_response(response.text)
-                    
-                    return {
-                        'success': True,
-                        'analysis': analysis,
-                        'error': None
-                    }
                 except Exception as fallback_error:
                     print(f"Fallback prompt also failed: {fallback_error}")
-                
-                return {
-                    'success': False,
-                    'error': f"API error: {str(api_error)}",
-                    'analysis': {
-                        'overall_assessment': 'AI analysis temporarily unavailable',
-                        'strengths': [],
-                        'weaknesses': [],
-                        'recommendation': 'Manual review recommended',
-                        'component_scores': {
-                            'education': 50,
-                            'experience': 50,
-                            'domain': 50,
-                            'language': 50,
-                            'skill_match': 50
-                        },
-                        'skill_analysis': {
-                            'matched_required': [],
-                            'missing_required': [],
-                            'matched_optional': [],
-                            'all_candidate_skills': []
-                        },
-                        'overall_score': 50
-                    }
-            }
+                    return self._analysis_unavailable(f"API error: {str(api_error)}")
+            
+            return self._analysis_success(self._response_text(response))
+        except GeminiResponseError as e:
+            print(f"⚠ Gemini response rejected: {e}")
+            self._count('rejected_responses')
+            return self._analysis_unavailable(f"Response error: {str(e)}")
         except Exception as e:
             print(f"Error during AI analysis: {e}")
-            return {
-                'success': False,
-                'error': str(e),
-                'analysis': {
-                    'overall_assessment': 'Error analyzing resume',
-                    'strengths': [],
-                    'weaknesses': [],
-                    'recommendation': 'Manual review required',
-                    'component_scores': {
-                        'education': 0,
-                        'experience': 0,
-                        'domain': 0,
-                        'language': 0,
-                        'skill_match': 0
-                    },
-                    'skill_analysis': {
-                        'matched_required': [],
-                        'missing_required': [],
-                        'matched_optional': [],
-                        'all_candidate_skills': []
-                    },
-                    'overall_score': 0
-                }
-            }
+            return self._analysis_error(e)
     
-    def _build_comprehensive_analysis_prompt(self, resume_data: Dict, job_config: Dict) -> str:
-        """Build comprehensive analysis prompt for Gemini to score resume against job description"""
+    def _response_text(self, response) -> str:
+        """Text of a Gemini response; raises GeminiResponseError if it is missing or was blocked"""
+        # Check if response is valid
+        if not response:
+            raise GeminiResponseError("No response from Gemini API")
+        
+        # Check for safety blocks or content policy violations
+        block_reason = getattr(getattr(response, 'prompt_feedback', None), 'block_reason', None)
+        if block_reason:
+            raise GeminiResponseError(f"Content blocked: {getattr(block_reason, 'name', block_reason)}")
+        
+        # Check for finish reason issues
+        if hasattr(response, 'candidates') and response.candidates:
+            candidate = response.candidates[0]
+            # FinishReason is a string enum in google-genai
+            finish_reason = getattr(getattr(candidate, 'finish_reason', None), 'name', None)
+            if finish_reason:
+                if finish_reason == 'SAFETY':
+                    raise GeminiResponseError("Response blocked due to safety concerns")
+                elif finish_reason == 'RECITATION':
+                    raise GeminiResponseError("Response blocked due to recitation concerns")
+                elif finish_reason == 'OTHER':
+                    raise GeminiResponseError("Response blocked for other reasons")
         
-        # Extract candidate information
-        candidate_name = resume_data.get('name', 'Candidate')
-        candidate_email = resume_data.get('email', '')
-        candidate_phone = resume_data.get('phone', '')
+        # Check if response has text
+        if not hasattr(response, 'text') or not response.text:
+            raise GeminiResponseError("No text content in response")
+        
+        return response.text
+    
+    def _analysis_success(self, response_text: str) -> Dict[str, Any]:
+        """Parse the structured response from Gemini into a successful result"""
+        return {
+            'success': True,
+            'analysis': self._parse_structured_analysis(response_text),
+            'error': None
+        }
+    
+    def _parse_structured_analysis(self, response_text: str) -> Dict[str, Any]:
+        """Strict JSON parse of a structured-output analysis, lenient parsing as a fallback"""
+        try:
+            parsed_data = parse_json_object(response_text)
+        except GeminiResponseError as e:
+            # Structured output can still be cut short (e.g. at the token limit)
+            print(f"⚠ {e}; parsing analysis leniently")
+            self._count('lenient_parses')
+            return self._parse_comprehensive_response(response_text)
+        return self._normalise_analysis(parsed_data)
+    
+    def _analysis_unavailable(self, error: str) -> Dict[str, Any]:
+        """Neutral result when Gemini gave no usable analysis"""
+        return {
+            'success': False,
+            'error': error,
+            'analysis': {
+                'overall_assessment': 'AI analysis temporarily unavailable',
+                'strengths': [],
+                'weaknesses': [],
+                'recommendation': 'Manual review recommended',
+                'component_scores': {
+                    'education': 50,
+                    'experience': 50,
+                    'domain': 50,
+                    'language': 50,
+                    'skill_match': 50
+                },
+                'skill_analysis': {
+                    'matched_required': [],
+                    'missing_required': [],
+                    'matched_optional': [],
+                    'all_candidate_skills': []
+                },
+                'overall_score': 50
+            }
+        }
+    
+    def _analysis_error(self, error: Exception) -> Dict[str, Any]:
+        """Zero-score result when the analysis could not be attempted"""
+        return {
+            'success': False,
+            'error': str(error),
+            'analysis': {
+                'overall_assessment': 'Error analyzing resume',
+                'strengths': [],
+                'weaknesses': [],
+                'recommendation': 'Manual review required',
+                'component_scores': {
+                    'education': 0,
+                    'experience': 0,
+                    'domain': 0,
+                    'language': 0,
+                    'skill_match': 0
+                },
+                'skill_analysis': {
+                    'matched_required': [],
+                    'missing_required': [],
+                    'matched_optional': [],
+                    'all_candidate_skills': []
+                },
+                'overall_score': 0
+            }
+        }
+    
+    def _candidate_skills(self, resume_data: Dict) -> List[str]:
+        """Resume skill list from parser output ({'skills': [...], ...}) or a plain list"""
+        skills_info = resume_data.get('skills', {})
+        if isinstance(skills_info, dict):
+            return list(skills_info.get('skills', []))
+        if isinstance(skills_info, list):
+            return skills_info
+        return []
+    
+    def _position_count(self, resume_data: Dict) -> int:
+        """Positions held, from parser output ({'job_titles': [...], ...}) or a list of positions"""
+        experience = resume_data.get('experience', [])
+        if isinstance(experience, dict):
+            return len(experience.get('job_titles', []))
+        return len(experience)
+    
+    def _analysis_prompt_inputs(self, resume_data: Dict, job_config: Dict) -> Dict[str, Any]:
+        """
+        The resume/job fields the analysis prompts actually use
         
+        Both the comprehensive and the simple prompt are built from these
+        values only, so they also form the analysis cache key.
+        """
         # Extract education
         education_info = resume_data.get('education', {})
         if isinstance(education_info, dict):
             degree = education_info.get('degree', '')
             institution = education_info.get('institution', '')
-            year = education_info.get('year', '')
         else:
             degree = str(education_info)
             institution = ''
-            year = ''
         
         # Extract experience
         experience_info = resume_data.get('experience', {})
         if isinstance(experience_info, dict):
             total_years = experience_info.get('total_years', 0)
-            experiences = experience_info.get('experiences', [])
         else:
             total_years = 0
-            experiences = []
         
         # Extract skills
-        skills_info = resume_data.get('skills', {})
-        if isinstance(skills_info, dict):
-            candidate_skills = skills_info.get('skills', [])
-        elif isinstance(skills_info, list):
-            candidate_skills = skills_info
-        else:
-            candidate_skills = []
+        candidate_skills = self._candidate_skills(resume_data)
         
         # Extract job information
-        job_title = job_config.get('job_title', 'Position')
-        job_description = job_config.get('job_description', '')
         required_skills = job_config.get('required_skills', [])
-        optional_skills = job_config.get('optional_skills', [])
-        required_experience = job_config.get('required_experience_years', 0)
-        required_education = job_config.get('required_education_level', 'Bachelor')
+        
+        return {
+            'degree': degree,
+            'institution': institution,
+            'total_years': total_years,
+            'candidate_skills': list(candidate_skills[:10]),
+            'job_title': job_config.get('job_title', 'Position'),
+            'required_skills': list(required_skills[:5]),
+            'required_experience': job_config.get('required_experience_years', 0),
+            'required_education': job_config.get('required_education_level', 'Bachelor')
+        }
+    
+    def _analysis_cache_key(self, resume_data: Dict, job_config: Dict) -> str:
+        """Hash of the prompt inputs, model name and prompt version"""
+        inputs = json.dumps(self._analysis_prompt_inputs(resume_data, job_config), sort_keys=True, default=str)
+        return sha256_hex(inputs, self.model_name, self.PROMPT_VERSION)
+    
+    def _build_comprehensive_analysis_prompt(self, resume_data: Dict, job_config: Dict) -> str:
+        """Build comprehensive analysis prompt for Gemini to score resume against job description"""
+        inputs = self._analysis_prompt_inputs(resume_data, job_config)
+        degree = inputs['degree']
+        institution = inputs['institution']
+        total_years = inputs['total_years']
+        candidate_skills = inputs['candidate_skills']
+        job_title = inputs['job_title']
+        required_skills = inputs['required_skills']
+        required_experience = inputs['required_experience']
+        required_education = inputs['required_education']
         
         prompt = f"""
 Analyze this candidate for the {job_title} position.
@@ -275,27 +454,12 @@ Provide scores (0-100) and analysis in this JSON format:
 
     def _build_simple_analysis_prompt(self, resume_data: Dict, job_config: Dict) -> str:
         """Build a simpler prompt to avoid safety blocks"""
-        job_title = job_config.get('job_title', 'Position')
-        required_skills = job_config.get('required_skills', [])
-        
-        # Extract basic info
-        candidate_skills = []
-        if isinstance(resume_data.get('skills'), dict):
-            candidate_skills = resume_data['skills'].get('skills', [])
-        elif isinstance(resume_data.get('skills'), list):
-            candidate_skills = resume_data['skills']
-        
-        education_info = resume_data.get('education', {})
-        if isinstance(education_info, dict):
-            degree = education_info.get('degree', '')
-        else:
-            degree = str(education_info)
-        
-        experience_info = resume_data.get('experience', {})
-        if isinstance(experience_info, dict):
-            total_years = experience_info.get('total_years', 0)
-        else:
-            total_years = 0
+        inputs = self._analysis_prompt_inputs(resume_data, job_config)
+        job_title = inputs['job_title']
+        required_skills = inputs['required_skills']
+        candidate_skills = inputs['candidate_skills']
+        degree = inputs['degree']
+        total_years = inputs['total_years']
         
         prompt = f"""
 Rate this candidate for {job_title}:
@@ -457,53 +621,7 @@ Analyze deeply, be specific, and provide actionable insights. Focus on fit for t
             json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
             if json_match:
                 json_str = json_match.group()
-                parsed_data = json.loads(json_str)
-                
-                # Handle both comprehensive and simple response formats
-                if 'component_scores' in parsed_data:
-                    # Comprehensive format
-                    return {
-                        'overall_assessment': parsed_data.get('overall_assessment', 'Analysis completed'),
-                        'strengths': parsed_data.get('strengths', []),
-                        'weaknesses': parsed_data.get('weaknesses', []),
-                        'recommendation': parsed_data.get('recommendation', 'Manual review recommended'),
-                        'component_scores': parsed_data.get('component_scores', {
-                            'education': 50,
-                            'experience': 50,
-                            'domain': 50,
-                            'language': 50,
-                            'skill_match': 50
-                        }),
-                        'skill_analysis': parsed_data.get('skill_analysis', {
-                            'matched_required': [],
-                            'missing_required': [],
-                            'matched_optional': [],
-                            'all_candidate_skills': []
-                        }),
-                        'overall_score': parsed_data.get('overall_score', 50)
-                    }
-                else:
-                    # Simple format - convert to comprehensive format
-                    return {
-                        'overall_assessment': f"Candidate analysis completed with {parsed_data.get('overall_score', 50)}% overall score",
-                        'strengths': [],
-                        'weaknesses': [],
-                        'recommendation': parsed_data.get('recommendation', 'Manual review recommended'),
-                        'component_scores': {
-                            'education': parsed_data.get('education', 50),
-                            'experience': parsed_data.get('experience', 50),
-                            'domain': parsed_data.get('domain', 50),
-                            'language': parsed_data.get('language', 50),
-                            'skill_match': parsed_data.get('skill_match', 50)
-                        },
-                        'skill_analysis': {
-                            'matched_required': [],
-                            'missing_required': [],
-                            'matched_optional': [],
-                            'all_candidate_skills': []
-                        },
-                        'overall_score': parsed_data.get('overall_score', 50)
-                    }
+                return self._normalise_analysis(json.loads(json_str))
             else:
                 # Fallback parsing if JSON not found
                 return self._fallback_parse_response(response_text)
@@ -512,6 +630,54 @@ Analyze deeply, be specific, and provide actionable insights. Focus on fit for t
             print(f"Error parsing comprehensive response: {e}")
             return self._fallback_parse_response(response_text)
     
+    def _normalise_analysis(self, parsed_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Shape a parsed comprehensive or simple analysis into the comprehensive format"""
+        # Handle both comprehensive and simple response formats
+        if 'component_scores' in parsed_data:
+            # Comprehensive format
+            return {
+                'overall_assessment': parsed_data.get('overall_assessment', 'Analysis completed'),
+                'strengths': parsed_data.get('strengths', []),
+                'weaknesses': parsed_data.get('weaknesses', []),
+                'recommendation': parsed_data.get('recommendation', 'Manual review recommended'),
+                'component_scores': parsed_data.get('component_scores', {
+                    'education': 50,
+                    'experience': 50,
+                    'domain': 50,
+                    'language': 50,
+                    'skill_match': 50
+                }),
+                'skill_analysis': parsed_data.get('skill_analysis', {
+                    'matched_required': [],
+                    'missing_required': [],
+                    'matched_optional': [],
+                    'all_candidate_skills': []
+                }),
+                'overall_score': parsed_data.get('overall_score', 50)
+            }
+        else:
+            # Simple format - convert to comprehensive format
+            return {
+                'overall_assessment': f"Candidate analysis completed with {parsed_data.get('overall_score', 50)}% overall score",
+                'strengths': [],
+                'weaknesses': [],
+                'recommendation': parsed_data.get('recommendation', 'Manual review recommended'),
+                'component_scores': {
+                    'education': parsed_data.get('education', 50),
+                    'experience': parsed_data.get('experience', 50),
+                    'domain': parsed_data.get('domain', 50),
+                    'language': parsed_data.get('language', 50),
+                    'skill_match': parsed_data.get('skill_match', 50)
+                },
+                'skill_analysis': {
+                    'matched_required': [],
+                    'missing_required': [],
+                    'matched_optional': [],
+                    'all_candidate_skills': []
+                },
+                'overall_score': parsed_data.get('overall_score', 50)
+            }
+    
     def _fallback_parse_response(self, response_text: str) -> Dict[str, Any]:
         """Fallback parsing when JSON parsing fails"""
         try:
@@ -607,10 +773,30 @@ Analyze deeply, be specific, and provide actionable insights. Focus on fit for t
         prompt = self._build_comparison_prompt(top_candidates, job_config)
         
         try:
-            response = self.client.models.generate_content(
-                model=self.model_name,
-                contents=prompt
-            )
+            response = self._generate(prompt)
+            
+            return {
+                'success': True,
+                'comparison': response.text,
+                'candidates_analyzed': len(top_candidates)
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'error': str(e)
+            }
+    
+    async def compare_candidates_async(self, candidates: List[Dict], job_config: Dict, top_n: int = 3) -> Dict[str, Any]:
+        """Async compare_candidates (aio client, shared limiter and timeout)"""
+        if not candidates:
+            return {'success': False, 'error': 'No candidates provided'}
+        
+        top_candidates = sorted(candidates, key=lambda x: x.get('overall_score', 0), reverse=True)[:top_n]
+        
+        prompt = self._build_comparison_prompt(top_candidates, job_config)
+        
+        try:
+            response = await self._generate_async(prompt)
             
             return {
                 'success': True,
@@ -678,11 +864,29 @@ Be specific and actionable in your analysis."""
         prompt = self._build_interview_questions_prompt(resume_data, job_config, focus_areas)
         
         try:
-            response = self.client.models.generate_content(
-                model=self.model_name,
-                contents=prompt
-            )
-            questions = self._parse_interview_questions(response.text)
+            response = self._generate(prompt, INTERVIEW_QUESTIONS_SCHEMA)
+            questions = self._parse_interview_response(response.text)
+            
+            return {
+                'success': True,
+                'questions': questions,
+                'raw_response': response.text
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'error': str(e),
+                'questions': {}
+            }
+    
+    async def generate_interview_questions_async(self, resume_data: Dict, job_config: Dict,
+                                                 focus_areas: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Async generate_interview_questions (aio client, shared limiter and timeout)"""
+        prompt = self._build_interview_questions_prompt(resume_data, job_config, focus_areas)
+        
+        try:
+            response = await self._generate_async(prompt, INTERVIEW_QUESTIONS_SCHEMA)
+            questions = self._parse_interview_response(response.text)
             
             return {
                 'success': True,
@@ -700,8 +904,8 @@ Be specific and actionable in your analysis."""
         """Build prompt for interview question generation"""
         
         candidate_name = resume_data.get('name', 'the candidate')
-        skills = resume_data.get('skills', [])
-        experience = resume_data.get('experience', [])
+        skills = self._candidate_skills(resume_data)
+        positions = self._position_count(resume_data)
         job_title = job_config.get('job_title', 'Unknown Position')
         
         focus_text = ""
@@ -712,7 +916,7 @@ Be specific and actionable in your analysis."""
 
 **CANDIDATE BACKGROUND:**
 - Skills: {', '.join(skills[:15]) if skills else 'Not listed'}
-- Experience: {len(experience)} positions
+- Experience: {positions} positions
 {focus_text}
 
 Generate 15-20 interview questions in the following categories:
@@ -740,10 +944,27 @@ Generate 15-20 interview questions in the following categories:
    - Questions about missing skills or experience
    - Learning and adaptation questions
 
-Format as a clear, numbered list under each category. Make questions specific to the candidate's background."""
+Return the questions of each category as a JSON list under the keys technical, experience, behavioral, job_specific and gap_analysis. Make questions specific to the candidate's background."""
 
         return prompt
     
+    def _parse_interview_response(self, response_text: str) -> Dict[str, List[str]]:
+        """Categorised questions from a structured-output response (numbered text as a fallback)"""
+        try:
+            data = parse_json_object(response_text)
+        except GeminiResponseError:
+            return self._parse_interview_questions(response_text)
+        
+        return self._interview_categories(data)
+    
+    def _interview_categories(self, data: Dict[str, Any]) -> Dict[str, List[str]]:
+        """Question lists per category from structured output (missing categories are empty)"""
+        questions = {}
+        for category in INTERVIEW_CATEGORIES:
+            items = data.get(category)
+            questions[category] = [str(item).strip() for item in items if str(item).strip()] if isinstance(items, list) else []
+        return questions
+    
     def _parse_interview_questions(self, response_text: str) -> Dict[str, List[str]]:
         """Parse interview questions from response"""
         categories = {
@@ -792,12 +1013,51 @@ Format as a clear, numbered list under each category. Make questions specific to
         Returns:
             Skill development roadmap and recommendations
         """
-        candidate_skills = set(resume_data.get('skills', []))
-        required_skills = set(job_config.get('required_skills', []))
-        optional_skills = set(job_config.get('optional_skills', []))
+        prompt, missing_skills = self._build_roadmap_prompt(resume_data, job_config)
+        
+        try:
+            response = self._generate(prompt)
+            
+            return {
+                'success': True,
+                'roadmap': response.text,
+                'missing_skills': missing_skills
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'error': str(e)
+            }
+    
+    async def get_skill_development_roadmap_async(self, resume_data: Dict, job_config: Dict) -> Dict[str, Any]:
+        """Async get_skill_development_roadmap (aio client, shared limiter and timeout)"""
+        prompt, missing_skills = self._build_roadmap_prompt(resume_data, job_config)
         
-        missing_required = required_skills - candidate_skills
-        missing_optional = optional_skills - candidate_skills
+        try:
+            response = await self._generate_async(prompt)
+            
+            return {
+                'success': True,
+                'roadmap': response.text,
+                'missing_skills': missing_skills
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'error': str(e)
+            }
+    
+    def _missing_skills(self, resume_data: Dict, job_config: Dict) -> Tuple[set, set]:
+        """Required and optional job skills absent from the resume skill list"""
+        candidate_skills = set(self._candidate_skills(resume_data))
+        missing_required = set(job_config.get('required_skills', [])) - candidate_skills
+        missing_optional = set(job_config.get('optional_skills', [])) - candidate_skills
+        return missing_required, missing_optional
+    
+    def _build_roadmap_prompt(self, resume_data: Dict, job_config: Dict) -> Tuple[str, Dict[str, List[str]]]:
+        """Build prompt for the skill development roadmap, plus the missing skills it covers"""
+        candidate_skills = set(self._candidate_skills(resume_data))
+        missing_required, missing_optional = self._missing_skills(resume_data, job_config)
         
         prompt = f"""You are a career development coach. Create a skill development roadmap for a candidate.
 
@@ -835,25 +1095,11 @@ Create a development roadmap with:
 
 Be specific and actionable. Focus on practical learning."""
 
-        try:
-            response = self.client.models.generate_content(
-                model=self.model_name,
-                contents=prompt
-            )
-            
-            return {
-                'success': True,
-                'roadmap': response.text,
-                'missing_skills': {
-                    'required': list(missing_required),
-                    'optional': list(missing_optional)
-                }
-            }
-        except Exception as e:
-            return {
-                'success': False,
-                'error': str(e)
-            }
+        missing_skills = {
+            'required': list(missing_required),
+            'optional': list(missing_optional)
+        }
+        return prompt, missing_skills
     
     def assess_culture_fit(self, resume_data: Dict, company_culture: str, job_config: Dict) -> Dict[str, Any]:
         """
@@ -867,13 +1113,47 @@ Be specific and actionable. Focus on practical learning."""
         Returns:
             Culture fit assessment
         """
+        prompt = self._build_culture_fit_prompt(resume_data, company_culture)
+        
+        try:
+            response = self._generate(prompt)
+            
+            return {
+                'success': True,
+                'assessment': response.text
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'error': str(e)
+            }
+    
+    async def assess_culture_fit_async(self, resume_data: Dict, company_culture: str, job_config: Dict) -> Dict[str, Any]:
+        """Async assess_culture_fit (aio client, shared limiter and timeout)"""
+        prompt = self._build_culture_fit_prompt(resume_data, company_culture)
+        
+        try:
+            response = await self._generate_async(prompt)
+            
+            return {
+                'success': True,
+                'assessment': response.text
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'error': str(e)
+            }
+    
+    def _build_culture_fit_prompt(self, resume_data: Dict, company_culture: str) -> str:
+        """Build prompt for culture fit assessment"""
         prompt = f"""Assess the potential culture fit for this candidate.
 
 **COMPANY CULTURE:** {company_culture}
 
 **CANDIDATE BACKGROUND:**
-- Experience: {len(resume_data.get('experience', []))} positions
-- Skills: {', '.join(resume_data.get('skills', [])[:15])}
+- Experience: {self._position_count(resume_data)} positions
+- Skills: {', '.join(self._candidate_skills(resume_data)[:15])}
 - Domain: {resume_data.get('domain', 'Unknown')}
 
 **INDICATORS FROM RESUME:**
@@ -892,21 +1172,209 @@ Provide:
 
 Be thoughtful and nuanced in your assessment."""
 
-        try:
-            response = self.client.models.generate_content(
-                model=self.model_name,
-                contents=prompt
-            )
+        return prompt
+    
+    def screening_bundle(self, resume_data: Dict, job_config: Dict, company_culture: str = '',
+                         focus_areas: Optional[List[str]] = None,
+                         sections: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Analysis, interview questions, roadmap and culture fit for one candidate
+        
+        The full set is requested from Gemini as one structured response, so
+        the resume and job data are sent once. A subset, or a bundle call that
+        fails, runs the individual methods concurrently instead. The analysis
+        section shares analyze_resume_quality's cache either way.
+        
+        Args:
+            resume_data: Parsed resume data
+            job_config: Job requirements
+            company_culture: Description of company culture (for culture_fit)
+            focus_areas: Optional specific areas for the interview questions
+            sections: Sections to produce (defaults to all of BUNDLE_SECTIONS)
             
-            return {
-                'success': True,
-                'assessment': response.text
+        Returns:
+            Per requested section the result of the matching single method
+            (analyze_resume_quality, generate_interview_questions,
+            get_skill_development_roadmap, assess_culture_fit), plus success
+            (every section succeeded) and mode ('bundle' or 'fan_out')
+            
+        Raises:
+            ValueError: sections is empty or names an unknown section
+        """
+        sections = self._bundle_sections(sections)
+        
+        if sections == BUNDLE_SECTIONS:
+            try:
+                prompt, missing_skills = self._build_bundle_prompt(resume_data, job_config, company_culture, focus_areas)
+                response = self._generate(prompt, BUNDLE_SCHEMA)
+                result = self._bundle_result(self._response_text(response), missing_skills)
+                return self._share_bundle_analysis(result, resume_data, job_config)
+            except Exception as e:
+                print(f"⚠ Screening bundle call failed, running sections separately: {e}")
+                self._count('bundle_fallbacks')
+        
+        calls = self._section_calls(resume_data, job_config, company_culture, focus_areas, sections, run_async=False)
+        with ThreadPoolExecutor(max_workers=len(calls)) as pool:
+            futures = {section: pool.submit(call) for section, call in calls.items()}
+            results = {section: future.result() for section, future in futures.items()}
+        return self._fan_out_result(results)
+    
+    async def screening_bundle_async(self, resume_data: Dict, job_config: Dict, company_culture: str = '',
+                                     focus_areas: Optional[List[str]] = None,
+                                     sections: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Async screening_bundle (aio client, shared limiter and timeout)"""
+        sections = self._bundle_sections(sections)
+        
+        if sections == BUNDLE_SECTIONS:
+            try:
+                prompt, missing_skills = self._build_bundle_prompt(resume_data, job_config, company_culture, focus_areas)
+                response = await self._generate_async(prompt, BUNDLE_SCHEMA)
+                result = self._bundle_result(self._response_text(response), missing_skills)
+                return self._share_bundle_analysis(result, resume_data, job_config)
+            except Exception as e:
+                print(f"⚠ Screening bundle call failed, running sections separately: {e}")
+                self._count('bundle_fallbacks')
+        
+        calls = self._section_calls(resume_data, job_config, company_culture, focus_areas, sections, run_async=True)
+        results = await asyncio.gather(*(call() for call in calls.values()))
+        return self._fan_out_result(dict(zip(calls, results)))
+    
+    def _bundle_sections(self, sections: Optional[List[str]]) -> List[str]:
+        """Requested sections in BUNDLE_SECTIONS order"""
+        if sections is None:
+            return list(BUNDLE_SECTIONS)
+        if not sections:
+            raise ValueError(f"No bundle sections requested, expected some of {BUNDLE_SECTIONS}")
+        unknown = set(sections) - set(BUNDLE_SECTIONS)
+        if unknown:
+            raise ValueError(f"Unknown bundle sections {sorted(unknown)}, expected some of {BUNDLE_SECTIONS}")
+        return [section for section in BUNDLE_SECTIONS if section in sections]
+    
+    def _section_calls(self, resume_data: Dict, job_config: Dict, company_culture: str,
+                       focus_areas: Optional[List[str]], sections: List[str], run_async: bool) -> Dict[str, Any]:
+        """Section -> zero-argument call of the single method that produces it"""
+        if run_async:
+            calls = {
+                'analysis': lambda: self.analyze_resume_quality_async(resume_data, job_config),
+                'interview_questions': lambda: self.generate_interview_questions_async(resume_data, job_config, focus_areas),
+                'roadmap': lambda: self.get_skill_development_roadmap_async(resume_data, job_config),
+                'culture_fit': lambda: self.assess_culture_fit_async(resume_data, company_culture, job_config)
             }
-        except Exception as e:
-            return {
-                'success': False,
-                'error': str(e)
+        else:
+            calls = {
+                'analysis': lambda: self.analyze_resume_quality(resume_data, job_config),
+                'interview_questions': lambda: self.generate_interview_questions(resume_data, job_config, focus_areas),
+                'roadmap': lambda: self.get_skill_development_roadmap(resume_data, job_config),
+                'culture_fit': lambda: self.assess_culture_fit(resume_data, company_culture, job_config)
             }
+        return {section: calls[section] for section in sections}
+    
+    def _bundle_result(self, response_text: str, missing_skills: Dict[str, List[str]]) -> Dict[str, Any]:
+        """Split a bundle response into the single-method result shapes"""
+        data = parse_json_object(response_text)
+        analysis = data.get('analysis')
+        questions = data.get('interview_questions')
+        roadmap = data.get('roadmap')
+        culture_fit = data.get('culture_fit')
+        if not isinstance(analysis, dict) or not isinstance(questions, dict):
+            raise GeminiResponseError("Bundle response is missing the analysis or interview questions")
+        if not isinstance(roadmap, str) or not isinstance(culture_fit, str):
+            raise GeminiResponseError("Bundle response is missing the roadmap or culture fit")
+        
+        self._count('bundles')
+        return {
+            'success': True,
+            'mode': 'bundle',
+            'analysis': {
+                'success': True,
+                'analysis': self._normalise_analysis(analysis),
+                'error': None
+            },
+            'interview_questions': {
+                'success': True,
+                'questions': self._interview_categories(questions),
+                'raw_response': json.dumps(questions)
+            },
+            'roadmap': {
+                'success': True,
+                'roadmap': roadmap,
+                'missing_skills': missing_skills
+            },
+            'culture_fit': {
+                'success': True,
+                'assessment': culture_fit
+            }
+        }
+    
+    def _share_bundle_analysis(self, result: Dict[str, Any], resume_data: Dict, job_config: Dict) -> Dict[str, Any]:
+        """
+        Tie a bundle's analysis section to the analysis cache
+        
+        A cached analysis of the same inputs replaces the bundle's, otherwise
+        the bundle's is stored, so bundle and single calls agree.
+        """
+        cache_key = self._analysis_cache_key(resume_data, job_config)
+        cached, cache_status = self.analysis_cache.get_with_status(cache_key)
+        if cached is None:
+            self.analysis_cache.set(cache_key, result['analysis'])
+            cached = result['analysis']
+        result['analysis'] = {**cached, 'cache_status': cache_status}
+        return result
+    
+    def _fan_out_result(self, results: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        return {
+            'success': all(result.get('success') for result in results.values()),
+            'mode': 'fan_out',
+            **results
+        }
+    
+    def _build_bundle_prompt(self, resume_data: Dict, job_config: Dict, company_culture: str,
+                             focus_areas: Optional[List[str]]) -> Tuple[str, Dict[str, List[str]]]:
+        """Build the one-shot prompt covering every bundle section, plus the missing skills it names"""
+        inputs = self._analysis_prompt_inputs(resume_data, job_config)
+        candidate_skills = inputs['candidate_skills']
+        required_skills = inputs['required_skills']
+        missing_required, missing_optional = self._missing_skills(resume_data, job_config)
+        optional_skills = job_config.get('optional_skills', [])
+        
+        positions = self._position_count(resume_data)
+        
+        focus_text = ""
+        if focus_areas:
+            focus_text = f"\n**INTERVIEW FOCUS AREAS:** {', '.join(focus_areas)}\n"
+        
+        prompt = f"""You are an expert HR recruiter preparing a complete screening pack for a candidate applying for {inputs['job_title']}.
+
+**CANDIDATE:**
+- Education: {inputs['degree']} from {inputs['institution']}
+- Experience: {inputs['total_years']} years, {positions} positions
+- Skills: {', '.join(candidate_skills) if candidate_skills else 'None listed'}
+- Domain: {resume_data.get('domain', 'Unknown')}
+
+**JOB REQUIREMENTS:**
+- Required Skills: {', '.join(required_skills) if required_skills else 'None'}
+- Optional Skills: {', '.join(optional_skills) if optional_skills else 'None'}
+- Required Experience: {inputs['required_experience']} years
+- Required Education: {inputs['required_education']}
+- Missing Required Skills: {', '.join(missing_required) if missing_required else 'None'}
+- Missing Optional Skills: {', '.join(missing_optional) if missing_optional else 'None'}
+
+**COMPANY CULTURE:** {company_culture or 'Not specified'}
+{focus_text}
+Return one JSON object with these sections:
+
+1. "analysis": scores (0-100) for education, experience, domain, language and skill_match in "component_scores", the matched and missing skills in "skill_analysis", plus "overall_score", "overall_assessment", "strengths", "weaknesses" and "recommendation".
+2. "interview_questions": 15-20 questions specific to the candidate's background, as lists under technical, experience, behavioral, job_specific and gap_analysis.
+3. "roadmap": a skill development roadmap as markdown text - top 5 priority skills with learning time and resources, a 3-6 month learning path, recommended certifications, 3-5 project ideas and quick wins.
+4. "culture_fit": a culture fit assessment as markdown text - a score (0-100), the fit level, positive indicators, potential concerns, interview questions to validate fit and onboarding recommendations.
+
+Be specific and actionable."""
+
+        missing_skills = {
+            'required': list(missing_required),
+            'optional': list(missing_optional)
+        }
+        return prompt, missing_skills
 
 
 # Utility function for quick analysis
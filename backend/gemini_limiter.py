@@ -0,0 +1,102 @@
+"""
+Gemini Limiter
+Process-wide concurrency cap and per-call timeout for async Gemini requests,
+shared by GeminiResumeAnalyzer and GeminiSkillMatcher
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+T = TypeVar('T')
+
+
+class GeminiTimeoutError(Exception):
+    """A Gemini call did not finish within its timeout"""
+
+
+class GeminiCallLimiter:
+    """
+    Caps in-flight async Gemini calls and bounds each one with a timeout.
+
+    asyncio semaphores belong to a single event loop, so one is created lazily
+    per running loop and shared by every coroutine on it. The timeout covers
+    the API call only, not the wait for a free slot, so a burst of screenings
+    queues instead of timing out.
+
+    The calls it wraps must be natively async (google-genai's client.aio,
+    google.generativeai's grpc.aio): wait_for cancels them on timeout, so
+    the slot is released only once the request is really gone. Wrapping a
+    blocking call in a thread would free the slot while the thread still runs.
+
+    Defaults come from GEMINI_MAX_CONCURRENCY and GEMINI_TIMEOUT_SECONDS
+    (0 disables the timeout).
+    """
+
+    def __init__(self, max_concurrency: Optional[int] = None, timeout_seconds: Optional[float] = None) -> None:
+        self.max_concurrency = max(1, int(os.getenv('GEMINI_MAX_CONCURRENCY', '32'))
+                                   if max_concurrency is None else max_concurrency)
+        self.timeout_seconds = (float(os.getenv('GEMINI_TIMEOUT_SECONDS', '30'))
+                                if timeout_seconds is None else timeout_seconds)
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+        self._stats = {"calls": 0, "timeouts": 0, "errors": 0, "in_flight": 0, "peak_in_flight": 0}
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        """Semaphore of the running event loop"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphore = self._semaphores.get(loop)
+            if semaphore is None:
+                semaphore = asyncio.Semaphore(self.max_concurrency)
+                self._semaphores[loop] = semaphore
+        return semaphore
+
+    async def run(self, make_call: Callable[[], Awaitable[T]], timeout: Optional[float] = None) -> T:
+        """
+        Await make_call() once a slot is free
+
+        Args:
+            make_call: Creates the awaitable for the API call (called inside the slot)
+            timeout: Seconds allowed for the call (defaults to timeout_seconds)
+
+        Raises:
+            GeminiTimeoutError: The call took longer than the timeout
+        """
+        timeout = self.timeout_seconds if timeout is None else timeout
+        async with self._semaphore():
+            with self._lock:
+                self._stats["calls"] += 1
+                self._stats["in_flight"] += 1
+                self._stats["peak_in_flight"] = max(self._stats["peak_in_flight"], self._stats["in_flight"])
+            try:
+                return await asyncio.wait_for(make_call(), timeout or None)
+            except asyncio.TimeoutError:
+                with self._lock:
+                    self._stats["timeouts"] += 1
+                raise GeminiTimeoutError(f"Gemini call timed out after {timeout:g}s")
+            except Exception:
+                with self._lock:
+                    self._stats["errors"] += 1
+                raise
+            finally:
+                with self._lock:
+                    self._stats["in_flight"] -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Call, timeout and error counters plus current/peak concurrency"""
+        with self._lock:
+            stats = dict(self._stats)
+        stats["max_concurrency"] = self.max_concurrency
+        stats["timeout_seconds"] = self.timeout_seconds
+        return stats
+
+
+# Shared by every analyzer and matcher in the process
+gemini_limiter = GeminiCallLimiter()
@@ -0,0 +1,93 @@
+"""
+Gemini Schemas
+Response schemas for Gemini structured-output mode and a strict parser for
+the JSON it returns
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Dict
+
+# The schemas use the OpenAPI subset Gemini accepts. It has no free-form maps,
+# so per-skill details are arrays of {"skill": ..., ...} objects.
+_STRING = {'type': 'STRING'}
+_NUMBER = {'type': 'NUMBER'}
+_STRING_LIST = {'type': 'ARRAY', 'items': _STRING}
+
+COMPONENT_NAMES = ['education', 'experience', 'domain', 'language', 'skill_match']
+INTERVIEW_CATEGORIES = ['technical', 'experience', 'behavioral', 'job_specific', 'gap_analysis']
+
+
+def _object(properties: Dict[str, Any]) -> Dict[str, Any]:
+    """Object schema with every property required"""
+    return {'type': 'OBJECT', 'properties': properties, 'required': list(properties)}
+
+
+ANALYSIS_SCHEMA = _object({
+    'component_scores': _object({name: _NUMBER for name in COMPONENT_NAMES}),
+    'skill_analysis': _object({
+        'matched_required': _STRING_LIST,
+        'missing_required': _STRING_LIST,
+        'matched_optional': _STRING_LIST,
+        'all_candidate_skills': _STRING_LIST
+    }),
+    'overall_score': _NUMBER,
+    'overall_assessment': _STRING,
+    'strengths': _STRING_LIST,
+    'weaknesses': _STRING_LIST,
+    'recommendation': _STRING
+})
+
+SIMPLE_ANALYSIS_SCHEMA = _object({
+    **{name: _NUMBER for name in COMPONENT_NAMES},
+    'overall_score': _NUMBER,
+    'recommendation': _STRING
+})
+
+INTERVIEW_QUESTIONS_SCHEMA = _object({category: _STRING_LIST for category in INTERVIEW_CATEGORIES})
+
+SKILL_MATCH_SCHEMA = _object({
+    'matched_required': _STRING_LIST,
+    'matched_optional': _STRING_LIST,
+    'missing_required': _STRING_LIST,
+    'equivalencies': {'type': 'ARRAY', 'items': _object({'skill': _STRING, 'matches': _STRING_LIST})},
+    'match_explanations': {'type': 'ARRAY', 'items': _object({'skill': _STRING, 'explanation': _STRING})},
+    'confidence_scores': {'type': 'ARRAY', 'items': _object({'skill': _STRING, 'confidence': _NUMBER})}
+})
+
+
+# Sections of the one-shot screening bundle, in response order
+BUNDLE_SECTIONS = ['analysis', 'interview_questions', 'roadmap', 'culture_fit']
+
+BUNDLE_SCHEMA = _object({
+    'analysis': ANALYSIS_SCHEMA,
+    'interview_questions': INTERVIEW_QUESTIONS_SCHEMA,
+    'roadmap': _STRING,
+    'culture_fit': _STRING
+})
+
+
+class GeminiResponseError(Exception):
+    """Gemini answered, but the response was blocked, empty or not the expected JSON"""
+
+
+def json_config(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """Generation config asking for JSON that follows schema (google-genai and google-generativeai)"""
+    return {'response_mime_type': 'application/json', 'response_schema': schema}
+
+
+def parse_json_object(response_text: str) -> Dict[str, Any]:
+    """
+    Parse a structured-output response
+
+    The whole text must be a single JSON object; nothing is searched for or
+    trimmed. Raises GeminiResponseError otherwise.
+    """
+    try:
+        data = json.loads(response_text)
+    except (TypeError, ValueError) as e:
+        raise GeminiResponseError(f"Response is not valid JSON: {e}")
+    if not isinstance(data, dict):
+        raise GeminiResponseError(f"Expected a JSON object, got {type(data).__name__}")
+    return data
@@ -5,10 +5,14 @@ Uses LLM to understand skill equivalencies and variations
 
 import os
 import json
-from typing import Dict, List, Set
+from typing import Dict, List
 from dotenv import load_dotenv
 import google.generativeai as genai
 
+from gemini_limiter import gemini_limiter
+from gemini_schemas import SKILL_MATCH_SCHEMA, GeminiResponseError, json_config, parse_json_object
+from skill_ontology import canonical_skill, canonical_skill_set
+
 load_dotenv()
 
 class GeminiSkillMatcher:
@@ -25,6 +29,7 @@ class GeminiSkillMatcher:
         
         genai.configure(api_key=api_key)
         self.model = genai.GenerativeModel('gemini-2.5-flash')
+        self.limiter = gemini_limiter
     
     def match_skills(self, resume_skills: List[str], required_skills: List[str], 
                      optional_skills: List[str] = None) -> Dict:
@@ -40,7 +45,46 @@ class GeminiSkillMatcher:
             Dictionary with matched/missing skills and AI insights
         """
         optional_skills = optional_skills or []
+        prompt = self._build_match_prompt(resume_skills, required_skills, optional_skills)
+        
+        try:
+            response = self.model.generate_content(prompt, generation_config=json_config(SKILL_MATCH_SCHEMA),
+                                                   request_options=self._request_options())
+            return self._match_result(self._parse_json_response(response.text))
+        except Exception as e:
+            print(f"⚠️ Gemini skill matching failed: {e}")
+            # Fallback to basic matching
+            return self._fallback_match(resume_skills, required_skills, optional_skills)
+    
+    async def match_skills_async(self, resume_skills: List[str], required_skills: List[str],
+                                 optional_skills: List[str] = None) -> Dict:
+        """
+        Async match_skills: uses generate_content_async under the shared
+        Gemini concurrency limit and timeout, with the same fallback
+        
+        generate_content_async is a grpc.aio call, so the limiter's timeout
+        cancels the request itself; the RPC deadline bounds it as well.
+        """
+        optional_skills = optional_skills or []
+        prompt = self._build_match_prompt(resume_skills, required_skills, optional_skills)
         
+        try:
+            response = await self.limiter.run(lambda: self.model.generate_content_async(
+                prompt, generation_config=json_config(SKILL_MATCH_SCHEMA), request_options=self._request_options()
+            ))
+            return self._match_result(self._parse_json_response(response.text))
+        except Exception as e:
+            print(f"⚠️ Gemini skill matching failed: {e}")
+            return self._fallback_match(resume_skills, required_skills, optional_skills)
+    
+    def _request_options(self) -> Dict:
+        """RPC deadline matching the shared limiter's timeout (none when it is disabled)"""
+        timeout = self.limiter.timeout_seconds
+        return {'timeout': timeout} if timeout else {}
+    
+    def _build_match_prompt(self, resume_skills: List[str], required_skills: List[str],
+                            optional_skills: List[str]) -> str:
+        """Build the skill matching prompt"""
         prompt = f"""You are an expert technical recruiter. Analyze the skill matching between a resume and job requirements.
 
 RESUME SKILLS:
@@ -63,43 +107,62 @@ Respond in JSON format:
     "matched_required": ["skill1", "skill2"],
     "matched_optional": ["skill3"],
     "missing_required": ["skill4"],
-    "equivalencies": {{
-        "nodejs": ["Node.js", "node"],
-        "expressjs": ["Express.js", "Express", "express"],
-        "c": ["C Programming", "C Language"]
-    }},
-    "match_explanations": {{
-        "nodejs": "Matched 'Node.js' in resume to 'nodejs' in requirements",
-        "c": "Matched 'C Programming' in resume to 'c' in requirements"
-    }},
-    "confidence_scores": {{
-        "python": 1.0,
-        "nodejs": 0.95,
-        "c": 0.9
-    }}
+    "equivalencies": [
+        {{"skill": "nodejs", "matches": ["Node.js", "node"]}},
+        {{"skill": "expressjs", "matches": ["Express.js", "Express", "express"]}},
+        {{"skill": "c", "matches": ["C Programming", "C Language"]}}
+    ],
+    "match_explanations": [
+        {{"skill": "nodejs", "explanation": "Matched 'Node.js' in resume to 'nodejs' in requirements"}},
+        {{"skill": "c", "explanation": "Matched 'C Programming' in resume to 'c' in requirements"}}
+    ],
+    "confidence_scores": [
+        {{"skill": "python", "confidence": 1.0}},
+        {{"skill": "nodejs", "confidence": 0.95}},
+        {{"skill": "c", "confidence": 0.9}}
+    ]
 }}"""
 
-        try:
-            response = self.model.generate_content(prompt)
-            result = self._parse_json_response(response.text)
-            
-            return {
-                'success': True,
-                'matched_required': result.get('matched_required', []),
-                'matched_optional': result.get('matched_optional', []),
-                'missing_required': result.get('missing_required', []),
-                'equivalencies': result.get('equivalencies', {}),
-                'match_explanations': result.get('match_explanations', {}),
-                'confidence_scores': result.get('confidence_scores', {}),
-                'ai_insights': self._generate_insights(result)
-            }
-        except Exception as e:
-            print(f"⚠️ Gemini skill matching failed: {e}")
-            # Fallback to basic matching
-            return self._fallback_match(resume_skills, required_skills, optional_skills)
+        return prompt
+    
+    def _match_result(self, result: Dict) -> Dict:
+        """Shape Gemini's parsed JSON into the match result"""
+        # The response schema lists per-skill details as arrays; callers get skill -> value maps
+        result = dict(result)
+        result['equivalencies'] = self._skill_map(result.get('equivalencies'), 'matches')
+        result['match_explanations'] = self._skill_map(result.get('match_explanations'), 'explanation')
+        result['confidence_scores'] = self._skill_map(result.get('confidence_scores'), 'confidence')
+        
+        return {
+            'success': True,
+            'matched_required': result.get('matched_required', []),
+            'matched_optional': result.get('matched_optional', []),
+            'missing_required': result.get('missing_required', []),
+            'equivalencies': result.get('equivalencies', {}),
+            'match_explanations': result.get('match_explanations', {}),
+            'confidence_scores': result.get('confidence_scores', {}),
+            'ai_insights': self._generate_insights(result)
+        }
+    
+    def _skill_map(self, entries, value_key: str) -> Dict:
+        """[{"skill": s, value_key: v}, ...] -> {s: v} (maps are passed through)"""
+        if isinstance(entries, dict):
+            return entries
+        if not isinstance(entries, list):
+            return {}
+        return {
+            entry['skill']: entry.get(value_key)
+            for entry in entries
+            if isinstance(entry, dict) and entry.get('skill')
+        }
     
     def _parse_json_response(self, response_text: str) -> Dict:
-        """Extract JSON from Gemini response"""
+        """Parse the structured-output JSON, tolerating a markdown code fence"""
+        try:
+            return parse_json_object(response_text)
+        except GeminiResponseError:
+            pass
+        
         # Remove markdown code blocks if present
         text = response_text.strip()
         if text.startswith('```json'):
@@ -132,28 +195,19 @@ Respond in JSON format:
     def _fallback_match(self, resume_skills: List[str], required_skills: List[str], 
                         optional_skills: List[str]) -> Dict:
         """Fallback to basic matching if Gemini fails"""
-        resume_lower = {s.lower().strip() for s in resume_skills}
+        resume_ids = canonical_skill_set(resume_skills)
         
         matched_required = []
         missing_required = []
         
         for skill in required_skills:
-            skill_lower = skill.lower().strip()
-            # Basic variation matching
-            variations = self._get_variations(skill_lower)
-            
-            if any(v in resume_lower for v in variations):
+            # Basic variation matching via canonical skill IDs
+            if canonical_skill(skill) in resume_ids:
                 matched_required.append(skill)
             else:
                 missing_required.append(skill)
         
-        matched_optional = []
-        for skill in optional_skills:
-            skill_lower = skill.lower().strip()
-            variations = self._get_variations(skill_lower)
-            
-            if any(v in resume_lower for v in variations):
-                matched_optional.append(skill)
+        matched_optional = [skill for skill in optional_skills if canonical_skill(skill) in resume_ids]
         
         return {
             'success': False,
@@ -165,22 +219,3 @@ Respond in JSON format:
             'confidence_scores': {},
             'ai_insights': 'Using fallback matching (Gemini unavailable)'
         }
-    
-    def _get_variations(self, skill: str) -> Set[str]:
-        """Generate basic variations for a skill"""
-        variations = {skill}
-        
-        # Handle dots
-        if '.' in skill:
-            variations.add(skill.replace('.', ''))
-            variations.add(skill.replace('.', ' '))
-            base = skill.split('.')[0]
-            variations.add(base)
-        else:
-            if skill.endswith('js') and len(skill) > 2:
-                base = skill[:-2]
-                variations.add(f"{base}.js")
-                variations.add(f"{base} js")
-                variations.add(base)
-        
-        return variations
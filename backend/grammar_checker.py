@@ -0,0 +1,196 @@
+"""
+Grammar Checker
+Background grammar checks of resume text against a pre-warmed local
+LanguageTool server, cached by text hash
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from persistent_cache import PersistentLRUCache, sha256_hex
+
+# Bump when the sample or scoring below changes, so cached checks are redone
+GRAMMAR_CHECK_VERSION = "1"
+
+# Layout and style noise in resume text (bullets, spacing, title case), not grammar
+_IGNORED_CATEGORIES = {'TYPOGRAPHY', 'CASING', 'STYLE', 'REDUNDANCY'}
+_IGNORED_ISSUE_TYPES = {'whitespace', 'typographical', 'style'}
+
+# Score lost per error per 100 words
+_ERROR_PENALTY = 10
+_MAX_ISSUES = 20
+
+_WORD_PATTERN = re.compile(r'\S+')
+
+
+def grammar_sample(text: str, max_words: int) -> str:
+    """The text up to its max_words-th word, line breaks kept"""
+    if max_words <= 0:
+        return text
+    end = 0
+    for index, match in enumerate(_WORD_PATTERN.finditer(text)):
+        if index == max_words:
+            break
+        end = match.end()
+    return text[:end]
+
+
+def _counts_as_error(match: Any, text: str) -> bool:
+    """False for layout noise and for 'misspelt' names, acronyms and tech terms"""
+    if getattr(match, 'category', '') in _IGNORED_CATEGORIES:
+        return False
+    issue_type = getattr(match, 'ruleIssueType', '')
+    if issue_type in _IGNORED_ISSUE_TYPES:
+        return False
+    if issue_type == 'misspelling':
+        word = text[match.offset:match.offset + match.errorLength]
+        return word.isalpha() and word.islower()
+    return True
+
+
+def score_matches(matches: List[Any], text: str) -> Dict[str, Any]:
+    """language_quality fields from LanguageTool matches on text"""
+    errors = [match for match in matches if _counts_as_error(match, text)]
+    word_count = len(text.split())
+    errors_per_100_words = len(errors) / word_count * 100 if word_count else 0
+    grammar_score = max(0, min(100, 100 - errors_per_100_words * _ERROR_PENALTY))
+    return {
+        'grammar_score': round(grammar_score, 2),
+        # ScreeningContext and the Gemini prompt read the language score from 'score'
+        'score': round(grammar_score, 2),
+        'error_count': len(errors),
+        'errors_per_100_words': round(errors_per_100_words, 2),
+        'checked_word_count': word_count,
+        'issues': [
+            {'rule': match.ruleId, 'category': match.category, 'message': match.message,
+             'context': match.context, 'replacements': list(match.replacements[:3])}
+            for match in errors[:_MAX_ISSUES]
+        ],
+        'quality_rating': ('Excellent' if grammar_score >= 90 else 'Good' if grammar_score >= 75
+                           else 'Fair' if grammar_score >= 60 else 'Needs Improvement'),
+        'checked_by': 'languagetool'
+    }
+
+
+class GrammarChecker:
+    """
+    Runs LanguageTool grammar checks off the request path.
+
+    One local LanguageTool server (a Java process started by
+    language_tool_python) is launched and warmed up in the background when
+    the checker is created; ``workers`` threads send it checks concurrently.
+    Results are cached by hash of the checked text, so a resume (or an
+    identical one under another file name) is only checked once.
+
+    Defaults come from GRAMMAR_CHECK_LANGUAGE, GRAMMAR_CHECK_WORKERS,
+    GRAMMAR_CHECK_MAX_WORDS (0 checks the whole text) and
+    GRAMMAR_CHECK_CACHE_PATH. If language_tool_python or Java is missing,
+    every check fails and screenings keep the heuristic language score.
+    """
+
+    def __init__(self, language: Optional[str] = None, workers: Optional[int] = None,
+                 max_words: Optional[int] = None, start_timeout: float = 300.0) -> None:
+        self.language = language or os.getenv('GRAMMAR_CHECK_LANGUAGE', 'en-US')
+        self.size = max(1, int(os.getenv('GRAMMAR_CHECK_WORKERS', '2')) if workers is None else workers)
+        self.max_words = int(os.getenv('GRAMMAR_CHECK_MAX_WORDS', '1000')) if max_words is None else max_words
+        self.start_timeout = start_timeout
+        self.cache = PersistentLRUCache(
+            'grammar_check',
+            db_path=os.getenv('GRAMMAR_CHECK_CACHE_PATH'),
+            max_entries=int(os.getenv('GRAMMAR_CHECK_CACHE_SIZE', '512'))
+        )
+
+        self._tool = None
+        self._start_error: Optional[str] = None
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+        self._stats = {"checks": 0, "failures": 0, "check_seconds": 0.0}
+        self._executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix='grammar-check')
+        threading.Thread(target=self._start, name='grammar-check-start', daemon=True).start()
+
+    def _start(self) -> None:
+        """Launch the LanguageTool server and run one check so the first real one is fast"""
+        try:
+            import language_tool_python
+
+            start = time.perf_counter()
+            tool = language_tool_python.LanguageTool(self.language)
+            tool.check("Led a team of five engineers and shipped the new billing system.")
+            self._tool = tool
+            print(f"✓ LanguageTool server ready in {time.perf_counter() - start:.1f}s")
+        except Exception as e:
+            self._start_error = str(e)
+            print(f"⚠ LanguageTool unavailable, keeping heuristic language scores: {e}")
+        finally:
+            self._ready.set()
+
+    @property
+    def unavailable(self) -> bool:
+        """True once LanguageTool has failed to start (no check will ever run)"""
+        return self._ready.is_set() and self._tool is None
+
+    def _cache_key(self, sample: str) -> str:
+        return sha256_hex(sample, self.language, GRAMMAR_CHECK_VERSION)
+
+    def cached(self, text: str) -> Optional[Dict[str, Any]]:
+        """A finished check of text, or None (never runs a check)"""
+        return self.cache.get(self._cache_key(grammar_sample(text, self.max_words)))
+
+    def check(self, text: str) -> Dict[str, Any]:
+        """
+        Grammar-check text now (blocking; cached)
+
+        Raises:
+            RuntimeError: LanguageTool could not be started
+        """
+        sample = grammar_sample(text, self.max_words)
+        cache_key = self._cache_key(sample)
+        result = self.cache.get(cache_key)
+        if result is not None:
+            return result
+
+        if not self._ready.wait(self.start_timeout) or self._tool is None:
+            raise RuntimeError(f"LanguageTool not available: {self._start_error or 'still starting'}")
+        start = time.perf_counter()
+        matches = self._tool.check(sample)
+        result = score_matches(matches, sample)
+        with self._lock:
+            self._stats["checks"] += 1
+            self._stats["check_seconds"] += time.perf_counter() - start
+        self.cache.set(cache_key, result)
+        return result
+
+    def submit(self, text: str, on_done: Callable[[Dict[str, Any]], None]) -> Future:
+        """Check text in the background and call on_done(result) once it is ready (not on failure)"""
+        def run() -> None:
+            try:
+                result = self.check(text)
+            except Exception as e:
+                with self._lock:
+                    self._stats["failures"] += 1
+                print(f"⚠ Grammar check failed: {e}")
+                return
+            on_done(result)
+        return self._executor.submit(run)
+
+    def close(self) -> None:
+        """Stop the workers and the LanguageTool server"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        if self._tool is not None:
+            self._tool.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Check counts, mean check time, server state and cache hit rates"""
+        with self._lock:
+            stats = dict(self._stats)
+        checks = stats.pop("check_seconds")
+        stats["mean_check_seconds"] = round(checks / stats["checks"], 3) if stats["checks"] else 0.0
+        stats["server"] = "ready" if self._tool is not None else ("failed" if self.unavailable else "starting")
+        stats["cache"] = self.cache.stats()
+        return stats
@@ -0,0 +1,313 @@
+"""
+JD Relevance
+Per-job TF-IDF model with BM25 term weighting, fitted over a job description
+and its applicant pool, scoring resume/JD cosine relevance for a whole pool
+in one sparse matrix-vector product
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import Counter
+from itertools import repeat
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from persistent_cache import sha256_hex
+from resume_sections import TOKEN_PATTERN
+
+# BM25 term-frequency saturation and document length normalisation
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Cosine that earns a component score of 100. A resume shares only part of its
+# vocabulary with a JD (names, employers and project names match nothing), so
+# even strong matches stay well below 1: on a mixed pool of 900 synthetic
+# software/sales/HR resumes, resumes on the JD's track scored 0.12-0.25 and
+# off-track ones 0.01-0.03.
+FULL_MARKS_COSINE = 0.2
+
+
+def term_counts(text: str) -> Counter:
+    """
+    Token counts of text, tokenized like resume sections (c++, node.js kept
+    whole); numbers (years, phone digits, grades) are left out
+    """
+    counts = Counter(TOKEN_PATTERN.findall(text.lower()))
+    for term in [term for term in counts if term.isdigit()]:
+        del counts[term]
+    return counts
+
+
+class JDRelevanceModel:
+    """
+    TF-IDF vectoriser for one job, with BM25 weights.
+
+    Document frequencies come from the job description plus every resume
+    in the job's pool, so terms all applicants share (company boilerplate,
+    "experience") weigh little and distinctive ones weigh a lot. Term
+    frequencies are BM25-saturated and length-normalised, so long resumes
+    do not win by repetition. A resume's relevance is the cosine between
+    its weighted vector and the JD's.
+
+    Documents are term_counts() of their text, so a pool is tokenized once
+    for fitting and scoring. They are scored as CSR-style arrays (row
+    lengths, term ids, counts): the dot products and norms of a whole pool
+    are one pass of NumPy gathers and reductions, with no per-resume Python
+    work beyond the vocabulary lookup.
+
+    A fitted model is saved with state() and restored by passing that state
+    (with the same job text) instead of a pool; the restored model scores
+    exactly like the original.
+    """
+
+    def __init__(self, job_text: str, pool: Sequence[Counter] = (), state: Optional[Dict[str, Any]] = None) -> None:
+        self._lock = threading.Lock()
+        self._vocabulary: Dict[str, int] = {}
+        self._document_frequency = np.zeros(0, dtype=np.float64)
+        self._documents = 0
+        self._total_length = 0
+
+        job_counts = term_counts(job_text)
+        if state is None:
+            self.add([job_counts] + list(pool))
+        else:
+            self._vocabulary = {term: term_id for term_id, term in enumerate(state['terms'])}
+            self._document_frequency = np.array(state['document_frequency'], dtype=np.float64)
+            self._documents = state['documents']
+            self._total_length = state['total_length']
+        self._job_term_ids = np.array([self._vocabulary[term] for term in job_counts], dtype=np.int64)
+        self._job_term_counts = np.array(list(job_counts.values()), dtype=np.float64)
+        self._job_length = float(self._job_term_counts.sum())
+
+    @property
+    def documents(self) -> int:
+        """Documents the document frequencies were fitted on (JD included)"""
+        return self._documents
+
+    def state(self) -> Dict[str, Any]:
+        """The fitted vocabulary and document frequencies, JSON-serialisable"""
+        with self._lock:
+            return {
+                'terms': list(self._vocabulary),
+                'document_frequency': self._document_frequency.tolist(),
+                'documents': self._documents,
+                'total_length': self._total_length
+            }
+
+    def add(self, documents: Sequence[Counter]) -> None:
+        """Fold documents (term counts) into the document frequencies"""
+        with self._lock:
+            seen: Counter = Counter()
+            for document in documents:
+                seen.update(document.keys())
+                self._total_length += sum(document.values())
+            for term in seen:
+                self._vocabulary.setdefault(term, len(self._vocabulary))
+            frequencies = np.zeros(len(self._vocabulary), dtype=np.float64)
+            frequencies[:len(self._document_frequency)] = self._document_frequency
+            frequencies[[self._vocabulary[term] for term in seen]] += list(seen.values())
+            self._document_frequency = frequencies
+            self._documents += len(documents)
+
+    def _weights(self, term_ids: np.ndarray, counts: np.ndarray, lengths: np.ndarray,
+                 idf: np.ndarray, average_length: float) -> np.ndarray:
+        """BM25 weight (saturated, length-normalised tf x idf) per (term, document) entry"""
+        saturation = counts * (BM25_K1 + 1) / (counts + BM25_K1 * (1 - BM25_B + BM25_B * lengths / average_length))
+        return saturation * idf[term_ids]
+
+    def similarities(self, documents: Sequence[Counter]) -> np.ndarray:
+        """
+        Cosine relevance of each document to the job description
+
+        Args:
+            documents: term_counts() of resume texts (need not be part of the fitted pool)
+
+        Returns:
+            Array of cosines in [0, 1], one per document
+        """
+        if not len(documents):
+            return np.zeros(0, dtype=np.float64)
+
+        # CSR layout: flat term ids and counts, document i owning the next row_lengths[i] entries
+        term_ids: List[int] = []
+        counts: List[int] = []
+        row_lengths = np.zeros(len(documents), dtype=np.int64)
+        with self._lock:
+            vocabulary = self._vocabulary
+            for row, document in enumerate(documents):
+                row_lengths[row] = len(document)
+                # Terms outside the vocabulary appear in no fitted document: id -1, df 0
+                term_ids.extend(map(vocabulary.get, document, repeat(-1)))
+                counts.extend(document.values())
+            document_frequency = np.append(self._document_frequency, 0.0)
+            fitted = self._documents
+            average_length = max(1.0, self._total_length / max(1, fitted))
+
+        # Smoothed idf: a term every applicant has (the job's core skill) still counts, just least
+        idf = np.log((1 + fitted) / (1 + document_frequency)) + 1
+        term_ids_array = np.array(term_ids, dtype=np.int64)
+        term_ids_array[term_ids_array < 0] = len(document_frequency) - 1
+        counts_array = np.array(counts, dtype=np.float64)
+        rows = np.repeat(np.arange(len(documents)), row_lengths)
+        lengths = np.bincount(rows, weights=counts_array, minlength=len(documents))
+
+        weights = self._weights(term_ids_array, counts_array, lengths[rows], idf, average_length)
+        job_vector = np.zeros(len(document_frequency), dtype=np.float64)
+        job_vector[self._job_term_ids] = self._weights(
+            self._job_term_ids, self._job_term_counts, np.full(len(self._job_term_ids), self._job_length),
+            idf, average_length
+        )
+
+        dots = np.bincount(rows, weights=weights * job_vector[term_ids_array], minlength=len(documents))
+        norms = np.sqrt(np.bincount(rows, weights=weights * weights, minlength=len(documents)))
+        job_norm = np.linalg.norm(job_vector)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cosines = np.where(norms > 0, dots / (norms * job_norm), 0.0) if job_norm else np.zeros(len(documents))
+        return np.clip(cosines, 0.0, 1.0)
+
+    def scores(self, documents: Sequence[Counter]) -> np.ndarray:
+        """Component scores (0-100) of documents: cosine relative to FULL_MARKS_COSINE"""
+        return np.round(np.minimum(self.similarities(documents) / FULL_MARKS_COSINE, 1.0) * 100, 2)
+
+
+def job_text(job_config: Dict[str, Any]) -> str:
+    """The text a job is matched on: title, description and skill lists"""
+    return '\n'.join([
+        str(job_config.get('job_title') or ''),
+        str(job_config.get('job_description') or ''),
+        ' '.join(str(skill) for skill in job_config.get('required_skills') or []),
+        ' '.join(str(skill) for skill in job_config.get('optional_skills') or []),
+        ' '.join(str(keyword) for keyword in job_config.get('custom_keywords') or []),
+    ])
+
+
+class JDRelevanceIndex:
+    """
+    JDRelevanceModel per job, fitted once its pool is large enough.
+
+    A job's model is fitted over its JD and the resumes already on its
+    leaderboard (``load_pool(job_id)`` gives (candidate_id, text) pairs),
+    once there are at least ``min_pool`` of them; until then the component
+    is None. Document frequencies fitted on a handful of resumes would
+    swing with every applicant, so none are fitted on fewer.
+
+    After fitting, the document frequencies stay frozen: newly screened
+    resumes are scored against them without being folded in, so a resume's
+    score does not depend on how many applicants came before it or in what
+    order. They are saved with ``save_fit(job_id, job text hash, state)``
+    and restored with ``load_fit(job_id, job text hash)``, so a restarted
+    process scores with the same model instead of refitting on a different
+    pool. Editing the job's title, description or skills refits it, and so
+    does an explicit rescore of the whole pool (``score_pool(..., refit=True)``).
+
+    The component's weight in the final score comes from
+    JD_RELEVANCE_WEIGHT (default 0: the component is opt-in), the minimum
+    pool from JD_RELEVANCE_MIN_POOL (default 20).
+    """
+
+    def __init__(self, load_pool: Callable[[str], List[Tuple[str, str]]], weight: Optional[float] = None,
+                 min_pool: Optional[int] = None,
+                 load_fit: Optional[Callable[[str, str], Optional[Dict[str, Any]]]] = None,
+                 save_fit: Optional[Callable[[str, str, Dict[str, Any]], None]] = None) -> None:
+        self.load_pool = load_pool
+        self.load_fit = load_fit
+        self.save_fit = save_fit
+        self.weight = float(os.getenv('JD_RELEVANCE_WEIGHT', '0')) if weight is None else weight
+        self.min_pool = max(0, int(os.getenv('JD_RELEVANCE_MIN_POOL', '20')) if min_pool is None else min_pool)
+        self._lock = threading.Lock()
+        # job_id -> (job text hash, model)
+        self._models: Dict[str, Tuple[str, JDRelevanceModel]] = {}
+        self._stats = {"fits": 0, "fitted_documents": 0, "loaded": 0, "pool_too_small": 0, "scored": 0}
+
+    def _model(self, job_id: str, job_config: Dict[str, Any],
+               pool: Optional[List[Counter]] = None, refit: bool = False) -> Optional[JDRelevanceModel]:
+        """
+        The job's model: kept, restored from save_fit or fitted when there
+        is none for the current job text, refitted when asked to (and the
+        pool is large enough); None while the pool is below min_pool
+        """
+        text = job_text(job_config)
+        key = sha256_hex(text)
+        if pool is None and refit:
+            pool = [term_counts(resume_text) for _, resume_text in self.load_pool(job_id)]
+        refit = refit and len(pool) >= self.min_pool
+
+        if not refit:
+            with self._lock:
+                cached = self._models.get(job_id)
+            if cached is not None and cached[0] == key:
+                return cached[1]
+            state = self.load_fit(job_id, key) if self.load_fit is not None else None
+            if state is not None:
+                model = JDRelevanceModel(text, state=state)
+                with self._lock:
+                    self._models[job_id] = (key, model)
+                    self._stats["loaded"] += 1
+                return model
+
+        if pool is None:
+            pool = [term_counts(resume_text) for _, resume_text in self.load_pool(job_id)]
+        if len(pool) < self.min_pool:
+            with self._lock:
+                self._stats["pool_too_small"] += 1
+            return None
+        model = JDRelevanceModel(text, pool)
+        with self._lock:
+            self._models[job_id] = (key, model)
+            self._stats["fits"] += 1
+            self._stats["fitted_documents"] += model.documents
+        if self.save_fit is not None:
+            self.save_fit(job_id, key, model.state())
+        return model
+
+    def score_pool(self, job_id: str, job_config: Dict[str, Any], pool: List[Tuple[str, str]],
+                   refit: bool = False) -> List[float]:
+        """
+        Component scores of a job's whole pool in one pass
+
+        Args:
+            job_id: Job ID
+            job_config: The job's screening config
+            pool: (candidate_id, resume text) of every candidate on the job's
+                leaderboard; used to fit the model if it needs (re)fitting
+            refit: Refit the model on this pool first (a full rescore);
+                ignored while the pool is below min_pool
+
+        Returns:
+            Score (0-100) per pool entry, in order; None each while the job
+            has no model
+        """
+        documents = [term_counts(resume_text) for _, resume_text in pool]
+        model = self._model(job_id, job_config, documents, refit=refit)
+        if model is None:
+            return [None] * len(pool)
+        scores = model.scores(documents)
+        with self._lock:
+            self._stats["scored"] += len(pool)
+        return scores.tolist()
+
+    def score(self, job_id: str, job_config: Dict[str, Any], candidate_id: str, text: str) -> Optional[float]:
+        """Component score (0-100) of one screened resume against the job's frozen model (None without one)"""
+        model = self._model(job_id, job_config)
+        if model is None:
+            return None
+        with self._lock:
+            self._stats["scored"] += 1
+        return float(model.scores([term_counts(text)])[0])
+
+    def invalidate(self, job_id: str) -> None:
+        """Drop a job's in-memory model so the next screening restores or refits it"""
+        with self._lock:
+            self._models.pop(job_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Jobs with a model, fits, restored fits, documents fitted on, pools too small to fit and resumes scored"""
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+            stats["jobs"] = len(self._models)
+        stats["weight"] = self.weight
+        stats["min_pool"] = self.min_pool
+        return stats
@@ -0,0 +1,293 @@
+"""
+PDF Worker Pool
+Runs PDF text extraction in pre-started worker processes with a per-document
+wall-clock timeout, an RLIMIT_AS memory cap and recycling after N documents,
+so a malformed or huge upload cannot pin or bloat an API worker
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import queue
+import selectors
+import subprocess
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from pdf_text_extractor import PDFTextExtractor
+
+_HEADER_BYTES = 8
+
+
+class PDFExtractionError(Exception):
+    """Extraction failed in a worker (unreadable PDF, memory cap, crash)"""
+
+
+class PDFExtractionTimeout(PDFExtractionError):
+    """Extraction exceeded the per-document timeout"""
+
+
+class PDFWorkerUnavailable(PDFExtractionError):
+    """No worker could take the document (pool closed, worker could not start); says nothing about the PDF"""
+
+
+def _write_frame(stream, payload: bytes) -> None:
+    stream.write(len(payload).to_bytes(_HEADER_BYTES, "big"))
+    stream.write(payload)
+    stream.flush()
+
+
+def _read_exact(stream, size: int) -> bytes:
+    data = b""
+    while len(data) < size:
+        chunk = stream.read(size - len(data))
+        if not chunk:
+            break
+        data += chunk
+    return data
+
+
+class _Worker:
+    """One extraction subprocess speaking length-prefixed frames over stdin/stdout"""
+
+    def __init__(self, command: List[str]) -> None:
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        self.docs = 0
+
+    def request(self, pdf_bytes: bytes, timeout: float) -> Dict[str, Any]:
+        """Send one PDF and wait up to timeout seconds for the reply"""
+        deadline = time.monotonic() + timeout
+        try:
+            _write_frame(self.process.stdin, pdf_bytes)
+        except (BrokenPipeError, OSError) as e:
+            raise PDFWorkerUnavailable(f"PDF worker unavailable: {e}")
+
+        header = self._read(_HEADER_BYTES, deadline)
+        payload = self._read(int.from_bytes(header, "big"), deadline)
+        return json.loads(payload)
+
+    def _read(self, size: int, deadline: float) -> bytes:
+        """Read exactly size bytes from the worker before the deadline"""
+        fd = self.process.stdout.fileno()
+        data = bytearray()
+        with selectors.DefaultSelector() as selector:
+            selector.register(fd, selectors.EVENT_READ)
+            while len(data) < size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not selector.select(remaining):
+                    raise PDFExtractionTimeout("PDF extraction timed out")
+                chunk = os.read(fd, size - len(data))
+                if not chunk:
+                    raise PDFExtractionError(f"PDF worker exited (code {self.process.poll()})")
+                data.extend(chunk)
+        return bytes(data)
+
+    def kill(self) -> None:
+        if self.process.poll() is None:
+            self.process.kill()
+        try:
+            self.process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            pass
+        for stream in (self.process.stdin, self.process.stdout):
+            try:
+                stream.close()
+            except OSError:
+                pass
+
+
+class PDFExtractionPool:
+    """
+    Pool of pre-started PDF extraction processes.
+
+    Workers are plain ``python pdf_worker_pool.py --worker`` subprocesses, so
+    they start from a clean interpreter rather than a fork of the API process.
+    Each caller borrows an idle worker; a worker that times out, crashes or
+    hits its memory cap is killed and replaced, and every worker is replaced
+    after ``max_docs_per_worker`` documents. If a replacement cannot be
+    started, the next caller that finds no idle worker starts one instead.
+
+    Defaults come from PDF_POOL_WORKERS, PDF_EXTRACT_TIMEOUT (seconds),
+    PDF_WORKER_MEMORY_MB and PDF_WORKER_MAX_DOCS; extraction settings come
+    from the given PDFTextExtractor.
+    """
+
+    def __init__(self, workers: Optional[int] = None, timeout_seconds: Optional[float] = None,
+                 memory_limit_mb: Optional[int] = None, max_docs_per_worker: Optional[int] = None,
+                 extractor: Optional[PDFTextExtractor] = None) -> None:
+        self.size = max(1, int(os.getenv('PDF_POOL_WORKERS', '2')) if workers is None else workers)
+        self.timeout_seconds = float(os.getenv('PDF_EXTRACT_TIMEOUT', '20')) if timeout_seconds is None else timeout_seconds
+        self.memory_limit_mb = int(os.getenv('PDF_WORKER_MEMORY_MB', '1024')) if memory_limit_mb is None else memory_limit_mb
+        self.max_docs_per_worker = (int(os.getenv('PDF_WORKER_MAX_DOCS', '50'))
+                                    if max_docs_per_worker is None else max_docs_per_worker)
+        self.extractor = extractor or PDFTextExtractor()
+
+        self._command = [
+            sys.executable, os.path.abspath(__file__), '--worker',
+            self.extractor.backend, str(self.extractor.max_pages),
+            str(self.extractor.max_chars_per_page), str(self.memory_limit_mb)
+        ]
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        # Running workers, idle or busy; below size only after a failed restart
+        self._live = 0
+        self._stats = {"documents": 0, "failures": 0, "timeouts": 0, "recycled": 0, "restarts": 0}
+
+        for _ in range(self.size):
+            self._idle.put(_Worker(self._command))
+            self._live += 1
+
+    def extract(self, pdf_bytes: bytes) -> str:
+        """
+        Extract text from PDF bytes in a worker process
+
+        Raises:
+            PDFExtractionTimeout: The document took longer than timeout_seconds
+            PDFWorkerUnavailable: The pool is closed or no worker could be started
+            PDFExtractionError: The worker failed, crashed or ran out of memory
+        """
+        if self._closed:
+            raise PDFWorkerUnavailable("PDF worker pool is closed")
+
+        worker = self._acquire()
+        try:
+            reply = worker.request(pdf_bytes, self.timeout_seconds)
+        except PDFExtractionError as e:
+            with self._lock:
+                self._stats["timeouts" if isinstance(e, PDFExtractionTimeout) else "failures"] += 1
+                self._stats["restarts"] += 1
+            self._replace(worker)
+            raise
+        except BaseException:
+            self._replace(worker)
+            raise
+
+        worker.docs += 1
+        with self._lock:
+            self._stats["documents"] += 1
+            if not reply.get("ok"):
+                self._stats["failures"] += 1
+
+        if reply.get("exit") or worker.docs >= self.max_docs_per_worker > 0:
+            with self._lock:
+                self._stats["recycled"] += 1
+            self._replace(worker)
+        else:
+            self._idle.put(worker)
+
+        if not reply.get("ok"):
+            raise PDFExtractionError(reply.get("error", "PDF extraction failed"))
+        return reply["text"]
+
+    def _acquire(self) -> _Worker:
+        """
+        Borrow an idle worker, waiting for one if all are busy
+
+        A worker lost to a failed restart is started here, when no worker
+        is idle and the pool is below its size.
+
+        Raises:
+            PDFWorkerUnavailable: No worker is running and none can be started
+        """
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+
+            with self._lock:
+                if self._closed:
+                    raise PDFWorkerUnavailable("PDF worker pool is closed")
+                start = self._live < self.size
+                if start:
+                    self._live += 1
+            if start:
+                try:
+                    return _Worker(self._command)
+                except OSError as e:
+                    with self._lock:
+                        self._live -= 1
+                    raise PDFWorkerUnavailable(f"Could not start a PDF worker: {e}")
+
+            # Every worker is busy; re-check periodically in case one is lost meanwhile
+            try:
+                return self._idle.get(timeout=self.timeout_seconds)
+            except queue.Empty:
+                pass
+
+    def _replace(self, worker: _Worker) -> None:
+        """Kill a worker and put a fresh one in its place"""
+        worker.kill()
+        if not self._closed:
+            try:
+                self._idle.put(_Worker(self._command))
+                return
+            except OSError as e:
+                print(f"⚠ Could not restart PDF worker: {e}")
+        with self._lock:
+            self._live -= 1
+
+    def close(self) -> None:
+        """Stop every idle worker (busy ones are stopped when returned)"""
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().kill()
+            except queue.Empty:
+                break
+
+    def stats(self) -> Dict[str, Any]:
+        """Document, failure, timeout and recycling counters"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["live_workers"] = self._live
+        stats["workers"] = self.size
+        stats["idle_workers"] = self._idle.qsize()
+        return stats
+
+
+def _worker_main(backend: str, max_pages: str, max_chars_per_page: str, memory_limit_mb: str) -> None:
+    """Worker loop: read a PDF frame from stdin, write a JSON reply frame to stdout"""
+    try:
+        import resource
+        limit = int(memory_limit_mb) * 1024 * 1024
+        if limit > 0:
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ImportError, ValueError, OSError) as e:
+        print(f"⚠ PDF worker memory limit not applied: {e}", file=sys.stderr)
+
+    extractor = PDFTextExtractor(backend=backend, max_pages=int(max_pages),
+                                 max_chars_per_page=int(max_chars_per_page))
+    requests_in, replies_out = sys.stdin.buffer, sys.stdout.buffer
+    # Stray prints from PDF libraries must not corrupt the reply stream
+    sys.stdout = sys.stderr
+
+    while True:
+        header = _read_exact(requests_in, _HEADER_BYTES)
+        if len(header) < _HEADER_BYTES:
+            return
+        pdf_bytes = _read_exact(requests_in, int.from_bytes(header, "big"))
+
+        try:
+            reply = {"ok": True, "text": extractor.extract(pdf_bytes)}
+        except MemoryError:
+            # The heap may be fragmented past the cap; ask to be replaced
+            reply = {"ok": False, "error": "PDF extraction exceeded the worker memory limit", "exit": True}
+        except Exception as e:
+            reply = {"ok": False, "error": f"Could not extract text from PDF: {e}"}
+
+        _write_frame(replies_out, json.dumps(reply).encode("utf-8"))
+        if reply.get("exit"):
+            return
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 6 and sys.argv[1] == '--worker':
+        _worker_main(*sys.argv[2:])
+    else:
+        print("Usage: python pdf_worker_pool.py --worker <backend> <max_pages> <max_chars_per_page> <memory_mb>")
+        sys.exit(1)
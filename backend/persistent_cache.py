@@ -0,0 +1,149 @@
+"""
+Persistent LRU Cache
+Bounded in-memory LRU in front of a SQLite store that survives restarts
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+
+
+def sha256_hex(*parts: Any) -> str:
+    """Hash bytes/str parts into a stable hex digest (parts are length-prefixed)"""
+    digest = hashlib.sha256()
+    for part in parts:
+        data = part if isinstance(part, bytes) else str(part).encode("utf-8")
+        digest.update(len(data).to_bytes(8, "big"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+class PersistentLRUCache:
+    """
+    Two-level cache for JSON-serialisable values.
+
+    Lookups hit a bounded in-memory LRU first, then a SQLite table on disk.
+    Disk hits are promoted back into memory. Values must be JSON-serialisable
+    (tuples come back as lists) and callers should treat returned values as
+    read-only, since memory hits hand back the shared cached object.
+    """
+
+    def __init__(self, namespace: str, db_path: Optional[str] = None, max_entries: int = 256) -> None:
+        self.namespace = namespace
+        self.max_entries = max(1, max_entries)
+        self.db_path = db_path or os.path.join(DEFAULT_CACHE_DIR, f"{namespace}.sqlite3")
+        self._memory: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0}
+        self._conn: Optional[sqlite3.Connection] = None
+
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+        except Exception as e:
+            print(f"⚠ {namespace} cache: disk store unavailable, using memory only ({e})")
+            self._conn = None
+
+    def get_with_status(self, key: str) -> Tuple[Optional[Any], str]:
+        """
+        Look up a key
+
+        Returns:
+            (value, status) where status is 'memory', 'disk' or 'miss'
+        """
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return self._memory[key], "memory"
+
+            if self._conn is not None:
+                try:
+                    row = self._conn.execute(
+                        "SELECT value FROM cache_entries WHERE key = ?", (key,)
+                    ).fetchone()
+                except sqlite3.Error as e:
+                    print(f"⚠ {self.namespace} cache read failed: {e}")
+                    row = None
+                if row is not None:
+                    value = json.loads(row[0])
+                    self._remember(key, value)
+                    self._stats["disk_hits"] += 1
+                    return value, "disk"
+
+            self._stats["misses"] += 1
+            return None, "miss"
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value or None"""
+        return self.get_with_status(key)[0]
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value in memory and on disk"""
+        payload = json.dumps(value, default=str)
+        with self._lock:
+            # Keep the in-memory copy identical to what a disk hit would return
+            self._remember(key, json.loads(payload))
+            self._stats["writes"] += 1
+            if self._conn is not None:
+                try:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO cache_entries (key, value, created_at) VALUES (?, ?, ?)",
+                        (key, payload, time.time()),
+                    )
+                    self._conn.commit()
+                except sqlite3.Error as e:
+                    print(f"⚠ {self.namespace} cache write failed: {e}")
+
+    def delete(self, key: str) -> None:
+        """Remove a key from both levels"""
+        with self._lock:
+            self._memory.pop(key, None)
+            if self._conn is not None:
+                try:
+                    self._conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+                    self._conn.commit()
+                except sqlite3.Error as e:
+                    print(f"⚠ {self.namespace} cache delete failed: {e}")
+
+    def clear(self) -> None:
+        """Drop every entry from both levels"""
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                try:
+                    self._conn.execute("DELETE FROM cache_entries")
+                    self._conn.commit()
+                except sqlite3.Error as e:
+                    print(f"⚠ {self.namespace} cache clear failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and hit rate"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["memory_hits"] + stats["disk_hits"]) / lookups, 4) if lookups else 0.0
+        return stats
+
+    def _remember(self, key: str, value: Any) -> None:
+        """Insert into the memory LRU, evicting the oldest entries (lock held)"""
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
@@ -1,6 +1,8 @@
-from typing import Dict, List
+from typing import Any, Dict, List, Mapping, Sequence
 import re
 
+import numpy as np
+
 class ResumeScorer:
     """
     Comprehensive scoring system for resume evaluation
@@ -25,6 +27,27 @@ class ResumeScorer:
             (6, 10, 85),    # 6-10 years: Senior
             (11, float('inf'), 100)  # 10+ years: Expert
         ]
+        
+        # Job-title keywords per domain (experience relevance), built once
+        self.domain_title_keywords = {
+            'IT': ['developer', 'engineer', 'software', 'programmer', 'technical'],
+            'Data Science': ['data', 'analytics', 'machine learning', 'ai', 'scientist'],
+            'Marketing': ['marketing', 'campaign', 'branding', 'advertising', 'digital'],
+            'Finance': ['finance', 'accounting', 'financial', 'investment', 'analyst'],
+            'HR': ['hr', 'recruitment', 'talent', 'human resources'],
+            'Sales': ['sales', 'business development', 'account', 'revenue'],
+            'Design': ['design', 'designer', 'creative', 'ui', 'ux'],
+            'Management': ['manager', 'director', 'lead', 'management']
+        }
+        
+        # Component weights of the overall score
+        self.component_weights = {
+            'education': 0.20,      # 20%
+            'experience': 0.30,     # 30%
+            'domain': 0.20,         # 20%
+            'language': 0.10,       # 10%
+            'skills': 0.20          # 20% (will be added from skill matching)
+        }
     
     def score_education(self, education_data: Dict, required_level: int = 3) -> Dict:
         """
@@ -34,16 +57,7 @@ class ResumeScorer:
             education_data: Education information from resume
             required_level: Minimum required education level (default: 3 = Bachelor's)
         """
-        candidate_level = education_data.get('education_level', 0)
-        
-        # Ensure candidate_level is an integer
-        if isinstance(candidate_level, str):
-            try:
-                candidate_level = int(candidate_level)
-            except (ValueError, TypeError):
-                candidate_level = 0
-        elif not isinstance(candidate_level, int):
-            candidate_level = 0
+        candidate_level = self._education_level(education_data.get('education_level', 0))
         
         # Base score from education level
         base_score = self.education_weights.get(candidate_level, 0)
@@ -87,16 +101,7 @@ class ResumeScorer:
             required_years: Minimum required years of experience
             domain: Required domain/industry for relevance check
         """
-        total_years = experience_data.get('total_years', 0)
-        
-        # Ensure total_years is a number
-        if isinstance(total_years, str):
-            try:
-                total_years = float(total_years)
-            except (ValueError, TypeError):
-                total_years = 0
-        elif not isinstance(total_years, (int, float)):
-            total_years = 0
+        total_years = self._experience_years(experience_data.get('total_years', 0))
         has_titles = len(experience_data.get('job_titles', [])) > 0
         has_companies = len(experience_data.get('companies', [])) > 0
         
@@ -232,13 +237,7 @@ class ResumeScorer:
         language_score = resume_data.get('language_quality', {}).get('grammar_score', 70)
         
         # Weighted overall score
-        weights = {
-            'education': 0.20,      # 20%
-            'experience': 0.30,     # 30%
-            'domain': 0.20,         # 20%
-            'language': 0.10,       # 10%
-            'skills': 0.20          # 20% (will be added from skill matching)
-        }
+        weights = dict(self.component_weights)
         
         base_overall_score = (
             education_score_data['education_score'] * weights['education'] +
@@ -266,6 +265,201 @@ class ResumeScorer:
             }
         }
     
+    def batch_features(self, resumes: Sequence[Dict]) -> Dict[str, np.ndarray]:
+        """
+        Columnar feature matrix for score_batch
+        
+        The only per-resume Python work: every value the component scores
+        read from a parsed resume, one array per column. Title keyword matches
+        and keyword scores are kept for every domain, so the same features
+        can be scored against any job. A pandas DataFrame built from the
+        result (pd.DataFrame(features)) is accepted by score_batch as well.
+        
+        Args:
+            resumes: Parsed resume dictionaries
+            
+        Returns:
+            Column name -> array with one entry per resume
+        """
+        domain_names = sorted({domain for resume in resumes
+                               for domain in resume.get('domain', {}).get('domain_scores', {})})
+        columns: Dict[str, List[Any]] = {name: [] for name in (
+            'education_level', 'institution_count', 'total_years', 'job_title_count',
+            'company_count', 'primary_domain', 'domain_confidence', 'max_domain_score', 'language_score'
+        )}
+        for domain in self.domain_title_keywords:
+            columns[f'title_matches:{domain}'] = []
+        for domain in domain_names:
+            columns[f'domain_score:{domain}'] = []
+        
+        for resume in resumes:
+            education = resume.get('education', {})
+            experience = resume.get('experience', {})
+            domain_data = resume.get('domain', {})
+            domain_scores = domain_data.get('domain_scores', {})
+            job_titles_text = ' '.join(experience.get('job_titles', [])).lower()
+            
+            columns['education_level'].append(self._education_level(education.get('education_level', 0)))
+            columns['institution_count'].append(len(education.get('institutions', [])))
+            columns['total_years'].append(self._experience_years(experience.get('total_years', 0)))
+            columns['job_title_count'].append(len(experience.get('job_titles', [])))
+            columns['company_count'].append(len(experience.get('companies', [])))
+            columns['primary_domain'].append(domain_data.get('primary_domain', 'General').lower())
+            columns['domain_confidence'].append(domain_data.get('confidence', 0))
+            columns['max_domain_score'].append(max([s.get('score', 0) for s in domain_scores.values()], default=0))
+            columns['language_score'].append(resume.get('language_quality', {}).get('grammar_score', 70))
+            for domain, keywords in self.domain_title_keywords.items():
+                columns[f'title_matches:{domain}'].append(
+                    sum(1 for keyword in keywords if keyword in job_titles_text)
+                )
+            for domain in domain_names:
+                columns[f'domain_score:{domain}'].append(domain_scores.get(domain, {}).get('score', 0))
+        
+        features = {name: np.asarray(values, dtype=np.float64) for name, values in columns.items()
+                    if name != 'primary_domain'}
+        features['primary_domain'] = np.asarray(columns['primary_domain'], dtype=object)
+        return features
+    
+    def score_batch(self, features: Mapping[str, Any], requirements: Dict) -> Dict[str, np.ndarray]:
+        """
+        Vectorised calculate_overall_score for many resumes against one job
+        
+        Evaluates the same expressions as score_education, score_experience,
+        score_domain_alignment and calculate_overall_score, in the same order,
+        on whole columns, so every score equals the per-resume result.
+        
+        Args:
+            features: Output of batch_features, or a DataFrame with its columns
+            requirements: Job requirements (as for calculate_overall_score)
+            
+        Returns:
+            Dictionary of score arrays: education_score, experience_score,
+            domain_alignment_score, language_score and overall_score (without
+            skills, like calculate_overall_score)
+        """
+        def column(name: str) -> np.ndarray:
+            return np.asarray(features[name], dtype=np.float64)
+        
+        weights = self.component_weights
+        
+        # Education
+        required_level = requirements.get('required_education_level', 3)
+        candidate_level = column('education_level')
+        education_base = np.zeros_like(candidate_level)
+        for level, weight in self.education_weights.items():
+            education_base[candidate_level == level] = weight
+        education_score = (education_base
+                           + np.where(candidate_level > required_level, 15, 0)
+                           + np.where(candidate_level < required_level, -20, 0)
+                           + np.minimum(column('institution_count') * 5, 10))
+        education_score = self._round_scores(np.clip(education_score, 0, 100))
+        
+        # Experience
+        required_years = requirements.get('required_experience_years', 3)
+        experience_domain = requirements.get('target_domain')
+        total_years = column('total_years')
+        experience_base = np.zeros_like(total_years)
+        for min_years, max_years, score in reversed(self.experience_ranges):
+            experience_base = np.where((total_years >= min_years) & (total_years <= max_years), score, experience_base)
+        keywords = self._get_domain_keywords(experience_domain) if experience_domain else []
+        if keywords:
+            domain_relevance = np.minimum(column(f'title_matches:{experience_domain}') / len(keywords) * 30, 30)
+        else:
+            domain_relevance = np.zeros_like(total_years)
+        experience_score = (experience_base
+                            + np.where(total_years > required_years * 1.5, 15, 0)
+                            + np.where(total_years >= required_years, 0, -25)
+                            + np.where(column('job_title_count') > 0, 10, 0)
+                            + np.where(column('company_count') > 0, 5, 0)
+                            + domain_relevance)
+        experience_score = self._round_scores(np.clip(experience_score, 0, 100))
+        
+        # Domain alignment
+        target_domain = requirements.get('target_domain', 'IT')
+        exact_match = np.asarray(features['primary_domain'], dtype=object) == target_domain.lower()
+        target_column = f'domain_score:{target_domain}'
+        target_score = column(target_column) if target_column in features else np.zeros_like(total_years)
+        max_score = column('max_domain_score')
+        with np.errstate(divide='ignore', invalid='ignore'):
+            partial_score = np.where(max_score > 0, target_score / max_score * 100, 0)
+        alignment_score = np.where(exact_match, 100, np.where(target_score > 0, partial_score, 0))
+        confidence_factor = np.minimum(column('domain_confidence') / 10, 1.0)
+        domain_score = self._round_scores(np.clip(alignment_score * (0.7 + (0.3 * confidence_factor)), 0, 100))
+        
+        # Weighted overall score
+        language_score = column('language_score')
+        overall_score = (
+            education_score * weights['education'] +
+            experience_score * weights['experience'] +
+            domain_score * weights['domain'] +
+            language_score * weights['language']
+        )
+        
+        return {
+            'education_score': education_score,
+            'experience_score': experience_score,
+            'domain_alignment_score': domain_score,
+            'language_score': language_score,
+            'overall_score': self._round_scores(overall_score)
+        }
+    
+    def overall_scores(self, resumes: Sequence[Dict], requirements: Dict) -> List[Dict]:
+        """
+        score_batch for a list of parsed resumes, one result per resume
+        
+        Args:
+            resumes: Parsed resume dictionaries
+            requirements: Job requirements (as for calculate_overall_score)
+        
+        Returns:
+            Per resume, the scores of calculate_overall_score in its layout
+            (overall_score and the education/experience/domain/language
+            component scores); details, ratings and breakdown are left out
+        """
+        batch = self.score_batch(self.batch_features(resumes), requirements)
+        return [
+            {
+                'overall_score': float(batch['overall_score'][index]),
+                'education_component': {'education_score': float(batch['education_score'][index])},
+                'experience_component': {'experience_score': float(batch['experience_score'][index])},
+                'domain_component': {'domain_alignment_score': float(batch['domain_alignment_score'][index])},
+                'language_component': {'score': float(batch['language_score'][index])}
+            }
+            for index in range(len(resumes))
+        ]
+    
+    def _education_level(self, level) -> int:
+        """Education level as an int (unparseable or non-int values count as 0)"""
+        if isinstance(level, str):
+            try:
+                return int(level)
+            except (ValueError, TypeError):
+                return 0
+        return level if isinstance(level, int) else 0
+    
+    def _experience_years(self, years) -> float:
+        """Years of experience as a number (unparseable values count as 0)"""
+        if isinstance(years, str):
+            try:
+                return float(years)
+            except (ValueError, TypeError):
+                return 0
+        return years if isinstance(years, (int, float)) else 0
+    
+    def _round_scores(self, scores: np.ndarray) -> np.ndarray:
+        """
+        round(score, 2) for an array, with Python's rounding
+        
+        np.round scales by 100 before rounding, which can land a value within
+        an ulp of .5 on the other side of it; those few are re-rounded in Python.
+        """
+        rounded = np.round(scores, 2)
+        scaled = scores * 100
+        near_half = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+        if near_half.any():
+            rounded[near_half] = [round(float(score), 2) for score in scores[near_half]]
+        return rounded
+    
     def _calculate_experience_base_score(self, years: int) -> float:
         """Calculate base score for years of experience"""
         for min_years, max_years, score in self.experience_ranges:
@@ -275,17 +469,7 @@ class ResumeScorer:
     
     def _get_domain_keywords(self, domain: str) -> List[str]:
         """Get relevant keywords for domain matching"""
-        domain_keywords_map = {
-            'IT': ['developer', 'engineer', 'software', 'programmer', 'technical'],
-            'Data Science': ['data', 'analytics', 'machine learning', 'ai', 'scientist'],
-            'Marketing': ['marketing', 'campaign', 'branding', 'advertising', 'digital'],
-            'Finance': ['finance', 'accounting', 'financial', 'investment', 'analyst'],
-            'HR': ['hr', 'recruitment', 'talent', 'human resources'],
-            'Sales': ['sales', 'business development', 'account', 'revenue'],
-            'Design': ['design', 'designer', 'creative', 'ui', 'ux'],
-            'Management': ['manager', 'director', 'lead', 'management']
-        }
-        return domain_keywords_map.get(domain, [])
+        return self.domain_title_keywords.get(domain, [])
     
     def _get_education_rating(self, score: float) -> str:
         """Get qualitative rating for education score"""
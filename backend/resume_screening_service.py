@@ -5,9 +5,12 @@ Integrates teammate's resume screening functionality with FastAPI
 
 import os
 import json
+import time
+import asyncio
 import base64
-import tempfile
-from typing import Dict, Any, Optional, List
+import binascii
+import threading
+from typing import Dict, Any, Optional, List, Literal, Union
 from fastapi import FastAPI, HTTPException, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
@@ -19,7 +22,18 @@ from enhanced_resume_parser import EnhancedResumeParser
 from skill_matcher import SkillMatcher
 from resume_scorer import ResumeScorer
 from gemini_analyzer import GeminiResumeAnalyzer
+from gemini_limiter import gemini_limiter
 from firebase_client import FirebaseClient
+from persistent_cache import PersistentLRUCache, sha256_hex
+from ttl_cache import TTLCache
+from screening_context import ScreeningContext
+from pdf_worker_pool import PDFExtractionError, PDFExtractionPool, PDFWorkerUnavailable
+from candidate_leaderboard import CandidateLeaderboard
+from screening_job_queue import PermanentJobError, ScreeningJobQueue
+from grammar_checker import GrammarChecker
+from screening_tiers import ScreeningTier, create_tiers
+from ai_gate import AIGate, CLEAR_ACCEPT, CLEAR_REJECT
+from jd_relevance import JDRelevanceIndex
 
 
 class ResumeScreeningRequest(BaseModel):
@@ -28,7 +42,14 @@ class ResumeScreeningRequest(BaseModel):
     resume_filename: str = Field(..., description="Original filename of the resume")
     job_id: str = Field(..., description="Job ID to get requirements from")
     candidate_name: str = Field(..., description="Candidate name")
-    enable_ai: bool = Field(True, description="Enable AI-powered analysis")
+    enable_ai: Union[Literal['auto'], bool] = Field(
+        True, description="Enable AI-powered analysis; \"auto\" calls Gemini only when the local "
+                          "score is inside the uncertainty band"
+    )
+    tier: Optional[Literal['fast', 'standard', 'deep']] = Field(
+        None, description="fast (regex parse), standard (spaCy parse) or deep (plus Gemini); "
+                          "defaults to deep when enable_ai, else standard"
+    )
 
 
 class ResumeScreeningResponse(BaseModel):
@@ -40,6 +61,12 @@ class ResumeScreeningResponse(BaseModel):
     component_scores: Optional[Dict[str, Any]] = None
     skill_analysis: Optional[Dict[str, Any]] = None
     keyword_analysis: Optional[Dict[str, Any]] = None
+    cache_status: Optional[str] = None
+    candidate_id: Optional[str] = None
+    grammar_check: Optional[str] = None  # 'done', 'pending' (merged into the leaderboard later) or None (off)
+    tier: Optional[str] = None
+    ai_used: Optional[bool] = None  # Whether the scores come from Gemini
+    ai_gate: Optional[str] = None  # 'always', 'uncertain', 'clear_accept', 'clear_reject' or None (AI not requested)
     error: Optional[str] = None
 
 
@@ -66,9 +93,142 @@ class ResumeScreeningService:
             self.gemini_analyzer = None
         
         self.firebase = FirebaseClient()
+        
+        # Parsed resumes keyed by PDF content hash + parser version
+        self.parse_cache = PersistentLRUCache(
+            'resume_parse',
+            db_path=os.getenv('RESUME_PARSE_CACHE_PATH'),
+            max_entries=int(os.getenv('RESUME_PARSE_CACHE_SIZE', '256'))
+        )
+        
+        # Formatted job configs, shared by every screening against the same job
+        self.job_config_cache = TTLCache(
+            ttl_seconds=float(os.getenv('JOB_CONFIG_CACHE_TTL', '300'))
+        )
+        
+        # fast / standard / deep screening profiles, each with its own thread pool
+        self.tiers = create_tiers()
+        
+        # PDF extraction runs in sandboxed worker processes (timeout, memory cap), a pool
+        # per tier so a bulk run of fast screenings cannot take every worker
+        if os.getenv('PDF_POOL_WORKERS', '2') != '0':
+            for tier in self.tiers.values():
+                if not tier.pdf_workers:
+                    continue
+                try:
+                    tier.pdf_pool = PDFExtractionPool(workers=tier.pdf_workers, extractor=self.parser.text_extractor)
+                    print(f"✓ PDF extraction pool started for the {tier.name} tier ({tier.pdf_pool.size} workers)")
+                except Exception as e:
+                    print(f"⚠ PDF extraction pool unavailable for the {tier.name} tier, extracting in-process: {e}")
+        
+        # enable_ai="auto": Gemini only for local scores inside the uncertainty band
+        self.ai_gate = AIGate()
+        
+        # Cascade ranking: Gemini reranks only the lexical top-K, a few calls at a time
+        self.cascade_top_k = int(os.getenv('CASCADE_TOP_K', '20'))
+        self.cascade_concurrency = max(1, int(os.getenv('CASCADE_CONCURRENCY', '8')))
+        
+        # Every successful screening is ranked on its job's leaderboard
+        self.leaderboard = CandidateLeaderboard()
+        
+        # TF-IDF/BM25 resume/JD relevance, fitted per job over its applicant pool and kept
+        # with the leaderboard (opt-in: weight > 0)
+        self.jd_relevance = None
+        if float(os.getenv('JD_RELEVANCE_WEIGHT', '0')) > 0:
+            self.jd_relevance = JDRelevanceIndex(load_pool=self._relevance_pool,
+                                                 load_fit=self.leaderboard.relevance_fit,
+                                                 save_fit=self.leaderboard.store_relevance_fit)
+        
+        # LanguageTool grammar checks run after the response (0 workers = heuristic score only)
+        self.grammar_checker = None
+        if os.getenv('GRAMMAR_CHECK_WORKERS', '0') != '0':
+            try:
+                self.grammar_checker = GrammarChecker()
+                print(f"✓ Grammar checker starting ({self.grammar_checker.size} workers)")
+            except Exception as e:
+                print(f"⚠ Grammar checker unavailable: {e}")
+        
+        # Background screenings (POST /resume/jobs), processed by worker threads
+        self.job_queue = None
+        if os.getenv('SCREENING_JOB_WORKERS', '4') != '0':
+            try:
+                self.job_queue = ScreeningJobQueue(handler=self._run_queued_screening)
+                print(f"✓ Screening job queue started ({self.job_queue.size} workers)")
+            except Exception as e:
+                print(f"⚠ Screening job queue unavailable: {e}")
+    
+    def _parse_resume_cached(self, resume_bytes: bytes, use_nlp: bool = True,
+                             pdf_pool: Optional[PDFExtractionPool] = None) -> tuple:
+        """
+        Parse resume bytes, reusing a cached parse of identical content
+        
+        Args:
+            resume_bytes: Resume PDF
+            use_nlp: False parses without spaCy (fast tier; cached separately)
+            pdf_pool: Worker pool to extract the text in (None: in-process)
+            
+        Returns:
+            (parsed_data, cache_status) where cache_status is 'memory', 'disk' or 'miss'
+        """
+        key_parts = [resume_bytes, self.parser.PARSER_VERSION, self.parser.text_extractor.config_key]
+        if not use_nlp:
+            key_parts.append('regex')
+        cache_key = sha256_hex(*key_parts)
+        parsed_data, cache_status = self.parse_cache.get_with_status(cache_key)
+        if parsed_data is not None:
+            return parsed_data, cache_status
+        
+        if pdf_pool is not None:
+            # Timeouts and worker failures propagate and fail this screening
+            text = pdf_pool.extract(resume_bytes)
+        else:
+            text = self.parser.text_extractor.extract(resume_bytes)
+        parsed_data = self.parser.parse_text(text, use_nlp=use_nlp)
+        
+        # Don't cache failed extractions
+        if 'error' not in parsed_data:
+            self.parse_cache.set(cache_key, parsed_data)
+        return parsed_data, cache_status
     
     def get_job_requirements(self, job_id: str) -> Dict[str, Any]:
-        """Get job requirements from Firebase"""
+        """Get job requirements, served from the TTL cache when fresh"""
+        return self.job_config_cache.get_or_load(job_id, lambda: self._load_job_requirements(job_id))
+    
+    def invalidate_job_requirements(self, job_id: str) -> None:
+        """Force the next screening for job_id to re-read Firebase"""
+        self.job_config_cache.invalidate(job_id)
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit rates of the parse, job config and Gemini analysis caches, plus Gemini call and retry counters"""
+        stats = {
+            'resume_parse': self.parse_cache.stats(),
+            'job_config': self.job_config_cache.stats(),
+            'gemini_analysis': self.gemini_analyzer.cache_stats() if self.gemini_analyzer else None,
+            'gemini_responses': self.gemini_analyzer.response_stats() if self.gemini_analyzer else None,
+            'gemini_calls': gemini_limiter.stats(),
+            'leaderboard': self.leaderboard.stats(),
+            'tiers': {name: tier.stats() for name, tier in self.tiers.items()},
+            'ai_gate': self.ai_gate.stats()
+        }
+        if self.jd_relevance is not None:
+            stats['jd_relevance'] = self.jd_relevance.stats()
+        if self.job_queue is not None:
+            stats['screening_jobs'] = self.job_queue.stats()
+        if self.grammar_checker is not None:
+            stats['grammar_check'] = self.grammar_checker.stats()
+        pdf_pools = {name: tier.pdf_pool.stats() for name, tier in self.tiers.items() if tier.pdf_pool is not None}
+        if pdf_pools:
+            stats['pdf_pool'] = pdf_pools
+        return stats
+    
+    def _load_job_requirements(self, job_id: str) -> tuple:
+        """
+        Get job requirements from Firebase
+        
+        Returns:
+            (job_config, found) - fallback configs are not cached so a newly
+            created job is picked up on the next screening
+        """
         try:
             print(f"Fetching job requirements for job_id: {job_id}")
             
@@ -76,16 +236,16 @@ class ResumeScreeningService:
             job_data = self.firebase.get_metadata('jobs', job_id)
             if job_data:
                 print(f"Found job data in 'jobs' collection: {job_data}")
-                return self._format_job_config(job_data)
+                return self._format_job_config(job_data), True
             
             # Fallback to job_descriptions collection
             jd_data = self.firebase.get_metadata('job_descriptions', job_id)
             if jd_data:
                 print(f"Found job data in 'job_descriptions' collection: {jd_data}")
-                return self._format_job_config(jd_data)
+                return self._format_job_config(jd_data), True
             
             print(f"No job data found for job_id: {job_id}, using fallback config")
-            return self._create_fallback_job_config(job_id)
+            return self._create_fallback_job_config(job_id), False
             
         except Exception as e:
             print(f"Error fetching job requirements: {e}")
@@ -173,317 +333,530 @@ class ResumeScreeningService:
             'target_domain': 'IT'
         }
 
-    def _calculate_matched_skills(self, parsed_data: Dict, required_skills: List[str]) -> List[str]:
-        """Calculate which required skills the candidate has"""
-        if not required_skills:
-            return []
-        
-        candidate_skills = []
-        if isinstance(parsed_data.get('skills'), dict):
-            candidate_skills = parsed_data['skills'].get('skills', [])
-        elif isinstance(parsed_data.get('skills'), list):
-            candidate_skills = parsed_data['skills']
-        
-        # Ensure all skills are strings
-        candidate_skills = [str(skill) for skill in candidate_skills if skill]
-        required_skills = [str(skill) for skill in required_skills if skill]
-        
-        matched = []
-        for req_skill in required_skills:
-            for cand_skill in candidate_skills:
-                try:
-                    if (req_skill.lower() in cand_skill.lower() or 
-                        cand_skill.lower() in req_skill.lower() or
-                        req_skill.lower() == cand_skill.lower()):
-                        matched.append(req_skill)
-                        break
-                except AttributeError:
-                    # Skip if not a string
-                    continue
+    def _tier_for(self, request: ResumeScreeningRequest) -> ScreeningTier:
+        """The request's screening tier (requests without one keep the enable_ai behaviour)"""
+        return self.tiers[request.tier or ('deep' if request.enable_ai else 'standard')]
+    
+    def _gate_ai(self, request: ResumeScreeningRequest, tier: ScreeningTier, result: Dict[str, Any]) -> bool:
+        """Record the AI gate decision for a locally scored result; True if Gemini should be called"""
+        result['ai_used'] = False
+        if not tier.use_ai:
+            return False
+        result['ai_gate'] = self.ai_gate.decide(request.enable_ai, result['ai_score'])
+        if result['ai_gate'] in (CLEAR_ACCEPT, CLEAR_REJECT):
+            print(f"✓ Skipping AI analysis for {request.candidate_name}: {result['ai_gate']} "
+                  f"(local score {result['ai_score']}, band {self.ai_gate.low:g}-{self.ai_gate.high:g})")
+        return self.ai_gate.calls_ai(result['ai_gate'])
+    
+    def _screen_without_ai(self, request: ResumeScreeningRequest, tier: Optional[ScreeningTier] = None) -> tuple:
+        """
+        Parse and score a resume with the local pipeline
         
-        return matched
-
-    def _calculate_missing_skills(self, parsed_data: Dict, required_skills: List[str]) -> List[str]:
-        """Calculate which required skills the candidate is missing"""
-        matched = self._calculate_matched_skills(parsed_data, required_skills)
-        return [skill for skill in required_skills if skill not in matched]
+        Returns:
+            (response fields, parsed resume data, job config)
+        """
+        # Get job requirements
+        job_config = self.get_job_requirements(request.job_id)
+        
+        # Decode base64 resume
+        resume_bytes = base64.b64decode(request.resume_base64)
+        
+        # Parse resume (skipped entirely on a cache hit)
+        tier = tier or self._tier_for(request)
+        parsed_data, cache_status = self._parse_resume_cached(resume_bytes, use_nlp=tier.use_nlp,
+                                                               pdf_pool=tier.pdf_pool)
+        print(f"✓ Resume parsed successfully for {request.candidate_name} (cache: {cache_status})")
+        parsed_data, grammar_check = self._merge_cached_grammar(parsed_data)
+        
+        # Same resume content, same candidate: re-screening replaces the leaderboard entry
+        candidate_id = sha256_hex(resume_bytes)[:16]
+        jd_relevance = self._jd_relevance_score(request.job_id, job_config, candidate_id, parsed_data)
+        
+        result = self._score_parsed_resume(parsed_data, job_config, jd_relevance)
+        result['cache_status'] = cache_status
+        result['grammar_check'] = grammar_check
+        result['tier'] = tier.name
+        result['candidate_id'] = candidate_id
+        return result, parsed_data, job_config
     
-    def screen_resume(self, request: ResumeScreeningRequest) -> ResumeScreeningResponse:
-        """Main resume screening function"""
+    def _relevance_pool(self, job_id: str) -> List[tuple]:
+        """(candidate_id, resume text) of every stored candidate of a job, for fitting its relevance model"""
+        return [(candidate_id, parsed_data.get('raw_text') or '')
+                for candidate_id, _, parsed_data in self.leaderboard.features(job_id)]
+    
+    def _jd_relevance_score(self, job_id: str, job_config: Dict[str, Any], candidate_id: str,
+                            parsed_data: Dict[str, Any]) -> Optional[float]:
+        """JD relevance component of one resume, or None when off, without text, below the minimum pool, or on failure"""
+        if self.jd_relevance is None or not parsed_data.get('raw_text'):
+            return None
         try:
-            # Get job requirements
-            job_config = self.get_job_requirements(request.job_id)
-            
-            # Decode base64 resume
-            resume_bytes = base64.b64decode(request.resume_base64)
-            
-            # Save to temporary file
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
-                temp_file.write(resume_bytes)
-                temp_file_path = temp_file.name
-            
+            return self.jd_relevance.score(job_id, job_config, candidate_id, parsed_data['raw_text'])
+        except Exception as e:
+            print(f"⚠ JD relevance scoring failed: {e}")
+            return None
+    
+    def _score_candidates(self, job_id: str, job_config: Dict[str, Any], candidates: List[tuple],
+                          refit: bool = False) -> List[Dict[str, Any]]:
+        """
+        _score_parsed_resume for each (candidate_id, candidate_name, parsed_data)
+        
+        JD relevance and the scorer's overall scores are computed for all
+        candidates in one pass (ResumeScorer.overall_scores); if the batch
+        scorer fails, each candidate is scored on its own. With refit, the
+        job's JD relevance model is refitted on these candidates first.
+        """
+        overall_scores = [None] * len(candidates)
+        if candidates:
             try:
-                # Parse resume
-                parsed_data = self.parser.parse_resume(temp_file_path)
-                print(f"✓ Resume parsed successfully for {request.candidate_name}")
-                
-                # Calculate basic scores using the original method
-                overall_score_data = self.scorer.calculate_overall_score(parsed_data, job_config)
-                overall_score = overall_score_data.get('overall_score', 0)
-                
-                # Skill matching using the original method
-                skill_match = self.matcher.match_against_job_description(
-                    parsed_data,
-                    job_config.get('job_description', ''),
-                    job_config.get('required_skills', []),
-                    job_config.get('optional_skills', []),
-                    job_config.get('custom_keywords', [])
+                overall_scores = self.scorer.overall_scores(
+                    [parsed_data for _, _, parsed_data in candidates], job_config
                 )
+            except Exception as e:
+                print(f"⚠ Batch scoring failed, scoring candidates one by one: {e}")
+        
+        relevance = [None] * len(candidates)
+        if self.jd_relevance is not None and candidates:
+            try:
+                relevance = self.jd_relevance.score_pool(job_id, job_config, [
+                    (candidate_id, parsed_data.get('raw_text') or '') for candidate_id, _, parsed_data in candidates
+                ], refit=refit)
+            except Exception as e:
+                print(f"⚠ JD relevance scoring failed: {e}")
+        return [
+            self._score_parsed_resume(parsed_data, job_config, score, overall_score_data)
+            for (_, _, parsed_data), score, overall_score_data in zip(candidates, relevance, overall_scores)
+        ]
+    
+    def _score_parsed_resume(self, parsed_data: Dict[str, Any], job_config: Dict[str, Any],
+                             jd_relevance: Optional[float] = None,
+                             overall_score_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Response fields from the local scorer and matcher (no LLM calls)"""
+        # Every score and skill view is computed once through the context
+        ctx = ScreeningContext(parsed_data, job_config, self.scorer, self.matcher, jd_relevance=jd_relevance,
+                               jd_relevance_weight=self.jd_relevance.weight if self.jd_relevance else 0.0,
+                               overall_score_data=overall_score_data)
+        comprehensive_analysis = ctx.build_analysis()
+        final_overall_score = ctx.final_score
+        
+        return {
+            'success': True,
+            'ai_score': final_overall_score,
+            'parsed_data': parsed_data,
+            'analysis': comprehensive_analysis,
+            'component_scores': comprehensive_analysis['component_scores'],
+            'skill_analysis': comprehensive_analysis['skill_analysis'],
+            'keyword_analysis': comprehensive_analysis['keyword_analysis']
+        }
+    
+    def _merge_cached_grammar(self, parsed_data: Dict[str, Any]) -> tuple:
+        """
+        Use a finished LanguageTool check of this resume text, if there is one
+        
+        Returns:
+            (parsed_data, grammar_check) where grammar_check is 'done' (real
+            grammar score merged in), 'pending' (check not run yet) or None
+            (grammar checking off or unavailable, or no text)
+        """
+        if self.grammar_checker is None or not parsed_data.get('raw_text'):
+            return parsed_data, None
+        if (parsed_data.get('language_quality') or {}).get('checked_by') == 'languagetool':
+            return parsed_data, 'done'
+        grammar = self.grammar_checker.cached(parsed_data['raw_text'])
+        if grammar is None:
+            # LanguageTool failed to start: the check would never run
+            return parsed_data, None if self.grammar_checker.unavailable else 'pending'
+        return self._with_grammar(parsed_data, grammar), 'done'
+    
+    def _with_grammar(self, parsed_data: Dict[str, Any], grammar: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy of parsed_data whose language_quality carries the LanguageTool result"""
+        language_quality = dict(parsed_data.get('language_quality') or {}, **grammar)
+        return dict(parsed_data, language_quality=language_quality)
+    
+    def _schedule_grammar_check(self, request: ResumeScreeningRequest, result: Dict[str, Any],
+                                parsed_data: Dict[str, Any], job_config: Dict[str, Any], ai_scored: bool) -> None:
+        """
+        Grammar-check a returned screening in the background
+        
+        When the check finishes, the candidate's leaderboard entry (and the
+        features used for re-scoring) are rewritten with the real grammar
+        score. Local scores are recomputed; Gemini scores are kept as they are.
+        An entry rewritten since this screening (re-screen, /rescore or
+        /cascade) is newer than the job config captured here and is kept.
+        """
+        # Fast screenings stay NLP-free; only cached checks are merged into them
+        if result.get('grammar_check') != 'pending' or result.get('tier') == 'fast':
+            return
+        recorded_at = time.time()
+        
+        def merge(grammar: Dict[str, Any]) -> None:
+            merged_data = self._with_grammar(parsed_data, grammar)
+            if ai_scored:
+                merged = dict(result, parsed_data=merged_data)
+            else:
+                merged = self._score_parsed_resume(merged_data, job_config,
+                                                   (result.get('component_scores') or {}).get('jd_relevance'))
+                merged['candidate_id'] = result['candidate_id']
+            if self._record_screening(request, merged, unless_newer_than=recorded_at):
+                print(f"✓ Grammar check merged for {request.candidate_name} - Score: {grammar['grammar_score']}")
+            else:
+                print(f"⚠ Grammar check for {request.candidate_name} not merged: leaderboard entry changed since")
+        
+        self.grammar_checker.submit(parsed_data['raw_text'], merge)
+    
+    def _apply_ai_analysis(self, result: Dict[str, Any], ai_analysis: Any, candidate_name: str) -> bool:
+        """Replace the local scores in result with a successful Gemini analysis; True if they were replaced"""
+        print(f"AI analysis result type: {type(ai_analysis)}")
+        print(f"AI analysis result: {ai_analysis}")
+        
+        if isinstance(ai_analysis, dict) and ai_analysis.get('success'):
+            analysis_data = ai_analysis.get('analysis', {})
+            if isinstance(analysis_data, dict):
+                # Use AI-generated scores and analysis
+                ai_component_scores = analysis_data.get('component_scores', {})
+                ai_skill_analysis = analysis_data.get('skill_analysis', {})
+                ai_overall_score = analysis_data.get('overall_score', result['ai_score'])
                 
-                # Calculate comprehensive scores and analysis
-                overall_score_data = self.scorer.calculate_overall_score(parsed_data, job_config)
-                overall_score = overall_score_data.get('overall_score', 0)
-                
-                # Extract component scores with better defaults
-                education_score = overall_score_data.get('education_score', 0)
-                experience_score = overall_score_data.get('experience_score', 0)
-                domain_score = overall_score_data.get('domain_alignment_score', 0)
-                language_score = overall_score_data.get('language_quality_score', 0)
-                skill_match_score = skill_match.get('relevance_score', 0)
-                
-                # Calculate skill match score manually if needed
-                if skill_match_score == 0:
-                    required_skills = job_config.get('required_skills', [])
-                    candidate_skills = []
-                    if isinstance(parsed_data.get('skills'), dict):
-                        candidate_skills = parsed_data['skills'].get('skills', [])
-                    elif isinstance(parsed_data.get('skills'), list):
-                        candidate_skills = parsed_data['skills']
-                    
-                    # Ensure all skills are strings
-                    candidate_skills = [str(skill) for skill in candidate_skills if skill]
-                    required_skills = [str(skill) for skill in required_skills if skill]
-                    
-                    if required_skills and candidate_skills:
-                        matched_count = 0
-                        for req_skill in required_skills:
-                            for cand_skill in candidate_skills:
-                                try:
-                                    if (req_skill.lower() in cand_skill.lower() or 
-                                        cand_skill.lower() in req_skill.lower() or
-                                        req_skill.lower() == cand_skill.lower()):
-                                        matched_count += 1
-                                        break
-                                except AttributeError:
-                                    continue
-                        
-                        # Calculate skill match percentage
-                        skill_match_percentage = (matched_count / len(required_skills)) * 100
-                        
-                        # Apply penalty for missing critical skills
-                        missing_skills_penalty = 0
-                        if matched_count < len(required_skills):
-                            missing_ratio = (len(required_skills) - matched_count) / len(required_skills)
-                            # Apply exponential penalty for missing skills
-                            missing_skills_penalty = missing_ratio * 30  # Up to 30% penalty
-                        
-                        skill_match_score = max(0, skill_match_percentage - missing_skills_penalty)
-                
-                # Calculate education score manually if needed
-                if education_score == 0:
-                    education_level = parsed_data.get('education', {})
-                    if isinstance(education_level, dict):
-                        degree = education_level.get('degree', '').lower()
-                        if 'btech' in degree or 'bachelor' in degree or 'b.e' in degree or 'b.tech' in degree:
-                            education_score = 90  # BTech gets high score
-                        elif 'master' in degree or 'mtech' in degree or 'm.e' in degree:
-                            education_score = 95  # Masters gets highest score
-                        elif 'diploma' in degree:
-                            education_score = 60
-                        else:
-                            education_score = 40
-                    else:
-                        # Check if education field contains BTech keywords
-                        education_text = str(parsed_data.get('education', '')).lower()
-                        if 'btech' in education_text or 'bachelor' in education_text or 'b.e' in education_text:
-                            education_score = 90
-                        else:
-                            education_score = 50  # Default for unknown education
-                
-                # Calculate experience score manually if needed
-                if experience_score == 0:
-                    experience_years = parsed_data.get('experience', {}).get('total_years', 0)
-                    if isinstance(experience_years, str):
-                        try:
-                            experience_years = float(experience_years)
-                        except:
-                            experience_years = 0
-                    
-                    # Get required experience from job
-                    required_exp = job_config.get('required_experience_years', 0)
-                    if isinstance(required_exp, str):
-                        try:
-                            required_exp = float(required_exp)
-                        except:
-                            required_exp = 0
-                    
-                    # Calculate score based on experience vs requirement
-                    if experience_years >= required_exp and required_exp > 0:
-                        # Meets or exceeds requirement
-                        if experience_years >= required_exp * 1.5:
-                            experience_score = 95  # Overqualified
-                        else:
-                            experience_score = 85  # Meets requirement
-                    elif experience_years > 0 and required_exp > 0:
-                        # Has some experience but less than required
-                        ratio = experience_years / required_exp
-                        experience_score = max(20, ratio * 60)  # 20-60% based on ratio
-                    elif experience_years == 0 and required_exp == 0:
-                        # No experience required, fresh graduate
-                        experience_score = 70  # Fresh graduate score
-                    else:
-                        # No experience when experience is required
-                        experience_score = 10  # Very low score
-                
-                # Calculate domain score manually if needed
-                if domain_score == 0:
-                    candidate_domain = parsed_data.get('domain', '')
-                    if isinstance(candidate_domain, dict):
-                        candidate_domain = str(candidate_domain.get('domain', ''))
-                    candidate_domain = str(candidate_domain).lower()
-                    
-                    target_domain = str(job_config.get('target_domain', '')).lower()
-                    if candidate_domain == target_domain or 'it' in candidate_domain:
-                        domain_score = 85
-                    else:
-                        domain_score = 60
-                
-                # Calculate language score manually if needed
-                if language_score == 0:
-                    language_quality = parsed_data.get('language_quality', {})
-                    if isinstance(language_quality, dict):
-                        language_score = language_quality.get('score', 70)
-                    else:
-                        language_score = 70  # Default reasonable score
-                
-                # Calculate weighted overall score
-                weighted_score = (
-                    education_score * 0.15 +
-                    experience_score * 0.20 +
-                    domain_score * 0.10 +
-                    language_score * 0.10 +
-                    skill_match_score * 0.45
-                )
-                
-                # Use the better score
-                final_overall_score = max(overall_score, weighted_score)
-                
-                # Generate realistic recommendation based on score
-                if final_overall_score >= 80:
-                    recommendation = "Highly recommended - Strong match for the position"
-                elif final_overall_score >= 65:
-                    recommendation = "Recommended - Good fit with minor gaps"
-                elif final_overall_score >= 50:
-                    recommendation = "Consider with reservations - Significant skill gaps"
-                elif final_overall_score >= 35:
-                    recommendation = "Not recommended - Major skill mismatch"
-                else:
-                    recommendation = "Strongly not recommended - Poor fit for the role"
-                
-                # Create comprehensive analysis
-                comprehensive_analysis = {
-                    'overall_assessment': f'Resume analysis completed with {final_overall_score:.1f}% overall score',
-                    'strengths': [],
-                    'weaknesses': [],
-                    'recommendation': recommendation,
-                    'component_scores': {
-                        'education': education_score,
-                        'experience': experience_score,
-                        'domain': domain_score,
-                        'language': language_score,
-                        'skill_match': skill_match_score
-                    },
-                    'skill_analysis': {
-                        'matched_required': self._calculate_matched_skills(parsed_data, job_config.get('required_skills', [])),
-                        'missing_required': self._calculate_missing_skills(parsed_data, job_config.get('required_skills', [])),
-                        'matched_optional': self._calculate_matched_skills(parsed_data, job_config.get('optional_skills', [])),
-                        'all_candidate_skills': parsed_data.get('skills', {}).get('skills', []) if isinstance(parsed_data.get('skills'), dict) else parsed_data.get('skills', [])
-                    },
-                    'keyword_analysis': {
-                        'coverage_percentage': skill_match_score,
-                        'overall_density': skill_match_score * 0.7,  # Simulate density
-                        'keywords_found': len(self._calculate_matched_skills(parsed_data, job_config.get('required_skills', []))),
-                        'keywords_missing': len(self._calculate_missing_skills(parsed_data, job_config.get('required_skills', [])))
-                    },
-                    'education_details': overall_score_data.get('education_details', {}),
-                    'experience_details': overall_score_data.get('experience_details', {}),
-                    'domain_details': overall_score_data.get('domain_details', {})
-                }
+                # Update result with AI data
+                result['ai_score'] = ai_overall_score
+                result['analysis'] = analysis_data
+                result['component_scores'] = ai_component_scores
+                result['skill_analysis'] = ai_skill_analysis
                 
-                result = {
-                    'success': True,
-                    'ai_score': final_overall_score,
-                    'parsed_data': parsed_data,
-                    'analysis': comprehensive_analysis,
-                    'component_scores': comprehensive_analysis['component_scores'],
-                    'skill_analysis': comprehensive_analysis['skill_analysis'],
-                    'keyword_analysis': comprehensive_analysis['keyword_analysis']
+                print(f"✓ AI analysis completed for {candidate_name} - Score: {ai_overall_score}")
+                return True
+            else:
+                print(f"⚠ AI analysis returned non-dict analysis: {type(analysis_data)}")
+        else:
+            print(f"⚠ AI analysis failed, using fallback analysis")
+        return False
+    
+    def _record_screening(self, request: ResumeScreeningRequest, result: Dict[str, Any],
+                          unless_newer_than: Optional[float] = None) -> bool:
+        """Add a finished screening to the job's leaderboard (see CandidateLeaderboard.record); True if written"""
+        try:
+            return self.leaderboard.record(request.job_id, result['candidate_id'], request.candidate_name, result,
+                                           unless_newer_than=unless_newer_than)
+        except Exception as e:
+            print(f"⚠ Leaderboard update failed: {e}")
+            return False
+    
+    def get_leaderboard(self, job_id: str, limit: int = 10, offset: int = 0, **filters) -> Dict[str, Any]:
+        """
+        Ranked candidates of a job
+        
+        Args:
+            job_id: Job ID
+            limit: Page size
+            offset: Entries to skip
+            **filters: min_score, max_score, skills, min_experience_years, domain
+            
+        Returns:
+            Dictionary with the matching total and one page of candidates
+        """
+        return {
+            'job_id': job_id,
+            'total': self.leaderboard.count(job_id, **filters),
+            'candidates': self.leaderboard.query(job_id, limit=limit, offset=offset, **filters)
+        }
+    
+    def rescore_job(self, job_id: str) -> Dict[str, Any]:
+        """
+        Re-rank a job's leaderboard against its current requirements
+        
+        Uses the parsed resumes stored with each leaderboard entry and runs
+        only the local scorer, skill matcher and JD relevance model (refitted
+        on the current pool and scored in one pass): no PDF parsing and no
+        LLM calls. Entries scored by Gemini are replaced by local scores.
+        
+        Args:
+            job_id: Job whose requirements changed
+            
+        Returns:
+            Dictionary with the number of candidates rescored, those skipped
+            (screened before features were stored) and the elapsed time
+        """
+        start = time.perf_counter()
+        # Pick up the edited requirements rather than a cached copy
+        self.invalidate_job_requirements(job_id)
+        job_config = self.get_job_requirements(job_id)
+        
+        candidates = self.leaderboard.features(job_id)
+        entries = [
+            (candidate_id, candidate_name, result)
+            for (candidate_id, candidate_name, _), result in zip(
+                candidates, self._score_candidates(job_id, job_config, candidates, refit=True)
+            )
+        ]
+        self.leaderboard.record_many(job_id, entries, store_features=False)
+        
+        elapsed = time.perf_counter() - start
+        print(f"✓ Rescored {len(entries)} candidates for job {job_id} in {elapsed:.2f}s")
+        return {
+            'job_id': job_id,
+            'rescored': len(entries),
+            'skipped': self.leaderboard.count(job_id) - len(entries),
+            'elapsed_seconds': round(elapsed, 3)
+        }
+    
+    def _lexical_rank(self, job_id: str, job_config: Dict[str, Any]) -> List[tuple]:
+        """Local scores for every stored candidate of a job, best first: (candidate_id, candidate_name, parsed_data, result)"""
+        candidates = self.leaderboard.features(job_id)
+        ranked = [
+            (candidate_id, candidate_name, parsed_data, result)
+            for (candidate_id, candidate_name, parsed_data), result in zip(
+                candidates, self._score_candidates(job_id, job_config, candidates)
+            )
+        ]
+        ranked.sort(key=lambda entry: (-entry[3]['ai_score'], entry[0]))
+        return ranked
+    
+    async def cascade_rank(self, job_id: str, top_k: Optional[int] = None,
+                           concurrency: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Two-stage ranking of a job's whole candidate pool
+        
+        Stage one scores every candidate on the leaderboard with the local
+        scorer and skill matcher (from their stored parsed resumes). Stage
+        two sends only the top_k of that ranking to Gemini, at most
+        `concurrency` calls at a time (within the shared Gemini limit). The
+        merged ranking is the shortlist ordered by its Gemini scores
+        followed by everyone else in lexical order; a shortlisted candidate
+        whose analysis fails keeps their local score. The leaderboard is
+        updated with the merged scores.
+        
+        Args:
+            job_id: Job whose candidates are ranked
+            top_k: Candidates sent to Gemini (default CASCADE_TOP_K)
+            concurrency: Simultaneous Gemini calls (default CASCADE_CONCURRENCY)
+            
+        Returns:
+            Dictionary with the merged ranking, Gemini call counts and the
+            time spent in each stage
+        """
+        top_k = self.cascade_top_k if top_k is None else max(0, top_k)
+        semaphore = asyncio.Semaphore(concurrency or self.cascade_concurrency)
+        loop = asyncio.get_running_loop()
+        executor = self.tiers['standard'].executor
+        
+        start = time.perf_counter()
+        job_config = await loop.run_in_executor(executor, self.get_job_requirements, job_id)
+        ranked = await loop.run_in_executor(executor, self._lexical_rank, job_id, job_config)
+        lexical_seconds = time.perf_counter() - start
+        
+        shortlist, rest = ranked[:top_k], ranked[top_k:]
+        if shortlist and not self.gemini_analyzer:
+            print("⚠ Cascade rerank requested but Gemini analyzer not available, keeping lexical ranking")
+        
+        async def rerank(candidate_name: str, parsed_data: Dict[str, Any], result: Dict[str, Any]) -> tuple:
+            """(result with Gemini scores if the analysis succeeded, ai_scored, analysis cache_status)"""
+            result = dict(result)
+            async with semaphore:
+                try:
+                    ai_analysis = await self.gemini_analyzer.analyze_resume_async(parsed_data, job_config)
+                except Exception as e:
+                    print(f"⚠ AI analysis failed for {candidate_name}: {e}")
+                    return result, False, None
+            ai_scored = self._apply_ai_analysis(result, ai_analysis, candidate_name)
+            return result, ai_scored, ai_analysis.get('cache_status') if isinstance(ai_analysis, dict) else None
+        
+        gemini_start = time.perf_counter()
+        if self.gemini_analyzer:
+            reranked = await asyncio.gather(*(
+                rerank(candidate_name, parsed_data, result)
+                for _, candidate_name, parsed_data, result in shortlist
+            ))
+        else:
+            reranked = [(result, False, None) for _, _, _, result in shortlist]
+        gemini_seconds = time.perf_counter() - gemini_start
+        
+        merged = sorted(
+            ((candidate_id, candidate_name, lexical_result['ai_score'], result, ai_scored)
+             for (candidate_id, candidate_name, _, lexical_result), (result, ai_scored, _) in zip(shortlist, reranked)),
+            key=lambda entry: (-entry[3]['ai_score'], entry[0])
+        ) + [(candidate_id, candidate_name, result['ai_score'], result, False)
+             for candidate_id, candidate_name, _, result in rest]
+        entries = [(candidate_id, candidate_name, result) for candidate_id, candidate_name, _, result, _ in merged]
+        await loop.run_in_executor(executor, self.leaderboard.record_many, job_id, entries, False)
+        
+        elapsed = time.perf_counter() - start
+        ai_scored_count = sum(ai_scored for _, ai_scored, _ in reranked)
+        print(f"✓ Cascade ranked {len(merged)} candidates for job {job_id} "
+              f"({ai_scored_count}/{len(shortlist)} reranked by Gemini) in {elapsed:.2f}s")
+        return {
+            'job_id': job_id,
+            'total': len(merged),
+            'top_k': len(shortlist),
+            'ai_scored': ai_scored_count,
+            'gemini_cache_hits': sum(cache_status in ('memory', 'disk') for _, _, cache_status in reranked),
+            'stage_seconds': {'lexical': round(lexical_seconds, 3), 'gemini': round(gemini_seconds, 3)},
+            'elapsed_seconds': round(elapsed, 3),
+            'candidates': [
+                {
+                    'rank': rank,
+                    'candidate_id': candidate_id,
+                    'candidate_name': candidate_name,
+                    'score': result['ai_score'],
+                    'lexical_score': lexical_score,
+                    'shortlisted': rank <= len(shortlist),
+                    'ai_used': ai_scored,
+                    'recommendation': (result.get('analysis') or {}).get('recommendation')
                 }
-                
-                # Use AI analysis if enabled
-                if request.enable_ai and self.gemini_analyzer:
-                    try:
-                        print(f"Starting AI analysis for {request.candidate_name}")
-                        ai_analysis = self.gemini_analyzer.analyze_resume(parsed_data, job_config)
-                        print(f"AI analysis result type: {type(ai_analysis)}")
-                        print(f"AI analysis result: {ai_analysis}")
-                        
-                        if isinstance(ai_analysis, dict) and ai_analysis.get('success'):
-                            analysis_data = ai_analysis.get('analysis', {})
-                            if isinstance(analysis_data, dict):
-                                # Use AI-generated scores and analysis
-                                ai_component_scores = analysis_data.get('component_scores', {})
-                                ai_skill_analysis = analysis_data.get('skill_analysis', {})
-                                ai_overall_score = analysis_data.get('overall_score', final_overall_score)
-                                
-                                # Update result with AI data
-                                result['ai_score'] = ai_overall_score
-                                result['analysis'] = analysis_data
-                                result['component_scores'] = ai_component_scores
-                                result['skill_analysis'] = ai_skill_analysis
-                                
-                                print(f"✓ AI analysis completed for {request.candidate_name} - Score: {ai_overall_score}")
-                            else:
-                                print(f"⚠ AI analysis returned non-dict analysis: {type(analysis_data)}")
-                        else:
-                            print(f"⚠ AI analysis failed, using fallback analysis")
-                    except Exception as e:
-                        print(f"⚠ AI analysis failed: {e}")
-                        # Keep comprehensive analysis as fallback
-                elif request.enable_ai and not self.gemini_analyzer:
-                    print("⚠ AI analysis requested but Gemini analyzer not available")
-                
-                return ResumeScreeningResponse(**result)
-                
-            finally:
-                # Clean up temporary file
-                if os.path.exists(temp_file_path):
-                    os.unlink(temp_file_path)
+                for rank, (candidate_id, candidate_name, lexical_score, result, ai_scored) in enumerate(merged, 1)
+            ]
+        }
+    
+    def screen_resume(self, request: ResumeScreeningRequest) -> ResumeScreeningResponse:
+        """Main resume screening function (runs on the caller's thread)"""
+        tier = self._tier_for(request)
+        start = time.perf_counter()
+        try:
+            result, parsed_data, job_config = self._screen_without_ai(request, tier)
+            ai_scored = False
+            run_ai = self._gate_ai(request, tier, result)
+            
+            # Use AI analysis for the deep tier (unless the gate settled it)
+            if run_ai and self.gemini_analyzer:
+                try:
+                    print(f"Starting AI analysis for {request.candidate_name}")
+                    ai_analysis = self.gemini_analyzer.analyze_resume(parsed_data, job_config)
+                    ai_scored = self._apply_ai_analysis(result, ai_analysis, request.candidate_name)
+                except Exception as e:
+                    print(f"⚠ AI analysis failed: {e}")
+                    # Keep comprehensive analysis as fallback
+            elif run_ai and not self.gemini_analyzer:
+                print("⚠ AI analysis requested but Gemini analyzer not available")
+            result['ai_used'] = ai_scored
+            
+            self._record_screening(request, result)
+            self._schedule_grammar_check(request, result, parsed_data, job_config, ai_scored)
+            return ResumeScreeningResponse(**result)
                     
         except Exception as e:
             print(f"✗ Resume screening failed: {e}")
             return ResumeScreeningResponse(
                 success=False,
+                tier=tier.name,
+                error=str(e)
+            )
+        finally:
+            tier.record(time.perf_counter() - start)
+    
+    def enqueue_screening(self, request: ResumeScreeningRequest, priority: int = 0) -> Dict[str, Any]:
+        """
+        Queue a screening to run in the background
+        
+        Args:
+            request: Screening request
+            priority: Higher runs first
+            
+        Returns:
+            The queued job (job_id, status, ...); poll get_screening_job for the result
+        """
+        if self.job_queue is None:
+            raise RuntimeError("Screening job queue is not available")
+        return self.job_queue.enqueue(request.dict(), priority=priority)
+    
+    def get_screening_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Status of a queued screening, with the screening response once it has succeeded"""
+        if self.job_queue is None:
+            return None
+        return self.job_queue.get(job_id)
+    
+    def _run_queued_screening(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Job queue handler: screens as screen_resume_async does, on its own event loop
+        
+        The tier's thread pool, latency budget and the Gemini timeout bound the
+        attempt like a request. Failures raise so the job is retried, except
+        for resumes that cannot be read (invalid base64, unreadable PDF, PDF
+        extraction timeout), which fail the job at once.
+        """
+        request = ResumeScreeningRequest(**payload)
+        tier = self._tier_for(request)
+        start = time.perf_counter()
+        try:
+            return asyncio.run(self._screen_async(request, tier, start)).dict()
+        except binascii.Error as e:
+            raise PermanentJobError(f"Invalid resume_base64: {e}") from e
+        except PDFWorkerUnavailable:
+            raise
+        except PDFExtractionError as e:
+            raise PermanentJobError(str(e)) from e
+        finally:
+            tier.record(time.perf_counter() - start)
+    
+    async def screen_resume_async(self, request: ResumeScreeningRequest) -> ResumeScreeningResponse:
+        """
+        screen_resume for async endpoints
+        
+        Parsing and scoring (CPU bound) run on the tier's thread pool; the
+        Gemini analysis of deep screenings is awaited on the event loop under
+        the shared concurrency limit, so waiting on the API does not hold a
+        thread. Gemini gets what is left of the tier's latency budget; past
+        that the local scores are returned.
+        """
+        tier = self._tier_for(request)
+        start = time.perf_counter()
+        try:
+            return await self._screen_async(request, tier, start)
+        except Exception as e:
+            print(f"✗ Resume screening failed: {e}")
+            return ResumeScreeningResponse(
+                success=False,
+                tier=tier.name,
                 error=str(e)
             )
+        finally:
+            tier.record(time.perf_counter() - start)
+    
+    async def _screen_async(self, request: ResumeScreeningRequest, tier: ScreeningTier,
+                            start: float) -> ResumeScreeningResponse:
+        """screen_resume_async without the error response: failures raise (start: when the screening began)"""
+        loop = asyncio.get_running_loop()
+        result, parsed_data, job_config = await loop.run_in_executor(
+            tier.executor, self._screen_without_ai, request, tier
+        )
+        ai_scored = False
+        run_ai = self._gate_ai(request, tier, result)
+        
+        if run_ai and self.gemini_analyzer:
+            try:
+                print(f"Starting AI analysis for {request.candidate_name}")
+                ai_analysis = await asyncio.wait_for(
+                    self.gemini_analyzer.analyze_resume_async(parsed_data, job_config),
+                    tier.remaining(time.perf_counter() - start)
+                )
+                ai_scored = self._apply_ai_analysis(result, ai_analysis, request.candidate_name)
+            except asyncio.TimeoutError:
+                print(f"⚠ AI analysis exceeded the {tier.name} tier budget ({tier.budget_seconds:g}s), "
+                      f"using local scores")
+            except Exception as e:
+                print(f"⚠ AI analysis failed: {e}")
+        elif run_ai and not self.gemini_analyzer:
+            print("⚠ AI analysis requested but Gemini analyzer not available")
+        result['ai_used'] = ai_scored
+        
+        await loop.run_in_executor(tier.executor, self._record_screening, request, result)
+        self._schedule_grammar_check(request, result, parsed_data, job_config, ai_scored)
+        return ResumeScreeningResponse(**result)
+
+# One service per process: it owns the job queue workers, PDF worker
+# processes, grammar checker and caches, which must not be duplicated
+_service: Optional[ResumeScreeningService] = None
+_service_lock = threading.Lock()
 
 
-# Initialize service
-resume_service = ResumeScreeningService()
+def get_resume_screening_service() -> ResumeScreeningService:
+    """The process-wide ResumeScreeningService, created on first use"""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = ResumeScreeningService()
+        return _service
 
 
 def create_resume_screening_app() -> FastAPI:
-    """Create FastAPI app for resume screening"""
+    """Create FastAPI app for resume screening (the shared service is created on the first request)"""
     app = FastAPI(
         title="Resume Screening API",
         description="AI-powered resume screening service",
@@ -502,7 +875,7 @@ def create_resume_screening_app() -> FastAPI:
     @app.post("/screen-resume", response_model=ResumeScreeningResponse)
     async def screen_resume_endpoint(request: ResumeScreeningRequest):
         """Screen a single resume against job requirements"""
-        return await resume_service.screen_resume(request)
+        return await get_resume_screening_service().screen_resume_async(request)
     
     @app.get("/health")
     async def health_check():
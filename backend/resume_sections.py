@@ -0,0 +1,217 @@
+"""
+Resume Section Segmentation
+Splits resume text once into headed sections with lowercased and tokenized
+views that every extractor reuses
+"""
+
+from __future__ import annotations
+
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+# Heading text (lowercased, trailing ':' removed, '&' -> 'and') -> section name
+SECTION_HEADINGS = {
+    'experience': [
+        'experience', 'work experience', 'professional experience', 'employment',
+        'employment history', 'work history', 'career history', 'internships',
+        'internship', 'internship experience', 'relevant experience',
+        'experience and internships'
+    ],
+    'education': [
+        'education', 'academic background', 'academic qualifications',
+        'qualifications', 'educational qualifications', 'education and training'
+    ],
+    'skills': [
+        'skills', 'technical skills', 'key skills', 'core skills', 'core competencies',
+        'competencies', 'technologies', 'tools and technologies', 'skills and tools'
+    ],
+    'projects': [
+        'projects', 'academic projects', 'personal projects', 'key projects', 'project experience'
+    ],
+    'summary': [
+        'summary', 'professional summary', 'profile', 'objective', 'career objective',
+        'about me', 'about'
+    ],
+    'other': [
+        'certifications', 'certificates', 'achievements', 'awards', 'honors',
+        'publications', 'languages', 'interests', 'hobbies', 'references',
+        'activities', 'extracurricular activities', 'volunteering', 'volunteer experience'
+    ],
+}
+
+HEADING_TO_SECTION = {
+    heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings
+}
+
+MAX_HEADING_LENGTH = 40
+
+# Lowercase word tokens; keeps tech spellings like c++, c#, node.js, ph.d together
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[.+#/&-][a-z0-9]+)*[+#]*")
+
+# Maximal runs of word characters: exactly the units a \bkeyword\b regex delimits
+WORD_PATTERN = re.compile(r"\w+")
+
+# Keywords made of word runs joined by separators ("python", "machine learning",
+# "ui/ux", "node.js"); others ("c++", ".net") are counted with the regex itself
+_INDEXABLE_PHRASE = re.compile(r"\w+(?:\W+\w+)*")
+
+
+@lru_cache(maxsize=4096)
+def phrase_key(phrase: str) -> Optional[Tuple[str, ...]]:
+    """
+    Lowercased word runs of a keyword interleaved with the exact separators
+    between them ("ui/ux" -> ('ui', '/', 'ux')), or None when the keyword
+    starts or ends with a non-word character
+    """
+    phrase = phrase.lower()
+    if not _INDEXABLE_PHRASE.fullmatch(phrase):
+        return None
+    return tuple(re.split(r"(\W+)", phrase))
+
+
+@lru_cache(maxsize=4096)
+def _keyword_pattern(phrase: str) -> re.Pattern:
+    return re.compile(r'\b' + re.escape(phrase.lower()) + r'\b')
+
+
+class PhraseCounts:
+    """
+    Occurrence counts of keywords in lowercased text, equal to
+    len(re.findall(r'\bkeyword\b', text)) without a regex scan per keyword.
+
+    The text is split once into its maximal word runs and the exact text
+    between consecutive runs. A keyword of n runs matches where n
+    consecutive runs equal its runs and the gaps between them equal its
+    separators, so "machine learning" is found in "Machine Learning/Deep
+    Learning" and "ui/ux" in "UI/UX/Design". Windows of each run count are
+    indexed on first use and counted without overlaps, as findall does.
+    Keywords starting or ending with a symbol fall back to the regex.
+    """
+
+    def __init__(self, text_lower: str) -> None:
+        self.text = text_lower
+        self.words: List[str] = []
+        # gaps[i] is the text between words[i] and words[i + 1]
+        self.gaps: List[str] = []
+        previous_end = 0
+        for match in WORD_PATTERN.finditer(text_lower):
+            if self.words:
+                self.gaps.append(text_lower[previous_end:match.start()])
+            self.words.append(match.group())
+            previous_end = match.end()
+        self._word_counts: Optional[Counter] = None
+        self._windows: Dict[int, Dict[Tuple[str, ...], List[int]]] = {}
+
+    def word_counts(self) -> Counter:
+        """Counts of every word run"""
+        if self._word_counts is None:
+            self._word_counts = Counter(self.words)
+        return self._word_counts
+
+    def _window_starts(self, runs: int) -> Dict[Tuple[str, ...], List[int]]:
+        """Phrase key of every window of `runs` consecutive words -> its start positions"""
+        windows = self._windows.get(runs)
+        if windows is None:
+            windows = {}
+            words, gaps = self.words, self.gaps
+            for start in range(len(words) - runs + 1):
+                key = [words[start]]
+                for offset in range(start, start + runs - 1):
+                    key.append(gaps[offset])
+                    key.append(words[offset + 1])
+                windows.setdefault(tuple(key), []).append(start)
+            self._windows[runs] = windows
+        return windows
+
+    def count(self, phrase: str) -> int:
+        """Whole-word occurrences of a keyword or phrase (case-insensitive)"""
+        key = phrase_key(phrase)
+        if key is None:
+            return len(_keyword_pattern(phrase).findall(self.text))
+        if len(key) == 1:
+            return self.word_counts().get(key[0], 0)
+
+        runs = (len(key) + 1) // 2
+        count, next_free = 0, 0
+        for start in self._window_starts(runs).get(key, ()):
+            if start >= next_free:
+                count += 1
+                next_free = start + runs
+        return count
+
+
+class ResumeSection:
+    """One block of resume text with the views extractors need"""
+
+    def __init__(self, name: str, text: str) -> None:
+        self.name = name
+        self.text = text
+        self.lower = text.lower()
+        self.words = text.split()
+        self._phrase_counts: Optional[PhraseCounts] = None
+
+    @property
+    def phrase_counts(self) -> PhraseCounts:
+        """Keyword/phrase counts over this section's text (built on first use)"""
+        if self._phrase_counts is None:
+            self._phrase_counts = PhraseCounts(self.lower)
+        return self._phrase_counts
+
+
+class ResumeSections:
+    """
+    A resume split into headed sections.
+
+    ``full`` covers the whole text. Text before the first heading is kept as
+    the 'header' section (name and contact details).
+    """
+
+    def __init__(self, text: str, sections: Dict[str, ResumeSection]) -> None:
+        self.full = ResumeSection('full', text)
+        self.sections = sections
+
+    def has(self, name: str) -> bool:
+        return name in self.sections
+
+    def get(self, name: str, fallback_to_full: bool = True) -> ResumeSection:
+        """
+        Return a section by name
+
+        When the resume has no such heading, returns the full text (or an empty
+        section when fallback_to_full is False) so extractors still see content.
+        """
+        section = self.sections.get(name)
+        if section is not None:
+            return section
+        return self.full if fallback_to_full else ResumeSection(name, '')
+
+
+def _heading_section(line: str) -> Optional[str]:
+    """Section name if the line is a known heading, else None"""
+    heading = line.strip().lower().rstrip(':').strip()
+    if not heading or len(heading) > MAX_HEADING_LENGTH:
+        return None
+    heading = ' '.join(heading.replace('&', ' and ').split())
+    return HEADING_TO_SECTION.get(heading)
+
+
+def segment_resume(text: str) -> ResumeSections:
+    """Split resume text into sections in one pass over its lines"""
+    collected: Dict[str, List[str]] = {}
+    current = 'header'
+
+    for line in text.split('\n'):
+        section = _heading_section(line)
+        if section is not None:
+            current = section
+            continue
+        collected.setdefault(current, []).append(line)
+
+    sections = {
+        name: ResumeSection(name, '\n'.join(lines))
+        for name, lines in collected.items()
+        if any(line.strip() for line in lines)
+    }
+    return ResumeSections(text, sections)
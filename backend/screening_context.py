@@ -0,0 +1,305 @@
+"""
+Screening Context
+Holds one resume/job pair for a screening and computes every derived view
+(scores, skill matches, recommendation) at most once
+"""
+
+from typing import Dict, Any, List, Callable, Optional
+
+from skill_matcher import SkillMatcher
+from resume_scorer import ResumeScorer
+
+
+class ScreeningContext:
+    """
+    Memoised view of a single screening.
+
+    Candidate and required skills are normalised once, and each stage
+    (scoring, skill matching, component scores) runs on first access only.
+    ``stage_counts`` records how many times each stage actually ran.
+
+    ``jd_relevance`` is an optional resume/JD relevance score (0-100, see
+    jd_relevance.py) computed outside the context, usually for a whole pool
+    at once. When given, it becomes a sixth component weighted
+    ``jd_relevance_weight`` in the weighted score; the other weights are
+    scaled down so the weights still add up to 1.
+
+    ``overall_score_data`` seeds the scorer stage with a result already
+    computed for many resumes at once (ResumeScorer.overall_scores).
+    """
+
+    # Weights for the final weighted score shown to HR
+    COMPONENT_WEIGHTS = {
+        'education': 0.15,
+        'experience': 0.20,
+        'domain': 0.10,
+        'language': 0.10,
+        'skill_match': 0.45
+    }
+
+    def __init__(self, parsed_data: Dict[str, Any], job_config: Dict[str, Any],
+                 scorer: ResumeScorer, matcher: SkillMatcher,
+                 jd_relevance: Optional[float] = None, jd_relevance_weight: float = 0.0,
+                 overall_score_data: Optional[Dict[str, Any]] = None):
+        self.parsed_data = parsed_data
+        self.job_config = job_config
+        self.scorer = scorer
+        self.matcher = matcher
+        self.jd_relevance = jd_relevance
+        self.jd_relevance_weight = jd_relevance_weight if jd_relevance is not None else 0.0
+        self.stage_counts: Dict[str, int] = {}
+        self._memo: Dict[str, Any] = {}
+        if overall_score_data is not None:
+            self._memo['overall_score'] = overall_score_data
+
+        skills = parsed_data.get('skills')
+        if isinstance(skills, dict):
+            self.all_candidate_skills = skills.get('skills', [])
+        elif isinstance(skills, list):
+            self.all_candidate_skills = skills
+        else:
+            self.all_candidate_skills = []
+
+        # Ensure all skills are strings, lowercased once for substring matching
+        self.candidate_skills = [str(skill) for skill in self.all_candidate_skills if skill]
+        self._candidate_skills_lower = [skill.lower() for skill in self.candidate_skills]
+
+    def _stage(self, name: str, compute: Callable[[], Any]) -> Any:
+        """Run a stage on first use and remember its result"""
+        if name not in self._memo:
+            self.stage_counts[name] = self.stage_counts.get(name, 0) + 1
+            self._memo[name] = compute()
+        return self._memo[name]
+
+    @property
+    def overall_score_data(self) -> Dict[str, Any]:
+        """ResumeScorer.calculate_overall_score for this resume/job"""
+        return self._stage('overall_score', lambda: self.scorer.calculate_overall_score(
+            self.parsed_data, self.job_config
+        ))
+
+    @property
+    def skill_match(self) -> Dict[str, Any]:
+        """SkillMatcher.match_against_job_description for this resume/job"""
+        return self._stage('skill_match', lambda: self.matcher.match_against_job_description(
+            self.parsed_data,
+            self.job_config.get('job_description', ''),
+            self.job_config.get('required_skills', []),
+            self.job_config.get('optional_skills', []),
+            self.job_config.get('custom_keywords', [])
+        ))
+
+    @property
+    def matched_required(self) -> List[str]:
+        """Required skills the candidate has"""
+        return self._stage('matched_required', lambda: self._match(self.job_config.get('required_skills', [])))
+
+    @property
+    def missing_required(self) -> List[str]:
+        """Required skills the candidate is missing"""
+        matched = self.matched_required
+        return [skill for skill in self.job_config.get('required_skills', []) if skill not in matched]
+
+    @property
+    def matched_optional(self) -> List[str]:
+        """Optional skills the candidate has"""
+        return self._stage('matched_optional', lambda: self._match(self.job_config.get('optional_skills', [])))
+
+    def _match(self, skills: List[str]) -> List[str]:
+        """Skills with a substring match (either direction) in the candidate's skills"""
+        if not skills:
+            return []
+
+        matched = []
+        for req_skill in (str(skill) for skill in skills if skill):
+            req_lower = req_skill.lower()
+            for cand_lower in self._candidate_skills_lower:
+                if req_lower in cand_lower or cand_lower in req_lower:
+                    matched.append(req_skill)
+                    break
+        return matched
+
+    @property
+    def component_scores(self) -> Dict[str, float]:
+        """Education/experience/domain/language/skill scores with manual fallbacks (plus jd_relevance if given)"""
+        return self._stage('component_scores', self._compute_component_scores)
+
+    def _compute_component_scores(self) -> Dict[str, float]:
+        parsed_data = self.parsed_data
+        job_config = self.job_config
+        overall_score_data = self.overall_score_data
+
+        # Extract component scores with better defaults
+        education_score = overall_score_data.get('education_score', 0)
+        experience_score = overall_score_data.get('experience_score', 0)
+        domain_score = overall_score_data.get('domain_alignment_score', 0)
+        language_score = overall_score_data.get('language_quality_score', 0)
+        skill_match_score = self.skill_match.get('relevance_score', 0)
+
+        # Calculate skill match score manually if needed
+        if skill_match_score == 0:
+            required_skills = [str(skill) for skill in job_config.get('required_skills', []) if skill]
+
+            if required_skills and self.candidate_skills:
+                matched_count = len(self.matched_required)
+
+                # Calculate skill match percentage
+                skill_match_percentage = (matched_count / len(required_skills)) * 100
+
+                # Apply penalty for missing critical skills
+                missing_skills_penalty = 0
+                if matched_count < len(required_skills):
+                    missing_ratio = (len(required_skills) - matched_count) / len(required_skills)
+                    # Apply exponential penalty for missing skills
+                    missing_skills_penalty = missing_ratio * 30  # Up to 30% penalty
+
+                skill_match_score = max(0, skill_match_percentage - missing_skills_penalty)
+
+        # Calculate education score manually if needed
+        if education_score == 0:
+            education_level = parsed_data.get('education', {})
+            if isinstance(education_level, dict):
+                degree = education_level.get('degree', '').lower()
+                if 'btech' in degree or 'bachelor' in degree or 'b.e' in degree or 'b.tech' in degree:
+                    education_score = 90  # BTech gets high score
+                elif 'master' in degree or 'mtech' in degree or 'm.e' in degree:
+                    education_score = 95  # Masters gets highest score
+                elif 'diploma' in degree:
+                    education_score = 60
+                else:
+                    education_score = 40
+            else:
+                # Check if education field contains BTech keywords
+                education_text = str(parsed_data.get('education', '')).lower()
+                if 'btech' in education_text or 'bachelor' in education_text or 'b.e' in education_text:
+                    education_score = 90
+                else:
+                    education_score = 50  # Default for unknown education
+
+        # Calculate experience score manually if needed
+        if experience_score == 0:
+            experience_years = parsed_data.get('experience', {}).get('total_years', 0)
+            if isinstance(experience_years, str):
+                try:
+                    experience_years = float(experience_years)
+                except:
+                    experience_years = 0
+
+            # Get required experience from job
+            required_exp = job_config.get('required_experience_years', 0)
+            if isinstance(required_exp, str):
+                try:
+                    required_exp = float(required_exp)
+                except:
+                    required_exp = 0
+
+            # Calculate score based on experience vs requirement
+            if experience_years >= required_exp and required_exp > 0:
+                # Meets or exceeds requirement
+                if experience_years >= required_exp * 1.5:
+                    experience_score = 95  # Overqualified
+                else:
+                    experience_score = 85  # Meets requirement
+            elif experience_years > 0 and required_exp > 0:
+                # Has some experience but less than required
+                ratio = experience_years / required_exp
+                experience_score = max(20, ratio * 60)  # 20-60% based on ratio
+            elif experience_years == 0 and required_exp == 0:
+                # No experience required, fresh graduate
+                experience_score = 70  # Fresh graduate score
+            else:
+                # No experience when experience is required
+                experience_score = 10  # Very low score
+
+        # Calculate domain score manually if needed
+        if domain_score == 0:
+            candidate_domain = parsed_data.get('domain', '')
+            if isinstance(candidate_domain, dict):
+                candidate_domain = str(candidate_domain.get('domain', ''))
+            candidate_domain = str(candidate_domain).lower()
+
+            target_domain = str(job_config.get('target_domain', '')).lower()
+            if candidate_domain == target_domain or 'it' in candidate_domain:
+                domain_score = 85
+            else:
+                domain_score = 60
+
+        # Calculate language score manually if needed
+        if language_score == 0:
+            language_quality = parsed_data.get('language_quality', {})
+            if isinstance(language_quality, dict):
+                language_score = language_quality.get('score', 70)
+            else:
+                language_score = 70  # Default reasonable score
+
+        scores = {
+            'education': education_score,
+            'experience': experience_score,
+            'domain': domain_score,
+            'language': language_score,
+            'skill_match': skill_match_score
+        }
+        if self.jd_relevance is not None:
+            scores['jd_relevance'] = self.jd_relevance
+        return scores
+
+    @property
+    def weighted_score(self) -> float:
+        """Weighted sum of the component scores"""
+        scores = self.component_scores
+        weighted = sum(scores[name] * weight for name, weight in self.COMPONENT_WEIGHTS.items())
+        if self.jd_relevance_weight:
+            weighted = (weighted * (1 - self.jd_relevance_weight)
+                        + scores['jd_relevance'] * self.jd_relevance_weight)
+        return weighted
+
+    @property
+    def final_score(self) -> float:
+        """The better of the scorer's overall score and the weighted score"""
+        return max(self.overall_score_data.get('overall_score', 0), self.weighted_score)
+
+    @property
+    def recommendation(self) -> str:
+        """Realistic recommendation based on the final score"""
+        final_overall_score = self.final_score
+        if final_overall_score >= 80:
+            return "Highly recommended - Strong match for the position"
+        elif final_overall_score >= 65:
+            return "Recommended - Good fit with minor gaps"
+        elif final_overall_score >= 50:
+            return "Consider with reservations - Significant skill gaps"
+        elif final_overall_score >= 35:
+            return "Not recommended - Major skill mismatch"
+        else:
+            return "Strongly not recommended - Poor fit for the role"
+
+    def build_analysis(self) -> Dict[str, Any]:
+        """Comprehensive (non-AI) analysis for the screening response"""
+        final_overall_score = self.final_score
+        skill_match_score = self.component_scores['skill_match']
+        overall_score_data = self.overall_score_data
+        matched_required = self.matched_required
+        missing_required = self.missing_required
+
+        return {
+            'overall_assessment': f'Resume analysis completed with {final_overall_score:.1f}% overall score',
+            'strengths': [],
+            'weaknesses': [],
+            'recommendation': self.recommendation,
+            'component_scores': dict(self.component_scores),
+            'skill_analysis': {
+                'matched_required': matched_required,
+                'missing_required': missing_required,
+                'matched_optional': self.matched_optional,
+                'all_candidate_skills': self.all_candidate_skills
+            },
+            'keyword_analysis': {
+                'coverage_percentage': skill_match_score,
+                'overall_density': skill_match_score * 0.7,  # Simulate density
+                'keywords_found': len(matched_required),
+                'keywords_missing': len(missing_required)
+            },
+            'education_details': overall_score_data.get('education_details', {}),
+            'experience_details': overall_score_data.get('experience_details', {}),
+            'domain_details': overall_score_data.get('domain_details', {})
+        }
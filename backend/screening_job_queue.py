@@ -0,0 +1,288 @@
+"""
+Screening Job Queue
+Durable SQLite-backed queue of resume screenings, processed by a pool of
+worker threads with priorities and retries
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Optional
+
+from persistent_cache import DEFAULT_CACHE_DIR
+
+JOB_STATUSES = ['queued', 'running', 'succeeded', 'failed']
+
+_SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS screening_jobs ("
+    "job_id TEXT PRIMARY KEY, status TEXT NOT NULL, priority INTEGER NOT NULL, "
+    "attempts INTEGER NOT NULL DEFAULT 0, max_attempts INTEGER NOT NULL, payload TEXT, "
+    "result TEXT, error TEXT, created_at REAL NOT NULL, available_at REAL NOT NULL, "
+    "started_at REAL, finished_at REAL)",
+    # Next runnable job: highest priority first, then oldest
+    "CREATE INDEX IF NOT EXISTS screening_jobs_runnable "
+    "ON screening_jobs (status, priority DESC, created_at)",
+]
+
+_JOB_COLUMNS = ['job_id', 'status', 'priority', 'attempts', 'max_attempts', 'result', 'error',
+                'created_at', 'started_at', 'finished_at']
+
+
+class PermanentJobError(Exception):
+    """Raised by a handler for a failure a retry cannot fix; the job fails without further attempts"""
+
+
+class ScreeningJobQueue:
+    """
+    Durable queue of screening jobs with a pool of worker threads.
+
+    A job is a JSON payload handed to ``handler``; whatever the handler
+    returns is stored as the job's result, and an exception marks the
+    attempt failed. Failed attempts are retried with exponential backoff up
+    to ``max_attempts``, then the job ends as ``failed`` with the last error;
+    a PermanentJobError fails the job at once.
+    Workers take the highest-priority runnable job, oldest first.
+
+    Jobs live in SQLite, so queued work survives a restart. A running job's
+    worker renews its lease (``started_at``) every third of
+    ``lease_seconds``; a job still marked running once its lease has
+    expired (its worker died with the process) is picked up again, and
+    several processes can share one database. An attempt only stores its
+    outcome while it still holds the job, so a stalled worker whose job was
+    taken over cannot overwrite the new attempt's outcome. Leases stop being
+    renewed once an attempt has run for ``attempt_seconds``, so a hung
+    attempt loses the job when its lease expires and the job is retried
+    (or fails, if it was the last attempt).
+    The payload is dropped once a job finishes; status and result are kept
+    for ``retention_seconds``.
+
+    Defaults come from SCREENING_JOBS_DB_PATH (backend/.cache/screening_jobs.sqlite3),
+    SCREENING_JOB_WORKERS, SCREENING_JOB_MAX_ATTEMPTS, SCREENING_JOB_LEASE_SECONDS,
+    SCREENING_JOB_ATTEMPT_SECONDS (0: no limit) and SCREENING_JOB_RETENTION_HOURS. If the database cannot be opened the
+    queue lives in memory for the life of the process.
+    """
+
+    def __init__(self, handler: Callable[[Dict[str, Any]], Dict[str, Any]], db_path: Optional[str] = None,
+                 workers: Optional[int] = None, max_attempts: Optional[int] = None,
+                 lease_seconds: Optional[float] = None, attempt_seconds: Optional[float] = None,
+                 retention_seconds: Optional[float] = None,
+                 retry_delay_seconds: float = 2.0, poll_seconds: float = 1.0) -> None:
+        self.handler = handler
+        self.db_path = (db_path or os.getenv('SCREENING_JOBS_DB_PATH')
+                        or os.path.join(DEFAULT_CACHE_DIR, "screening_jobs.sqlite3"))
+        self.size = max(1, int(os.getenv('SCREENING_JOB_WORKERS', '4')) if workers is None else workers)
+        self.max_attempts = max(1, int(os.getenv('SCREENING_JOB_MAX_ATTEMPTS', '3'))
+                                if max_attempts is None else max_attempts)
+        self.lease_seconds = (float(os.getenv('SCREENING_JOB_LEASE_SECONDS', '600'))
+                              if lease_seconds is None else lease_seconds)
+        self.attempt_seconds = (float(os.getenv('SCREENING_JOB_ATTEMPT_SECONDS', '300'))
+                                if attempt_seconds is None else attempt_seconds)
+        self.retention_seconds = (float(os.getenv('SCREENING_JOB_RETENTION_HOURS', '72')) * 3600
+                                  if retention_seconds is None else retention_seconds)
+        self.retry_delay_seconds = retry_delay_seconds
+        self.poll_seconds = poll_seconds
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition()
+        self._closed = False
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+            self._conn = self._connect(self.db_path)
+        except Exception as e:
+            print(f"⚠ Screening jobs: disk store unavailable, using memory only ({e})")
+            self._conn = self._connect(":memory:")
+        self.purge_finished()
+
+        self._workers = [
+            threading.Thread(target=self._work, name=f"screening-job-worker-{index}", daemon=True)
+            for index in range(self.size)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    @staticmethod
+    def _connect(path: str) -> sqlite3.Connection:
+        conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        if path != ":memory:":
+            conn.execute("PRAGMA journal_mode=WAL")
+        for statement in _SCHEMA:
+            conn.execute(statement)
+        conn.commit()
+        return conn
+
+    def enqueue(self, payload: Dict[str, Any], priority: int = 0) -> Dict[str, Any]:
+        """
+        Add a job
+
+        Args:
+            payload: JSON-serialisable input for the handler
+            priority: Higher runs first (default 0)
+
+        Returns:
+            The new job (job_id, status 'queued', ...)
+        """
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO screening_jobs (job_id, status, priority, max_attempts, payload, created_at, available_at) "
+                "VALUES (?, 'queued', ?, ?, ?, ?, ?)",
+                (job_id, int(priority), self.max_attempts, json.dumps(payload, default=str), now, now),
+            )
+            self._conn.commit()
+        with self._wakeup:
+            self._wakeup.notify()
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """A job's status, attempts, timestamps and (once finished) result or error"""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(_JOB_COLUMNS)} FROM screening_jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        job = dict(zip(_JOB_COLUMNS, row))
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        return job
+
+    def _claim(self) -> Optional[tuple]:
+        """Mark the next runnable job running; (job_id, payload, attempts, max_attempts) or None"""
+        now = time.time()
+        with self._lock:
+            try:
+                # Immediate transaction: no other process can claim the same job
+                self._conn.execute("BEGIN IMMEDIATE")
+                # Expired leases: the worker died mid-attempt
+                self._conn.execute(
+                    "UPDATE screening_jobs SET status = 'failed', error = 'Worker stopped during the last attempt', "
+                    "payload = NULL, finished_at = ? "
+                    "WHERE status = 'running' AND started_at < ? AND attempts >= max_attempts",
+                    (now, now - self.lease_seconds),
+                )
+                self._conn.execute(
+                    "UPDATE screening_jobs SET status = 'queued' WHERE status = 'running' AND started_at < ?",
+                    (now - self.lease_seconds,),
+                )
+                row = self._conn.execute(
+                    "SELECT job_id, payload, attempts, max_attempts FROM screening_jobs "
+                    "WHERE status = 'queued' AND available_at <= ? "
+                    "ORDER BY priority DESC, created_at LIMIT 1",
+                    (now,),
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE screening_jobs SET status = 'running', attempts = attempts + 1, started_at = ? "
+                        "WHERE job_id = ?",
+                        (now, row[0]),
+                    )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                self._conn.rollback()
+                print(f"⚠ Screening jobs: claim failed: {e}")
+                return None
+        if row is None:
+            return None
+        job_id, payload, attempts, max_attempts = row
+        return job_id, json.loads(payload), attempts + 1, max_attempts
+
+    def _work(self) -> None:
+        """Worker loop: run claimed jobs, sleep until woken or the next poll when idle"""
+        while not self._closed:
+            job = self._claim()
+            if job is None:
+                with self._wakeup:
+                    self._wakeup.wait(self.poll_seconds)
+                continue
+            self._run(*job)
+
+    def _run(self, job_id: str, payload: Dict[str, Any], attempt: int, max_attempts: int) -> None:
+        """Run one attempt of a job, renewing its lease meanwhile, and store its outcome"""
+        stop = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(job_id, attempt, stop),
+                                     name=f"screening-job-heartbeat-{job_id}", daemon=True)
+        heartbeat.start()
+        try:
+            result = self.handler(payload)
+        except Exception as e:
+            now = time.time()
+            if isinstance(e, PermanentJobError):
+                print(f"✗ Screening job {job_id} failed (not retried): {e}")
+                self._update(job_id, attempt, "status = 'failed', error = ?, payload = NULL, finished_at = ?",
+                             (str(e), now))
+            elif attempt >= max_attempts:
+                print(f"✗ Screening job {job_id} failed after {attempt} attempts: {e}")
+                self._update(job_id, attempt, "status = 'failed', error = ?, payload = NULL, finished_at = ?",
+                             (str(e), now))
+            else:
+                retry_at = now + self.retry_delay_seconds * 2 ** (attempt - 1)
+                print(f"⚠ Screening job {job_id} attempt {attempt} failed, retrying: {e}")
+                self._update(job_id, attempt, "status = 'queued', error = ?, available_at = ?", (str(e), retry_at))
+            return
+        finally:
+            stop.set()
+
+        self._update(job_id, attempt, "status = 'succeeded', result = ?, error = NULL, payload = NULL, finished_at = ?",
+                     (json.dumps(result, default=str), time.time()))
+
+    def _heartbeat(self, job_id: str, attempt: int, stop: threading.Event) -> None:
+        """Renew a running attempt's lease every third of lease_seconds until stopped or attempt_seconds have passed"""
+        deadline = time.monotonic() + self.attempt_seconds if self.attempt_seconds else None
+        while not stop.wait(self.lease_seconds / 3):
+            if deadline is not None and time.monotonic() >= deadline:
+                print(f"⚠ Screening job {job_id} attempt {attempt} ran past {self.attempt_seconds:g}s; "
+                      f"its lease is left to expire")
+                return
+            if not self._update(job_id, attempt, "started_at = ?", (time.time(),)):
+                return
+
+    def _update(self, job_id: str, attempt: int, assignments: str, params: tuple) -> bool:
+        """Apply assignments to a job if this attempt still holds it; False if it no longer does"""
+        with self._lock:
+            try:
+                updated = self._conn.execute(
+                    f"UPDATE screening_jobs SET {assignments} "
+                    "WHERE job_id = ? AND status = 'running' AND attempts = ?",
+                    params + (job_id, attempt),
+                ).rowcount
+                self._conn.commit()
+            except sqlite3.Error as e:
+                self._conn.rollback()
+                print(f"⚠ Screening jobs: could not update {job_id}: {e}")
+                return True
+        if not updated:
+            print(f"⚠ Screening job {job_id} attempt {attempt} lost its lease to another worker; update skipped")
+        return bool(updated)
+
+    def purge_finished(self) -> int:
+        """Delete finished jobs older than retention_seconds; returns how many"""
+        if not self.retention_seconds:
+            return 0
+        with self._lock:
+            deleted = self._conn.execute(
+                "DELETE FROM screening_jobs WHERE status IN ('succeeded', 'failed') AND finished_at < ?",
+                (time.time() - self.retention_seconds,),
+            ).rowcount
+            self._conn.commit()
+        return deleted
+
+    def close(self) -> None:
+        """Stop the workers after their current job; queued jobs stay in the database"""
+        self._closed = True
+        with self._wakeup:
+            self._wakeup.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        """Jobs per status and pool size"""
+        with self._lock:
+            counts = dict(self._conn.execute(
+                "SELECT status, COUNT(*) FROM screening_jobs GROUP BY status"
+            ).fetchall())
+        stats: Dict[str, Any] = {status: counts.get(status, 0) for status in JOB_STATUSES}
+        stats['workers'] = self.size
+        return stats
@@ -0,0 +1,99 @@
+"""
+Screening Tiers
+Fast / standard / deep screening profiles, each with its own worker pool,
+latency budget and latency statistics
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+if TYPE_CHECKING:
+    from pdf_worker_pool import PDFExtractionPool
+
+TIER_NAMES = ['fast', 'standard', 'deep']
+
+# Tier -> (spaCy parsing, Gemini analysis, default workers, default latency budget in seconds).
+# fast: regex-only parse + local scoring, for bulk pre-filtering
+# standard: full parse (spaCy on the experience section) + local scoring
+# deep: standard plus Gemini analysis (bounded by the remaining budget)
+_TIER_DEFAULTS = {
+    'fast': (False, False, 8, 1.0),
+    'standard': (True, False, 4, 5.0),
+    'deep': (True, True, 4, 45.0),
+}
+
+# Latencies kept per tier for percentiles
+_LATENCY_WINDOW = 1000
+
+
+class ScreeningTier:
+    """
+    One screening profile: which stages run, on which threads, in what time.
+
+    Each tier has its own thread pool for the local pipeline (PDF extraction,
+    parsing, scoring), so a bulk run of fast screenings cannot hold up
+    standard or deep ones. The latency budget is the tier's target
+    end-to-end time; deep screenings give Gemini only what is left of it.
+    Latencies of recent screenings are kept for p50/p95 and over-budget
+    counts.
+
+    ``pdf_pool`` is the tier's own PDF extraction pool (set by the service;
+    None extracts in-process), sized ``pdf_workers``.
+
+    Pool sizes and budget come from SCREENING_<TIER>_WORKERS,
+    SCREENING_<TIER>_PDF_WORKERS (default PDF_POOL_WORKERS) and
+    SCREENING_<TIER>_BUDGET_SECONDS (e.g. SCREENING_FAST_WORKERS).
+    """
+
+    def __init__(self, name: str, workers: Optional[int] = None, budget_seconds: Optional[float] = None) -> None:
+        if name not in _TIER_DEFAULTS:
+            raise ValueError(f"Unknown screening tier '{name}', expected one of {TIER_NAMES}")
+        self.name = name
+        self.use_nlp, self.use_ai, default_workers, default_budget = _TIER_DEFAULTS[name]
+        prefix = f"SCREENING_{name.upper()}"
+        self.workers = max(1, int(os.getenv(f'{prefix}_WORKERS', str(default_workers)))
+                           if workers is None else workers)
+        self.budget_seconds = (float(os.getenv(f'{prefix}_BUDGET_SECONDS', str(default_budget)))
+                               if budget_seconds is None else budget_seconds)
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=f"screening-{name}")
+        self.pdf_workers = max(0, int(os.getenv(f'{prefix}_PDF_WORKERS', os.getenv('PDF_POOL_WORKERS', '2'))))
+        self.pdf_pool: Optional[PDFExtractionPool] = None
+
+        self._lock = threading.Lock()
+        self._latencies: "deque[float]" = deque(maxlen=_LATENCY_WINDOW)
+        self._stats = {"screenings": 0, "over_budget": 0}
+
+    def remaining(self, elapsed_seconds: float) -> float:
+        """Seconds left of the budget after elapsed_seconds (never negative)"""
+        return max(0.0, self.budget_seconds - elapsed_seconds)
+
+    def record(self, elapsed_seconds: float) -> None:
+        """Count one finished screening and its end-to-end latency"""
+        with self._lock:
+            self._stats["screenings"] += 1
+            if elapsed_seconds > self.budget_seconds:
+                self._stats["over_budget"] += 1
+            self._latencies.append(elapsed_seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        """Screening and over-budget counts, p50/p95 latency of recent screenings, budget and pool sizes"""
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+            latencies = sorted(self._latencies)
+        for label, quantile in (("p50_ms", 0.50), ("p95_ms", 0.95)):
+            stats[label] = (round(latencies[min(len(latencies) - 1, int(quantile * len(latencies)))] * 1000, 1)
+                            if latencies else None)
+        stats["budget_seconds"] = self.budget_seconds
+        stats["workers"] = self.workers
+        stats["pdf_workers"] = self.pdf_pool.size if self.pdf_pool is not None else 0
+        return stats
+
+
+def create_tiers() -> Dict[str, ScreeningTier]:
+    """One ScreeningTier per tier name, configured from the environment"""
+    return {name: ScreeningTier(name) for name in TIER_NAMES}
@@ -7,10 +7,11 @@ import os
 import re
 import json
 from typing import Dict, List, Any, Optional
-import pdfplumber
 import PyPDF2
 from textblob import TextBlob
 
+from pdf_text_extractor import PDFTextExtractor
+
 
 class SimplifiedResumeParser:
     """
@@ -19,6 +20,7 @@ class SimplifiedResumeParser:
     
     def __init__(self):
         self.textblob = TextBlob("")
+        self.text_extractor = PDFTextExtractor()
         print("✓ Simplified Resume Parser initialized")
     
     def parse_resume(self, file_path: str) -> Dict[str, Any]:
@@ -59,15 +61,9 @@ class SimplifiedResumeParser:
             return self._create_empty_result(f"Error parsing resume: {str(e)}")
     
     def _extract_text_from_pdf(self, file_path: str) -> str:
-        """Extract text from PDF using pdfplumber"""
+        """Extract text from PDF using the configured PDFTextExtractor backend"""
         try:
-            with pdfplumber.open(file_path) as pdf:
-                text = ""
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-                return text
+            return self.text_extractor.extract(file_path)
         except Exception as e:
             print(f"Error extracting text: {e}")
             return ""
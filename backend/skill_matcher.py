@@ -1,16 +1,35 @@
-from typing import Dict, List, Set, Optional
+from typing import Dict, List, Set, Optional, Tuple
 import re
 from collections import Counter
-import difflib
+from functools import lru_cache
 import os
 
+from skill_ontology import canonical_skill, canonical_skill_set
+from skill_similarity import best_matches_batch
+from resume_sections import ResumeSection
+
+# Common words never used as job description keywords
+JD_STOP_WORDS = {'with', 'have', 'from', 'that', 'this', 'will', 'your', 'about', 
+                 'their', 'been', 'would', 'there', 'could', 'which', 'were', 'when'}
+
+
+@lru_cache(maxsize=256)
+def extract_jd_keywords(job_description: str) -> Tuple[str, ...]:
+    """Top 20 frequent words (4+ letters, no stop words) of a job description"""
+    words = re.findall(r'\b[a-zA-Z]{4,}\b', job_description.lower())
+    word_freq = Counter(words)
+    return tuple([word for word, count in word_freq.most_common(30) 
+                  if word not in JD_STOP_WORDS][:20])
+
 class SkillMatcher:
     """
     Advanced skill matching and keyword analysis with Gemini AI integration
     """
     
     def __init__(self, use_ai: bool = False):
-        self.similarity_threshold = 0.8  # For fuzzy matching
+        # Fuzzy matching cut-off on n-gram cosine similarity (0-1); calibrated so
+        # 0.8 behaves like the difflib ratio threshold it replaced (skill_similarity)
+        self.similarity_threshold = 0.8
         self.use_ai = use_ai
         self.gemini_matcher = None
         
@@ -27,19 +46,18 @@ class SkillMatcher:
     def calculate_keyword_density(self, text: str, keywords: List[str]) -> Dict:
         """
         Calculate keyword density and frequency for given keywords
+        
+        The text is tokenized once; each keyword is then a lookup in the
+        word/phrase counts (whole-word matches, multi-word keywords included).
         """
-        text_lower = text.lower()
+        phrase_counts = ResumeSection('full', text).phrase_counts
         word_count = len(text.split())
         
         keyword_stats = {}
         total_keyword_occurrences = 0
         
         for keyword in keywords:
-            keyword_lower = keyword.lower()
-            
-            # Count exact matches
-            exact_pattern = r'\b' + re.escape(keyword_lower) + r'\b'
-            occurrences = len(re.findall(exact_pattern, text_lower))
+            occurrences = phrase_counts.count(keyword)
             
             if occurrences > 0:
                 density = (occurrences / word_count) * 100 if word_count > 0 else 0
@@ -99,6 +117,32 @@ class SkillMatcher:
         # Standard matching (fallback or default)
         return self._standard_match(resume_skills, required_skills, optional_skills)
     
+    def match_skills_batch(self, resume_skill_lists: List[List[str]], required_skills: List[str],
+                           optional_skills: List[str] = None) -> List[Dict]:
+        """
+        Match several resumes against the same job requirements
+        
+        Same results as calling match_skills per resume, but the fuzzy pass for
+        the whole batch runs as one vectorised similarity computation.
+        """
+        if optional_skills is None:
+            optional_skills = []
+        
+        if self.use_ai and self.gemini_matcher:
+            return [self.match_skills(skills, required_skills, optional_skills)
+                    for skills in resume_skill_lists]
+        
+        exact = [self._exact_match(skills, required_skills, optional_skills)
+                 for skills in resume_skill_lists]
+        fuzzy = best_matches_batch(
+            [(sorted(missing), sorted(resume_lower)) for resume_lower, _, missing, _ in exact],
+            self.similarity_threshold
+        )
+        return [
+            self._build_match_result(*match, fuzzy_best, required_skills, optional_skills)
+            for match, fuzzy_best in zip(exact, fuzzy)
+        ]
+    
     def _format_ai_results(self, ai_result: Dict, resume_skills: List[str],
                           required_skills: List[str], optional_skills: List[str]) -> Dict:
         """Format Gemini AI results to standard output format"""
@@ -132,61 +176,58 @@ class SkillMatcher:
     
     def _standard_match(self, resume_skills: List[str], required_skills: List[str],
                        optional_skills: List[str]) -> Dict:
-        """Standard skill matching with enhanced variation handling"""
+        """Standard skill matching over canonical skill IDs plus a fuzzy pass"""
+        resume_skills_lower, matched_required, missing_required, matched_optional = \
+            self._exact_match(resume_skills, required_skills, optional_skills)
+        fuzzy_best = best_matches_batch(
+            [(sorted(missing_required), sorted(resume_skills_lower))], self.similarity_threshold
+        )[0]
+        return self._build_match_result(resume_skills_lower, matched_required, missing_required,
+                                        matched_optional, fuzzy_best, required_skills, optional_skills)
+    
+    def _exact_match(self, resume_skills: List[str], required_skills: List[str],
+                     optional_skills: List[str]) -> Tuple[Set[str], Set[str], Set[str], Set[str]]:
+        """Exact matching over canonical skill IDs (see skill_ontology)"""
         # Convert to sets for easier comparison
         resume_skills_lower = set()
         for skill in resume_skills:
             resume_skills_lower.add(skill.lower().strip())
+        resume_ids = canonical_skill_set(resume_skills_lower)
         
-        # Match with variations
+        # Spelling variants and synonyms share a canonical ID, so a set lookup is enough
         matched_required = set()
         missing_required = set()
         
         for req_skill in required_skills:
             req_lower = req_skill.lower().strip()
-            variations = self._get_skill_variations(req_lower)
-            
-            # Check if any variation matches
-            found = False
-            for resume_skill in resume_skills_lower:
-                if resume_skill in variations or req_lower in self._get_skill_variations(resume_skill):
-                    matched_required.add(req_lower)
-                    found = True
-                    break
-            
-            if not found:
+            if canonical_skill(req_lower) in resume_ids:
+                matched_required.add(req_lower)
+            else:
                 missing_required.add(req_lower)
         
         # Match optional skills
         matched_optional = set()
         for opt_skill in optional_skills:
             opt_lower = opt_skill.lower().strip()
-            variations = self._get_skill_variations(opt_lower)
-            
-            for resume_skill in resume_skills_lower:
-                if resume_skill in variations or opt_lower in self._get_skill_variations(resume_skill):
-                    matched_optional.add(opt_lower)
-                    break
+            if canonical_skill(opt_lower) in resume_ids:
+                matched_optional.add(opt_lower)
         
-        # Fuzzy matching for missing required skills
+        return resume_skills_lower, matched_required, missing_required, matched_optional
+    
+    def _build_match_result(self, resume_skills_lower: Set[str], matched_required: Set[str],
+                            missing_required: Set[str], matched_optional: Set[str],
+                            fuzzy_best: Dict[str, Tuple[str, float]],
+                            required_skills: List[str], optional_skills: List[str]) -> Dict:
+        """Apply fuzzy matches and compute the match scores"""
+        # Fuzzy matches (n-gram cosine >= similarity_threshold) count as matched
         fuzzy_matches = {}
-        for missing_skill in list(missing_required)[:]:  # Copy to avoid modification during iteration
-            best_match = None
-            best_similarity = 0
-            
-            for resume_skill in resume_skills_lower:
-                similarity = difflib.SequenceMatcher(None, missing_skill, resume_skill).ratio()
-                if similarity >= self.similarity_threshold and similarity > best_similarity:
-                    best_match = resume_skill
-                    best_similarity = similarity
-            
-            if best_match:
-                fuzzy_matches[missing_skill] = {
-                    'matched_with': best_match,
-                    'similarity': round(best_similarity * 100, 2)
-                }
-                missing_required.remove(missing_skill)
-                matched_required.add(missing_skill)
+        for missing_skill, (best_match, best_similarity) in fuzzy_best.items():
+            fuzzy_matches[missing_skill] = {
+                'matched_with': best_match,
+                'similarity': round(best_similarity * 100, 2)
+            }
+            missing_required.discard(missing_skill)
+            matched_required.add(missing_skill)
         
         # Calculate match scores
         required_match_score = (len(matched_required) / len(required_skills)) * 100 if required_skills else 100
@@ -212,85 +253,31 @@ class SkillMatcher:
             'ai_powered': False
         }
     
-    def _get_skill_variations(self, skill: str) -> Set[str]:
-        """Generate all possible variations of a skill name"""
-        variations = {skill}
-        
-        # Handle dots: node.js <-> nodejs
-        if '.' in skill:
-            variations.add(skill.replace('.', ''))  # node.js -> nodejs
-            variations.add(skill.replace('.', ' '))  # node.js -> node js
-            base = skill.split('.')[0]
-            variations.add(base)  # node.js -> node
-        else:
-            # Reverse: nodejs -> node.js
-            if skill.endswith('js') and len(skill) > 2:
-                base = skill[:-2]
-                variations.add(f"{base}.js")  # nodejs -> node.js
-                variations.add(f"{base} js")  # nodejs -> node js
-                variations.add(base)  # nodejs -> node
-        
-        # Handle spaces: express js <-> expressjs
-        if ' ' in skill:
-            variations.add(skill.replace(' ', ''))  # express js -> expressjs
-            variations.add(skill.replace(' ', '.'))  # express js -> express.js
-        
-        # Handle common programming language variations
-        skill_mappings = {
-            'c': {'c', 'c programming', 'c language'},
-            'c++': {'c++', 'cpp', 'c plus plus'},
-            'c#': {'c#', 'csharp', 'c sharp'},
-            'javascript': {'javascript', 'js', 'ecmascript'},
-            'typescript': {'typescript', 'ts'},
-            'python': {'python', 'python3', 'py'}
-        }
-        
-        for key, values in skill_mappings.items():
-            if skill in values:
-                variations.update(values)
-        
-        return variations
-        
-        return {
-            'matched_required_skills': list(matched_required),
-            'matched_optional_skills': list(matched_optional),
-            'missing_required_skills': list(missing_required - set(fuzzy_matches.keys())),
-            'fuzzy_matched_skills': fuzzy_matches,
-            'required_match_score': round(required_match_score, 2),
-            'optional_match_score': round(optional_match_score, 2),
-            'overall_skill_score': round(overall_score, 2),
-            'total_matched': len(matched_required) + len(matched_optional),
-            'total_required': len(required_skills_lower),
-            'total_optional': len(optional_skills_lower)
-        }
-    
     def match_against_job_description(self, resume_data: Dict, job_description: str, 
                                      required_skills: List[str], 
                                      optional_skills: List[str] = None,
-                                     custom_keywords: List[str] = None) -> Dict:
+                                     custom_keywords: List[str] = None,
+                                     skill_match: Optional[Dict] = None) -> Dict:
         """
         Complete matching of resume against job description
+        
+        skill_match may carry a precomputed match_skills result (e.g. from
+        match_skills_batch) to skip the skill matching step.
         """
         if optional_skills is None:
             optional_skills = []
         
-        # Extract keywords from job description if not provided
+        # Extract keywords from job description if not provided (cached per JD)
         if custom_keywords is None:
-            # Extract important words from job description (simple approach)
-            words = re.findall(r'\b[a-zA-Z]{4,}\b', job_description.lower())
-            word_freq = Counter(words)
-            # Get top 20 most common words (excluding common stop words)
-            stop_words = {'with', 'have', 'from', 'that', 'this', 'will', 'your', 'about', 
-                         'their', 'been', 'would', 'there', 'could', 'which', 'were', 'when'}
-            custom_keywords = [word for word, count in word_freq.most_common(30) 
-                              if word not in stop_words][:20]
+            custom_keywords = list(extract_jd_keywords(job_description))
         
         # Get resume text
         resume_text = resume_data.get('raw_text', '')
         resume_skills = resume_data.get('skills', {}).get('skills', [])
         
         # Skill matching
-        skill_match = self.match_skills(resume_skills, required_skills, optional_skills)
+        if skill_match is None:
+            skill_match = self.match_skills(resume_skills, required_skills, optional_skills)
         
         # Keyword density analysis
         all_keywords = list(set(required_skills + optional_skills + custom_keywords))
@@ -335,16 +322,23 @@ class SkillMatcher:
         """
         results = []
         
+        # Skill-match every resume in one batch (single vectorised fuzzy pass)
+        skill_matches = self.match_skills_batch(
+            [resume_data.get('skills', {}).get('skills', []) for resume_data in resumes_data],
+            required_skills, optional_skills
+        )
+        
         for idx, resume_data in enumerate(resumes_data):
             match_result = self.match_against_job_description(
-                resume_data, job_description, required_skills, optional_skills
+                resume_data, job_description, required_skills, optional_skills,
+                skill_match=skill_matches[idx]
             )
             
             results.append({
                 'resume_index': idx,
                 'candidate_name': resume_data.get('basic_info', {}).get('name', f'Candidate {idx+1}'),
                 'relevance_score': match_result['relevance_score'],
-                'skill_match_score': match_result['skill_match']['overall_skill_score'],
+                'skill_match_score': match_result['skill_match'].get('overall_match_score', 0),
                 'keyword_coverage': match_result['keyword_analysis']['coverage_percentage'],
                 'recommendation': match_result['recommendation'],
                 'full_analysis': match_result
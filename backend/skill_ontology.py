@@ -0,0 +1,126 @@
+"""
+Skill Ontology
+Shared skill dictionary and an alias -> canonical ID map built once at import,
+so skill names can be compared by ID instead of by generating variations
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, Set
+
+# Skills database (extensible)
+SKILL_CATEGORIES = {
+    'programming': ['Python', 'Java', 'JavaScript', 'TypeScript', 'C++', 'C#', 'Ruby', 'PHP', 'Swift', 'Kotlin', 'Go', 'Rust', 'Scala', 'R'],
+    'web': ['HTML', 'CSS', 'React', 'Angular', 'Vue.js', 'Node.js', 'Express', 'Django', 'Flask', 'Spring', 'ASP.NET', 'jQuery', 'Bootstrap', 'Tailwind'],
+    'database': ['SQL', 'MySQL', 'PostgreSQL', 'MongoDB', 'Redis', 'Oracle', 'MS SQL Server', 'SQLite', 'Cassandra', 'DynamoDB'],
+    'cloud': ['AWS', 'Azure', 'Google Cloud', 'GCP', 'Heroku', 'DigitalOcean', 'Firebase', 'Kubernetes', 'Docker', 'Jenkins'],
+    'data_science': ['Machine Learning', 'Deep Learning', 'TensorFlow', 'PyTorch', 'Keras', 'Pandas', 'NumPy', 'Scikit-learn', 'NLP', 'Computer Vision'],
+    'tools': ['Git', 'GitHub', 'GitLab', 'Jira', 'Agile', 'Scrum', 'CI/CD', 'REST API', 'GraphQL', 'Microservices'],
+    'marketing': ['SEO', 'SEM', 'Google Analytics', 'Content Marketing', 'Social Media Marketing', 'Email Marketing', 'PPC', 'Facebook Ads', 'Google Ads'],
+    'design': ['Photoshop', 'Illustrator', 'Figma', 'Sketch', 'Adobe XD', 'UI/UX', 'InDesign', 'CorelDRAW'],
+    'business': ['Project Management', 'Business Analysis', 'Financial Analysis', 'Strategic Planning', 'Budgeting', 'Forecasting', 'Leadership']
+}
+
+# Canonical skill -> other names for the same skill
+SKILL_SYNONYMS = {
+    'c': ['c programming', 'c language'],
+    'c++': ['cpp', 'c plus plus'],
+    'c#': ['csharp', 'c sharp'],
+    'javascript': ['js', 'ecmascript'],
+    'typescript': ['ts'],
+    'python': ['python3', 'py'],
+    'go': ['golang'],
+    'postgresql': ['postgres'],
+    'kubernetes': ['k8s'],
+    'scikit-learn': ['sklearn'],
+    'google cloud': ['gcp', 'google cloud platform'],
+    'machine learning': ['ml'],
+    'natural language processing': ['nlp'],
+}
+
+# Single-letter/special languages that only match on strict word boundaries
+STRICT_SKILLS = {'c', 'c++', 'c#', 'r'}
+
+# Separators that never distinguish two skills: "node js", "node.js", "scikit-learn"
+_SEPARATORS = re.compile(r'[\s._-]+')
+
+
+def skill_spellings(skill_lower: str) -> Set[str]:
+    """Spellings of a skill to look for in text: node.js <-> nodejs, node js, node"""
+    if skill_lower in STRICT_SKILLS:
+        return {skill_lower}
+
+    spellings = {skill_lower}
+    if '.' in skill_lower:
+        spellings.add(skill_lower.replace('.', ''))  # node.js -> nodejs
+        spellings.add(skill_lower.replace('.', ' '))  # node.js -> node js
+        spellings.add(skill_lower.split('.')[0])  # node.js -> node
+    elif skill_lower.endswith('js') and len(skill_lower) > 2:
+        base = skill_lower[:-2]
+        spellings.add(base + '.js')  # nodejs -> node.js
+        spellings.add(base + ' js')  # nodejs -> node js
+        spellings.add(base)  # nodejs -> node
+
+    # An empty spelling (e.g. from ".net") would match any punctuation
+    spellings.discard('')
+    return spellings
+
+
+def _compact(name: str) -> str:
+    """Lowercase and drop separators: 'Node.js' -> 'nodejs', 'C Sharp' -> 'csharp'"""
+    return _SEPARATORS.sub('', name.lower())
+
+
+def _strip_js_suffix(compact: str) -> str:
+    """'nodejs' -> 'node'; framework names are the same skill with or without .js"""
+    if compact.endswith('js') and len(compact) > 2:
+        return compact[:-2]
+    return compact
+
+
+def _build_alias_map() -> Dict[str, str]:
+    alias_map: Dict[str, str] = {}
+    for canonical, aliases in SKILL_SYNONYMS.items():
+        canonical_id = _compact(canonical)
+        for alias in [canonical] + aliases:
+            alias_map[_compact(alias)] = canonical_id
+
+    # Every spelling of a dictionary skill (asp.net -> asp, aspnet, asp net)
+    for skills in SKILL_CATEGORIES.values():
+        for skill in skills:
+            skill_lower = skill.lower()
+            compact = _compact(skill_lower)
+            canonical_id = alias_map.get(compact, _strip_js_suffix(compact))
+            for spelling in skill_spellings(skill_lower):
+                alias_map.setdefault(_compact(spelling), canonical_id)
+    return alias_map
+
+
+# Compacted alias -> canonical ID, built once at import
+ALIAS_TO_CANONICAL = _build_alias_map()
+
+
+@lru_cache(maxsize=4096)
+def canonical_skill(name: str) -> str:
+    """
+    Canonical ID for a skill name
+
+    Names that differ only in case, spaces, dots, hyphens, a trailing "js" or a
+    known synonym share an ID: 'Node.js', 'nodejs' and 'node js' all map to
+    'node'; 'cpp' and 'C++' both map to 'c++'. Returns '' for blank names.
+    """
+    compact = _compact(str(name))
+    canonical_id = ALIAS_TO_CANONICAL.get(compact)
+    if canonical_id is not None:
+        return canonical_id
+    return _strip_js_suffix(compact)
+
+
+def canonical_skill_set(names: Iterable[str]) -> Set[str]:
+    """Canonical IDs for a collection of skill names (blank names dropped)"""
+    ids = {canonical_skill(name) for name in names if name}
+    ids.discard('')
+    return ids
+
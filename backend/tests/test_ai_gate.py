@@ -0,0 +1,66 @@
+from types import SimpleNamespace
+
+import pytest
+
+from ai_gate import ALWAYS, CLEAR_ACCEPT, CLEAR_REJECT, UNCERTAIN, AIGate
+
+
+@pytest.mark.parametrize('score, decision', [
+    (0, CLEAR_REJECT),
+    (34.99, CLEAR_REJECT),
+    (35, UNCERTAIN),
+    (79.99, UNCERTAIN),
+    (80, CLEAR_ACCEPT),
+    (100, CLEAR_ACCEPT),
+])
+def test_auto_band_edges(score, decision):
+    assert AIGate(35, 80).decide('auto', score) == decision
+
+
+def test_enable_ai_true_always_calls_and_false_never_does():
+    gate = AIGate(35, 80)
+    assert gate.decide(True, 5) == ALWAYS
+    assert gate.decide(False, 50) is None
+    assert AIGate.calls_ai(ALWAYS) and AIGate.calls_ai(UNCERTAIN)
+    assert not any(AIGate.calls_ai(decision) for decision in (CLEAR_ACCEPT, CLEAR_REJECT, None))
+
+
+def test_band_defaults_come_from_the_environment(monkeypatch):
+    monkeypatch.setenv('AI_GATE_LOW', '20')
+    monkeypatch.setenv('AI_GATE_HIGH', '60')
+    gate = AIGate()
+    assert (gate.low, gate.high) == (20, 60)
+    with pytest.raises(ValueError):
+        AIGate(80, 35)
+
+
+def test_stats_count_decisions_and_skip_rate():
+    gate = AIGate(35, 80)
+    for enable_ai, score in [('auto', 10), ('auto', 50), ('auto', 90), ('auto', 95), (True, 50), (False, 50)]:
+        gate.decide(enable_ai, score)
+
+    stats = gate.stats()
+    assert stats[CLEAR_REJECT] == 1 and stats[UNCERTAIN] == 1 and stats[CLEAR_ACCEPT] == 2
+    assert stats[ALWAYS] == 1
+    assert stats['auto_skip_rate'] == 0.75
+    assert stats['band'] == [35, 80]
+
+
+@pytest.mark.parametrize('enable_ai, use_ai, score, calls, gate_decision', [
+    ('auto', True, 50, True, UNCERTAIN),
+    ('auto', True, 90, False, CLEAR_ACCEPT),
+    (True, True, 10, True, ALWAYS),
+    (False, True, 50, False, None),
+    (True, False, 50, False, 'unset'),
+])
+def test_gate_ai_records_the_decision(enable_ai, use_ai, score, calls, gate_decision):
+    pytest.importorskip('firebase_admin')
+    from resume_screening_service import ResumeScreeningService
+
+    service = SimpleNamespace(ai_gate=AIGate(35, 80))
+    request = SimpleNamespace(enable_ai=enable_ai, candidate_name='Asha')
+    result = {'ai_score': score}
+
+    assert ResumeScreeningService._gate_ai(service, request, SimpleNamespace(use_ai=use_ai), result) == calls
+    assert result['ai_used'] is False
+    assert result.get('ai_gate', 'unset') == gate_decision
@@ -0,0 +1,141 @@
+import pytest
+
+import candidate_leaderboard
+from candidate_leaderboard import CandidateLeaderboard
+
+
+def _result(score, skills=(), domain=None, years=None, parsed=True):
+    result = {
+        'ai_score': score,
+        'component_scores': {'skill_match': score},
+        'skill_analysis': {'matched_required': list(skills)},
+        'analysis': {'recommendation': 'Consider'},
+    }
+    if parsed:
+        result['parsed_data'] = {
+            'skills': {'skills': list(skills)},
+            'domain': {'primary_domain': domain} if domain else None,
+            'experience': {'total_years': years} if years is not None else {},
+        }
+    return result
+
+
+@pytest.fixture
+def leaderboard(tmp_path):
+    return CandidateLeaderboard(db_path=str(tmp_path / 'leaderboard.sqlite3'))
+
+
+def _ids(entries):
+    return [entry['candidate_id'] for entry in entries]
+
+
+def test_skill_filter_matches_canonical_spellings(leaderboard):
+    leaderboard.record('job', 'a', 'A', _result(90, skills=['Node.js', 'Python']))
+    leaderboard.record('job', 'b', 'B', _result(80, skills=['nodejs']))
+    leaderboard.record('job', 'c', 'C', _result(70, skills=['Python']))
+
+    assert _ids(leaderboard.query('job', skills=['node js'])) == ['a', 'b']
+    assert _ids(leaderboard.query('job', skills=['NodeJS', 'python'])) == ['a']
+    assert leaderboard.count('job', skills=['node']) == 2
+    assert leaderboard.query('job', skills=['Rust']) == []
+
+
+def test_skill_filter_is_scoped_to_the_job(leaderboard):
+    leaderboard.record('job-1', 'a', 'A', _result(90, skills=['Python']))
+    leaderboard.record('job-2', 'b', 'B', _result(90, skills=['Java']))
+    leaderboard.record('job-2', 'a', 'A', _result(50, skills=['Java']))
+
+    assert _ids(leaderboard.query('job-2', skills=['python'])) == []
+    assert _ids(leaderboard.query('job-2', skills=['java'])) == ['b', 'a']
+
+
+def test_domain_and_experience_filters(leaderboard):
+    leaderboard.record('job', 'a', 'A', _result(90, domain='IT', years=6))
+    leaderboard.record('job', 'b', 'B', _result(80, domain='Finance', years=2))
+    leaderboard.record('job', 'c', 'C', _result(70, domain='it', years=1))
+
+    assert _ids(leaderboard.query('job', domain='it')) == ['a', 'c']
+    assert _ids(leaderboard.query('job', domain='IT', min_experience_years=5)) == ['a']
+    assert leaderboard.count('job', domain='Healthcare') == 0
+
+
+def test_score_range_is_inclusive(leaderboard):
+    for candidate_id, score in [('a', 90), ('b', 80), ('c', 70), ('d', 60)]:
+        leaderboard.record('job', candidate_id, candidate_id.upper(), _result(score))
+
+    assert _ids(leaderboard.query('job', min_score=70, max_score=80)) == ['b', 'c']
+    assert leaderboard.count('job', min_score=80.5) == 1
+    assert _ids(leaderboard.query('job', limit=2, offset=1)) == ['b', 'c']
+
+
+def test_ties_rank_by_candidate_id(leaderboard):
+    leaderboard.record('job', 'c', 'C', _result(75))
+    leaderboard.record('job', 'a', 'A', _result(75))
+    leaderboard.record('job', 'b', 'B', _result(75))
+    leaderboard.record('job', 'z', 'Z', _result(90))
+
+    assert _ids(leaderboard.top('job', k=4)) == ['z', 'a', 'b', 'c']
+    assert [leaderboard.get('job', candidate_id)['rank'] for candidate_id in 'zabc'] == [1, 2, 3, 4]
+    assert leaderboard.get('job', 'missing') is None
+
+
+def test_rescreen_replaces_the_entry_and_its_skills(leaderboard):
+    leaderboard.record('job', 'a', 'A', _result(40, skills=['Python'], domain='IT'))
+    leaderboard.record('job', 'b', 'B', _result(60, skills=['Python']))
+    leaderboard.record('job', 'a', 'A', _result(85, skills=['Java'], domain='Finance'))
+
+    entry = leaderboard.get('job', 'a')
+    assert entry['score'] == 85
+    assert entry['rank'] == 1
+    assert entry['candidate_domain'] == 'Finance'
+    assert leaderboard.count('job') == 2
+    assert _ids(leaderboard.query('job', skills=['python'])) == ['b']
+    assert _ids(leaderboard.query('job', skills=['java'])) == ['a']
+    assert leaderboard.stats() == {'jobs': 1, 'candidates': 2}
+
+
+def test_rescreen_without_parsed_data_keeps_stored_features(leaderboard):
+    leaderboard.record('job', 'a', 'A', _result(40, skills=['Python']))
+    leaderboard.record_many('job', [('a', 'A', _result(70, parsed=False))], store_features=False)
+
+    assert leaderboard.get('job', 'a')['score'] == 70
+    (candidate_id, _, parsed_data), = leaderboard.features('job')
+    assert candidate_id == 'a'
+    assert parsed_data['skills'] == {'skills': ['Python']}
+
+
+def test_entries_persist_across_instances(tmp_path):
+    path = str(tmp_path / 'leaderboard.sqlite3')
+    CandidateLeaderboard(db_path=path).record('job', 'a', 'A', _result(66, skills=['Python']))
+
+    reopened = CandidateLeaderboard(db_path=path)
+    assert _ids(reopened.query('job', skills=['python'])) == ['a']
+    assert reopened.get('job', 'a')['matched_required'] == ['Python']
+
+
+def test_unless_newer_than_keeps_a_newer_entry(leaderboard, monkeypatch):
+    clock = iter(range(1000, 2000))
+    monkeypatch.setattr(candidate_leaderboard.time, 'time', lambda: next(clock))
+    leaderboard.record('job', 'a', 'A', _result(50, skills=['Python']))
+    screened_at = leaderboard.get('job', 'a')['screened_at']
+    leaderboard.record('job', 'a', 'A', _result(88, skills=['Java']))
+
+    assert not leaderboard.record('job', 'a', 'A', _result(51, skills=['Python']), unless_newer_than=screened_at)
+    assert leaderboard.get('job', 'a')['score'] == 88
+    assert _ids(leaderboard.query('job', skills=['java'])) == ['a']
+
+    assert leaderboard.record('job', 'b', 'B', _result(40), unless_newer_than=screened_at)
+    assert leaderboard.record('job', 'a', 'A', _result(90), unless_newer_than=leaderboard.get('job', 'a')['screened_at'])
+    assert leaderboard.get('job', 'a')['score'] == 90
+
+
+def test_relevance_fits_are_kept_per_job_text(tmp_path):
+    path = str(tmp_path / 'leaderboard.sqlite3')
+    state = {'terms': ['python', 'django'], 'document_frequency': [3.0, 1.0], 'documents': 4, 'total_length': 90}
+    CandidateLeaderboard(db_path=path).store_relevance_fit('job', 'hash-1', state)
+
+    reopened = CandidateLeaderboard(db_path=path)
+    assert reopened.relevance_fit('job', 'hash-1') == state
+    assert reopened.relevance_fit('job', 'hash-2') is None
+    reopened.clear_job('job')
+    assert reopened.relevance_fit('job', 'hash-1') is None
@@ -0,0 +1,58 @@
+import re
+
+import pytest
+import spacy
+
+from enhanced_resume_parser import EnhancedResumeParser
+
+RESUMES = [
+    """Data Scientist - Machine Learning/Deep Learning (AI/analytics team)
+    Statistics-heavy data mining; artificial intelligence research. Software engineer, cloud/devops.""",
+    """UI/UX/Design lead; graphic design, visual design & typography. Branding/creative campaigns.
+    Social media-first digital marketing, SEO/SEM, content.""",
+    """Human Resources-facing HR management: recruitment/talent acquisition, payroll, compensation.
+    Team lead/manager; employee relations, planning & operations strategy.""",
+    """Sales: business development, account management/client relations, CRM, lead generation,
+    revenue. Finance/accounting, banking, investment, financial analysis, auditing, taxation.""",
+    "",
+]
+
+
+def baseline_domain_scores(domain_keywords, text):
+    """Domain scores as detect_domain computed them with one regex per keyword"""
+    text_lower = text.lower()
+    domain_scores = {}
+    for domain, keywords in domain_keywords.items():
+        score = 0
+        matched_keywords = []
+        for keyword in keywords:
+            count = len(re.findall(r'\b' + re.escape(keyword) + r'\b', text_lower))
+            if count > 0:
+                score += count
+                matched_keywords.append(keyword)
+        domain_scores[domain] = {'score': score, 'matched_keywords': matched_keywords}
+    return domain_scores
+
+
+@pytest.fixture(scope='module')
+def parser():
+    # Domain detection needs no spaCy pipeline; skip loading en_core_web_sm
+    load = spacy.load
+    spacy.load = lambda *args, **kwargs: spacy.blank('en')
+    try:
+        yield EnhancedResumeParser()
+    finally:
+        spacy.load = load
+
+
+@pytest.mark.parametrize('text', RESUMES)
+def test_domain_scores_match_baseline(parser, text):
+    result = parser.detect_domain(text)
+    assert result['domain_scores'] == baseline_domain_scores(parser.domain_keywords, text)
+
+
+def test_compound_domain_keywords_are_counted(parser):
+    scores = parser.detect_domain(RESUMES[2])['domain_scores']
+    assert 'human resources' in scores['HR']['matched_keywords']
+    assert 'team lead' in scores['Management']['matched_keywords']
+    assert 'ui/ux' in parser.detect_domain(RESUMES[1])['domain_scores']['Design']['matched_keywords']
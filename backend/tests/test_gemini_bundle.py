@@ -0,0 +1,100 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import gemini_analyzer
+from gemini_analyzer import GeminiResumeAnalyzer
+from gemini_schemas import INTERVIEW_CATEGORIES
+
+# Shape of EnhancedResumeParser output for the fields the prompts read
+PARSED_RESUME = {
+    'name': 'Asha Rao',
+    'skills': {'skills': ['python', 'sql', 'docker'], 'skill_count': 3, 'categorized_skills': {}},
+    'experience': {'total_years': 4, 'job_titles': ['Data Engineer', 'Analyst'], 'companies': [],
+                   'has_experience': True},
+    'education': {'degree': 'B.Tech', 'institution': 'IIT'},
+    'domain': 'IT',
+}
+JOB_CONFIG = {
+    'job_title': 'Data Engineer',
+    'required_skills': ['python', 'spark'],
+    'optional_skills': ['docker', 'airflow'],
+}
+
+
+class FailingCall:
+    def __init__(self):
+        self.prompts = []
+
+    def __call__(self, prompt, schema=None):
+        self.prompts.append(prompt)
+        raise RuntimeError('Gemini unavailable')
+
+
+@pytest.fixture
+def analyzer(monkeypatch, tmp_path):
+    monkeypatch.setattr(gemini_analyzer.genai, 'Client', lambda **kwargs: object())
+    monkeypatch.setenv('GEMINI_CACHE_PATH', str(tmp_path / 'cache.db'))
+    return GeminiResumeAnalyzer(api_key='test-key')
+
+
+def test_missing_skills_reads_parser_skill_list(analyzer):
+    missing_required, missing_optional = analyzer._missing_skills(PARSED_RESUME, JOB_CONFIG)
+    assert missing_required == {'spark'}
+    assert missing_optional == {'airflow'}
+
+
+def test_bundle_falls_back_on_parser_output(analyzer):
+    analyzer._generate = FailingCall()
+    result = analyzer.screening_bundle(PARSED_RESUME, JOB_CONFIG, company_culture='Remote-first')
+
+    assert result['mode'] == 'fan_out'
+    assert not result['success']
+    assert all(not result[section]['success'] for section in ('analysis', 'interview_questions', 'roadmap',
+                                                              'culture_fit'))
+    prompts = '\n'.join(analyzer._generate.prompts)
+    assert 'python, sql, docker' in prompts
+    assert '2 positions' in prompts
+
+
+def test_async_bundle_falls_back_on_parser_output(analyzer):
+    failing = FailingCall()
+
+    async def generate_async(prompt, schema=None):
+        failing(prompt, schema)
+
+    analyzer._generate_async = generate_async
+    result = asyncio.run(analyzer.screening_bundle_async(PARSED_RESUME, JOB_CONFIG, company_culture='Remote-first'))
+
+    assert result['mode'] == 'fan_out'
+    assert set(result) >= {'analysis', 'interview_questions', 'roadmap', 'culture_fit'}
+
+
+BUNDLE_RESPONSE = json.dumps({
+    'analysis': {'education': 80, 'experience': 70, 'domain': 85, 'language': 75, 'skill_match': 60,
+                 'overall_score': 74, 'recommendation': 'Recommended'},
+    'interview_questions': {category: ['Question?'] for category in INTERVIEW_CATEGORIES},
+    'roadmap': 'Learn Spark',
+    'culture_fit': 'Good fit',
+})
+
+
+def test_empty_sections_are_rejected(analyzer):
+    with pytest.raises(ValueError):
+        analyzer.screening_bundle(PARSED_RESUME, JOB_CONFIG, sections=[])
+
+
+def test_bundle_analysis_shares_the_analysis_cache(analyzer):
+    analyzer._generate = lambda prompt, schema=None: SimpleNamespace(text=BUNDLE_RESPONSE)
+    first = analyzer.screening_bundle(PARSED_RESUME, JOB_CONFIG)
+    assert first['mode'] == 'bundle'
+    assert first['analysis']['cache_status'] == 'miss'
+
+    # A single call for the same candidate and job returns the bundle's analysis
+    analyzer._generate = FailingCall()
+    single = analyzer.analyze_resume_quality(PARSED_RESUME, JOB_CONFIG)
+    assert single['cache_status'] == 'memory'
+    assert single['analysis'] == first['analysis']['analysis']
+    assert analyzer._generate.prompts == []
@@ -0,0 +1,37 @@
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from grammar_checker import GrammarChecker
+
+
+def _no_java(language):
+    raise OSError('java not found')
+
+
+@pytest.fixture
+def failed_checker(tmp_path, monkeypatch):
+    monkeypatch.setitem(sys.modules, 'language_tool_python', SimpleNamespace(LanguageTool=_no_java))
+    monkeypatch.setenv('GRAMMAR_CHECK_CACHE_PATH', str(tmp_path / 'grammar.sqlite3'))
+    checker = GrammarChecker(workers=1)
+    assert checker._ready.wait(10)
+    yield checker
+    checker.close()
+
+
+def test_failed_start_is_reported(failed_checker):
+    assert failed_checker.unavailable
+    assert failed_checker.stats()['server'] == 'failed'
+    with pytest.raises(RuntimeError, match='java not found'):
+        failed_checker.check('Led a team of five engineers.')
+
+
+def test_no_pending_check_once_languagetool_failed(failed_checker):
+    pytest.importorskip('firebase_admin')
+    from resume_screening_service import ResumeScreeningService
+
+    service = SimpleNamespace(grammar_checker=failed_checker)
+    parsed_data = {'raw_text': 'Led a team of five engineers.', 'language_quality': {'grammar_score': 70}}
+
+    assert ResumeScreeningService._merge_cached_grammar(service, parsed_data) == (parsed_data, None)
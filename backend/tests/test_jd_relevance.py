@@ -0,0 +1,120 @@
+import json
+
+import pytest
+
+from jd_relevance import JDRelevanceIndex
+
+JOB = {
+    'job_title': 'Backend Engineer',
+    'job_description': 'Build Python APIs with Django and PostgreSQL on AWS.',
+    'required_skills': ['python', 'django', 'postgresql'],
+    'optional_skills': ['aws', 'docker'],
+}
+POOL = [
+    ('c1', 'Python developer: Django REST APIs, PostgreSQL, Docker on AWS.'),
+    ('c2', 'Sales executive with CRM, lead generation and account management.'),
+    ('c3', 'Java engineer, Spring Boot, MySQL, some Python scripting.'),
+]
+NEW_RESUMES = [
+    ('n1', 'Senior Python engineer building Django services with PostgreSQL.'),
+    ('n2', 'HR generalist: recruitment, payroll, employee relations.'),
+    ('n3', 'Data analyst using Python, pandas and SQL dashboards.'),
+]
+
+
+def index_with_pool(pool):
+    return JDRelevanceIndex(load_pool=lambda job_id: list(pool), weight=0.1, min_pool=len(POOL))
+
+
+def test_weight_defaults_to_off(monkeypatch):
+    monkeypatch.delenv('JD_RELEVANCE_WEIGHT', raising=False)
+    assert JDRelevanceIndex(load_pool=lambda job_id: []).weight == 0
+
+
+def test_scores_do_not_depend_on_screening_order():
+    forward = index_with_pool(POOL)
+    backward = index_with_pool(POOL)
+    forward_scores = {cid: forward.score('job', JOB, cid, text) for cid, text in NEW_RESUMES}
+    backward_scores = {cid: backward.score('job', JOB, cid, text) for cid, text in reversed(NEW_RESUMES)}
+
+    assert forward_scores == backward_scores
+    # Rescreening a candidate gives the same score
+    assert forward.score('job', JOB, 'n1', NEW_RESUMES[0][1]) == forward_scores['n1']
+    assert forward_scores['n1'] > forward_scores['n2']
+
+
+def test_single_scores_match_pool_scores_of_the_fitted_pool():
+    index = index_with_pool(POOL)
+    pool_scores = index.score_pool('job', JOB, POOL)
+    assert [index.score('job', JOB, cid, text) for cid, text in POOL] == pytest.approx(pool_scores)
+
+
+def test_refit_only_on_explicit_rescore():
+    index = index_with_pool(POOL)
+    before = index.score('job', JOB, 'n1', NEW_RESUMES[0][1])
+    index.score_pool('job', JOB, POOL + NEW_RESUMES)
+    assert index.stats()['fits'] == 1
+    assert index.score('job', JOB, 'n1', NEW_RESUMES[0][1]) == before
+
+    index.score_pool('job', JOB, POOL + NEW_RESUMES, refit=True)
+    assert index.stats()['fits'] == 2
+    assert index.stats()['fitted_documents'] == 1 + len(POOL) + 1 + len(POOL) + len(NEW_RESUMES)
+
+
+def test_job_text_change_refits():
+    index = index_with_pool(POOL)
+    index.score('job', JOB, 'n1', NEW_RESUMES[0][1])
+    index.score('job', dict(JOB, job_title='Platform Engineer'), 'n1', NEW_RESUMES[0][1])
+    assert index.stats()['fits'] == 2
+
+
+def test_no_model_below_the_minimum_pool():
+    pool = list(POOL)
+    index = JDRelevanceIndex(load_pool=lambda job_id: list(pool), weight=0.1, min_pool=4)
+
+    assert index.score('job', JOB, 'n1', NEW_RESUMES[0][1]) is None
+    assert index.score_pool('job', JOB, POOL, refit=True) == [None] * len(POOL)
+    assert index.stats()['fits'] == 0
+
+    pool.append(NEW_RESUMES[2])
+    assert index.score('job', JOB, 'n1', NEW_RESUMES[0][1]) > 0
+    assert index.stats()['fits'] == 1
+    assert index.stats()['pool_too_small'] == 2
+
+
+def test_saved_fit_is_reused_after_a_restart():
+    fits = {}
+    pool = list(POOL)
+
+    def make_index():
+        # Saved as JSON, like the leaderboard does
+        return JDRelevanceIndex(load_pool=lambda job_id: list(pool), weight=0.1, min_pool=len(POOL),
+                                load_fit=lambda job_id, key: fits.get((job_id, key)),
+                                save_fit=lambda job_id, key, state: fits.__setitem__(
+                                    (job_id, key), json.loads(json.dumps(state))))
+
+    first = make_index()
+    scores = [first.score('job', JOB, cid, text) for cid, text in NEW_RESUMES]
+
+    # The pool grew before the restart; the restarted process scores with the saved fit
+    pool.extend(NEW_RESUMES)
+    restarted = make_index()
+    assert [restarted.score('job', JOB, cid, text) for cid, text in NEW_RESUMES] == scores
+    assert restarted.stats()['fits'] == 0 and restarted.stats()['loaded'] == 1
+
+    # A rescore refits on the current pool and replaces the saved fit
+    restarted.score_pool('job', JOB, pool, refit=True)
+    assert make_index().score('job', JOB, 'n1', NEW_RESUMES[0][1]) == restarted.score('job', JOB, 'n1', NEW_RESUMES[0][1])
+    assert len(fits) == 1
+
+
+def test_saved_fit_is_not_used_for_edited_job_text():
+    fits = {}
+    index = JDRelevanceIndex(load_pool=lambda job_id: list(POOL), weight=0.1, min_pool=1,
+                             load_fit=lambda job_id, key: fits.get((job_id, key)),
+                             save_fit=lambda job_id, key, state: fits.__setitem__((job_id, key), state))
+    index.score('job', JOB, 'n1', NEW_RESUMES[0][1])
+    index.invalidate('job')
+    index.score('job', dict(JOB, job_title='Platform Engineer'), 'n1', NEW_RESUMES[0][1])
+    assert index.stats()['fits'] == 2
+    assert index.stats()['loaded'] == 0
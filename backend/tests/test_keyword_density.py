@@ -0,0 +1,56 @@
+import re
+
+import pytest
+
+from resume_sections import PhraseCounts
+from skill_matcher import SkillMatcher
+
+COMPOUND_TEXT = """
+Senior Engineer - Machine Learning/Deep Learning platform (REST API-based services)
+Stack: Node.js/Express, React, Python, C++, C#, .NET, ASP.NET; UI/UX/Design reviews
+Built machine learning pipelines; machine-learning ops; deep learning; data-driven teams.
+Human Resources-facing tools, team lead/mentor, CI/CD, A/B testing, REST API, rest api.
+"""
+
+KEYWORDS = [
+    'machine learning', 'deep learning', 'rest api', 'api', 'node.js', 'node', 'express',
+    'ui/ux', 'ui', 'ux', 'design', 'c++', 'c#', '.net', 'asp.net', 'net', 'ci/cd',
+    'a/b testing', 'human resources', 'team lead', 'data-driven', 'machine-learning',
+    'Python', 'React', 'learning', 'learning learning', 'missing keyword',
+]
+
+
+def baseline_occurrences(text, keyword):
+    """Keyword count as calculate_keyword_density computed it with one regex per keyword"""
+    return len(re.findall(r'\b' + re.escape(keyword.lower()) + r'\b', text.lower()))
+
+
+@pytest.mark.parametrize('keyword', KEYWORDS)
+def test_phrase_counts_match_regex_on_compound_text(keyword):
+    counts = PhraseCounts(COMPOUND_TEXT.lower())
+    assert counts.count(keyword) == baseline_occurrences(COMPOUND_TEXT, keyword)
+
+
+def test_compound_keywords_are_counted():
+    counts = PhraseCounts(COMPOUND_TEXT.lower())
+    assert counts.count('machine learning') == 2
+    assert counts.count('rest api') == 3
+    assert counts.count('ui/ux') == 1
+    assert counts.count('node.js') == 1
+
+
+def test_repeated_phrase_matches_do_not_overlap():
+    text = 'learning learning learning'
+    assert PhraseCounts(text).count('learning learning') == baseline_occurrences(text, 'learning learning') == 1
+
+
+def test_keyword_density_matches_baseline():
+    result = SkillMatcher().calculate_keyword_density(COMPOUND_TEXT, KEYWORDS)
+    word_count = len(COMPOUND_TEXT.split())
+
+    for keyword in KEYWORDS:
+        occurrences = baseline_occurrences(COMPOUND_TEXT, keyword)
+        stats = result['keyword_stats'][keyword]
+        assert stats['occurrences'] == occurrences
+        assert stats['found'] == (occurrences > 0)
+        assert stats['density'] == round(occurrences / word_count * 100, 2)
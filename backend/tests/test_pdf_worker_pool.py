@@ -0,0 +1,50 @@
+import pytest
+
+import pdf_worker_pool
+from pdf_worker_pool import PDFExtractionError, PDFExtractionPool
+
+
+@pytest.fixture
+def pool():
+    pool = PDFExtractionPool(workers=1, timeout_seconds=10, memory_limit_mb=0, max_docs_per_worker=0)
+    yield pool
+    pool.close()
+
+
+def lose_worker(pool, monkeypatch):
+    """Crash the only worker while worker restarts fail"""
+    worker = pool._idle.get_nowait()
+    pool._idle.put(worker)
+    worker.process.kill()
+    worker.process.wait()
+
+    def cannot_start(command):
+        raise OSError('fork failed')
+
+    monkeypatch.setattr(pdf_worker_pool, '_Worker', cannot_start)
+    with pytest.raises(PDFExtractionError):
+        pool.extract(b'%PDF-1.4')
+    monkeypatch.undo()
+
+
+def test_lost_worker_is_restarted_on_next_extract(pool, monkeypatch):
+    lose_worker(pool, monkeypatch)
+    assert pool.stats()['live_workers'] == 0
+
+    # Not a PDF: the worker replies with an extraction error instead of hanging
+    with pytest.raises(PDFExtractionError, match='Could not extract'):
+        pool.extract(b'not a pdf')
+    assert pool.stats()['live_workers'] == 1
+    assert pool.stats()['idle_workers'] == 1
+
+
+def test_extract_fails_when_no_worker_can_start(pool, monkeypatch):
+    lose_worker(pool, monkeypatch)
+
+    def cannot_start(command):
+        raise OSError('fork failed')
+
+    monkeypatch.setattr(pdf_worker_pool, '_Worker', cannot_start)
+    with pytest.raises(PDFExtractionError, match='Could not start'):
+        pool.extract(b'%PDF-1.4')
+    assert pool.stats()['live_workers'] == 0
@@ -0,0 +1,49 @@
+from persistent_cache import PersistentLRUCache, sha256_hex
+
+
+def make_cache(tmp_path, max_entries=2):
+    return PersistentLRUCache('test', db_path=str(tmp_path / 'cache.sqlite3'), max_entries=max_entries)
+
+
+def test_memory_lru_evicts_oldest_and_disk_keeps_everything(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.set('a', {'n': 1})
+    cache.set('b', {'n': 2})
+    assert cache.get_with_status('a') == ({'n': 1}, 'memory')
+    cache.set('c', {'n': 3})
+
+    assert cache.stats()['memory_entries'] == 2
+    assert cache.get_with_status('b') == ({'n': 2}, 'disk')
+    assert cache.get_with_status('b') == ({'n': 2}, 'memory')
+    assert cache.get_with_status('missing') == (None, 'miss')
+
+
+def test_entries_survive_a_restart(tmp_path):
+    make_cache(tmp_path).set('resume', {'skills': ('python', 'sql')})
+
+    value, status = make_cache(tmp_path).get_with_status('resume')
+    # Values round-trip through JSON: tuples come back as lists, even from memory
+    assert (value, status) == ({'skills': ['python', 'sql']}, 'disk')
+
+
+def test_delete_and_clear_drop_both_levels(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.delete('a')
+    assert cache.get('a') is None
+    cache.clear()
+    assert make_cache(tmp_path).get('b') is None
+
+
+def test_unwritable_store_falls_back_to_memory(tmp_path):
+    blocker = tmp_path / 'file'
+    blocker.write_text('not a directory')
+    cache = PersistentLRUCache('test', db_path=str(blocker / 'cache.sqlite3'))
+    cache.set('a', 1)
+    assert cache.get_with_status('a') == (1, 'memory')
+
+
+def test_sha256_hex_separates_parts():
+    assert sha256_hex('ab', 'c') != sha256_hex('a', 'bc')
+    assert sha256_hex(b'pdf', '1.5') == sha256_hex('pdf', '1.5')
@@ -0,0 +1,70 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from pdf_worker_pool import PDFExtractionError, PDFExtractionTimeout, PDFWorkerUnavailable
+from screening_job_queue import PermanentJobError
+from screening_tiers import ScreeningTier
+
+PAYLOAD = {'resume_base64': 'JVBERi0xLjQK', 'resume_filename': 'cv.pdf', 'job_id': 'job-1',
+           'candidate_name': 'Asha', 'enable_ai': False}
+
+
+@pytest.fixture
+def service():
+    pytest.importorskip('firebase_admin')
+    from resume_screening_service import ResumeScreeningService
+
+    tier = ScreeningTier('standard', workers=1)
+    service = SimpleNamespace(tier=tier, recorded=[])
+    for name in ('_run_queued_screening', '_screen_async', '_screen_without_ai', '_gate_ai'):
+        setattr(service, name, getattr(ResumeScreeningService, name).__get__(service))
+    service._tier_for = lambda request: tier
+    service.get_job_requirements = lambda job_id: {'job_title': 'Engineer'}
+    service._record_screening = lambda request, result: service.recorded.append(result)
+    service._schedule_grammar_check = lambda *args: None
+    service.ai_gate = SimpleNamespace(decide=lambda enable_ai, score: None)
+    yield service
+    tier.executor.shutdown()
+
+
+def _fail_with(error):
+    def parse(resume_bytes, use_nlp=True, pdf_pool=None):
+        raise error
+    return parse
+
+
+def test_queued_screening_runs_on_the_tier_pool(service):
+    threads = []
+
+    def screen(request, tier):
+        threads.append(threading.current_thread().name)
+        return {'success': True, 'ai_score': 61.0, 'candidate_id': 'c1', 'tier': tier.name}, {}, {}
+
+    service._screen_without_ai = screen
+    result = service._run_queued_screening(PAYLOAD)
+
+    assert result['success'] and result['ai_score'] == 61.0
+    assert threads[0].startswith('screening-standard')
+    assert service.recorded and service.tier.stats()['screenings'] == 1
+
+
+@pytest.mark.parametrize('payload, error', [
+    (dict(PAYLOAD, resume_base64='abc'), None),
+    (PAYLOAD, PDFExtractionTimeout('PDF extraction timed out')),
+    (PAYLOAD, PDFExtractionError('Could not extract text')),
+])
+def test_unreadable_resumes_fail_permanently(service, payload, error):
+    service._parse_resume_cached = _fail_with(error or AssertionError('not reached'))
+
+    with pytest.raises(PermanentJobError):
+        service._run_queued_screening(payload)
+
+
+@pytest.mark.parametrize('error', [PDFWorkerUnavailable('PDF worker pool is closed'), RuntimeError('Firebase down')])
+def test_other_failures_are_retried(service, error):
+    service._parse_resume_cached = _fail_with(error)
+
+    with pytest.raises(type(error)):
+        service._run_queued_screening(PAYLOAD)
@@ -0,0 +1,78 @@
+import random
+
+import pytest
+
+from resume_scorer import ResumeScorer
+from screening_context import ScreeningContext
+
+DOMAINS = ['IT', 'Data Science', 'Marketing', 'Finance', 'HR', 'Sales', 'Design', 'Management']
+TITLES = ['Software Engineer', 'Data Scientist', 'Marketing Lead', 'Financial Analyst', 'HR Manager',
+          'Sales Director', 'UI Designer', 'Intern', 'Technical Account Manager']
+REQUIREMENTS = [
+    {},
+    {'required_education_level': 4, 'required_experience_years': 5, 'target_domain': 'Data Science'},
+    {'required_education_level': 2, 'required_experience_years': 0, 'target_domain': 'HR'},
+    {'required_education_level': 3, 'required_experience_years': 2, 'target_domain': 'Unknown'},
+]
+
+
+def random_resume(rng):
+    domain_scores = {domain: {'score': rng.choice([0, 0, 1, 2, 3, 7, 12]), 'matched_keywords': []}
+                     for domain in rng.sample(DOMAINS, rng.randint(0, len(DOMAINS)))}
+    primary = max(domain_scores, key=lambda d: domain_scores[d]['score']) if domain_scores else 'General'
+    return {
+        'education': {'education_level': rng.choice([0, 1, 2, 3, 4, 5, '3', 'n/a']),
+                      'institutions': ['Uni'] * rng.randint(0, 3)},
+        'experience': {'total_years': rng.choice([0, 1, 2, 2.5, 3, 4.5, 6, 8, 11, 20, '7', 'unknown']),
+                       'job_titles': rng.sample(TITLES, rng.randint(0, 3)),
+                       'companies': ['Acme'] * rng.randint(0, 2)},
+        'domain': {'primary_domain': primary, 'domain_scores': domain_scores,
+                   'confidence': rng.randint(0, 15)},
+        'language_quality': {'grammar_score': rng.choice([55, 70, 83.5, 91.25, 100])},
+    }
+
+
+@pytest.mark.parametrize('requirements', REQUIREMENTS)
+def test_score_batch_matches_calculate_overall_score(requirements):
+    rng = random.Random(44)
+    scorer = ResumeScorer()
+    resumes = [random_resume(rng) for _ in range(500)]
+
+    batch = scorer.score_batch(scorer.batch_features(resumes), requirements)
+
+    for index, resume in enumerate(resumes):
+        single = scorer.calculate_overall_score(resume, requirements)
+        assert batch['education_score'][index] == single['education_component']['education_score']
+        assert batch['experience_score'][index] == single['experience_component']['experience_score']
+        assert batch['domain_alignment_score'][index] == single['domain_component']['domain_alignment_score']
+        assert batch['language_score'][index] == single['language_component']['score']
+        assert batch['overall_score'][index] == single['overall_score']
+
+
+def test_score_batch_of_no_resumes():
+    scorer = ResumeScorer()
+    batch = scorer.score_batch(scorer.batch_features([]), {'target_domain': 'IT'})
+    assert all(len(scores) == 0 for scores in batch.values())
+
+
+class KeywordMatcher:
+    def match_against_job_description(self, parsed_data, job_description, required_skills, optional_skills,
+                                      custom_keywords):
+        return {'relevance_score': 0}
+
+
+@pytest.mark.parametrize('requirements', REQUIREMENTS)
+def test_overall_scores_seed_the_same_screening(requirements):
+    rng = random.Random(7)
+    scorer = ResumeScorer()
+    resumes = [dict(random_resume(rng), skills={'skills': rng.sample(['Python', 'SQL', 'Java'], 2)})
+               for _ in range(200)]
+    job_config = dict(requirements, required_skills=['python', 'java'], optional_skills=['sql'])
+
+    for resume, overall_score_data in zip(resumes, scorer.overall_scores(resumes, job_config)):
+        single = ScreeningContext(resume, job_config, scorer, KeywordMatcher())
+        seeded = ScreeningContext(resume, job_config, scorer, KeywordMatcher(),
+                                  overall_score_data=overall_score_data)
+        assert seeded.final_score == single.final_score
+        assert seeded.build_analysis() == single.build_analysis()
+        assert 'overall_score' not in seeded.stage_counts
@@ -0,0 +1,90 @@
+import pytest
+
+from screening_context import ScreeningContext
+
+PARSED_RESUME = {
+    'skills': {'skills': ['Python', 'SQL']},
+    'education': {'degree': 'B.Tech'},
+    'experience': {'total_years': 3},
+    'domain': 'IT',
+    'language_quality': {'score': 72},
+}
+JOB_CONFIG = {
+    'job_description': 'Backend role',
+    'required_skills': ['python', 'java'],
+    'optional_skills': ['sql'],
+    'required_experience_years': 2,
+}
+
+
+class StubScorer:
+    def __init__(self, scores):
+        self.scores = scores
+        self.calls = 0
+
+    def calculate_overall_score(self, parsed_data, job_config):
+        self.calls += 1
+        return dict(self.scores)
+
+
+class StubMatcher:
+    def __init__(self, relevance_score):
+        self.relevance_score = relevance_score
+        self.calls = 0
+
+    def match_against_job_description(self, parsed_data, job_description, required_skills, optional_skills,
+                                      custom_keywords):
+        self.calls += 1
+        return {'relevance_score': self.relevance_score}
+
+
+def baseline_weighted_score(scores):
+    """Weighted score as screen_resume computed it before ScreeningContext"""
+    return (
+        scores['education'] * 0.15 +
+        scores['experience'] * 0.20 +
+        scores['domain'] * 0.10 +
+        scores['language'] * 0.10 +
+        scores['skill_match'] * 0.45
+    )
+
+
+def test_every_stage_runs_once():
+    scorer = StubScorer({'overall_score': 40})
+    matcher = StubMatcher(0)
+    ctx = ScreeningContext(PARSED_RESUME, JOB_CONFIG, scorer, matcher)
+
+    analysis = ctx.build_analysis()
+    ctx.final_score
+    ctx.recommendation
+    ctx.component_scores
+
+    assert ctx.stage_counts
+    assert all(count == 1 for count in ctx.stage_counts.values())
+    assert scorer.calls == matcher.calls == 1
+    assert analysis['skill_analysis']['matched_required'] == ['python']
+    assert analysis['skill_analysis']['missing_required'] == ['java']
+    assert analysis['skill_analysis']['matched_optional'] == ['sql']
+
+
+def test_manual_fallback_scores_match_baseline():
+    ctx = ScreeningContext(PARSED_RESUME, JOB_CONFIG, StubScorer({'overall_score': 40}), StubMatcher(0))
+
+    assert ctx.component_scores == {
+        'education': 90, 'experience': 95, 'domain': 85, 'language': 72, 'skill_match': 35.0
+    }
+    assert ctx.weighted_score == pytest.approx(baseline_weighted_score(ctx.component_scores))
+    assert ctx.final_score == pytest.approx(63.95)
+    assert ctx.recommendation == "Consider with reservations - Significant skill gaps"
+
+
+def test_scorer_components_match_baseline():
+    scorer = StubScorer({'overall_score': 90, 'education_score': 80, 'experience_score': 70,
+                         'domain_alignment_score': 60, 'language_quality_score': 50})
+    ctx = ScreeningContext(PARSED_RESUME, JOB_CONFIG, scorer, StubMatcher(65))
+
+    assert ctx.weighted_score == pytest.approx(baseline_weighted_score(
+        {'education': 80, 'experience': 70, 'domain': 60, 'language': 50, 'skill_match': 65}
+    ))
+    assert ctx.final_score == 90
+    assert ctx.recommendation == "Highly recommended - Strong match for the position"
@@ -0,0 +1,155 @@
+import threading
+import time
+
+import pytest
+
+from screening_job_queue import PermanentJobError, ScreeningJobQueue
+
+
+def wait_for(queue, job_id, status, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = queue.get(job_id)
+        if job['status'] == status:
+            return job
+        time.sleep(0.02)
+    pytest.fail(f"job {job_id} did not reach {status}: {queue.get(job_id)}")
+
+
+@pytest.fixture
+def make_queue(tmp_path):
+    queues = []
+
+    def make(handler, **kwargs):
+        kwargs.setdefault('workers', 2)
+        kwargs.setdefault('poll_seconds', 0.02)
+        kwargs.setdefault('retry_delay_seconds', 0.01)
+        queue = ScreeningJobQueue(handler, db_path=str(tmp_path / 'jobs.sqlite3'), **kwargs)
+        queues.append(queue)
+        return queue
+
+    yield make
+    for queue in queues:
+        queue.close()
+
+
+def test_job_succeeds_with_handler_result(make_queue):
+    queue = make_queue(lambda payload: {'score': payload['n'] * 2})
+    job = queue.enqueue({'n': 21})
+    done = wait_for(queue, job['job_id'], 'succeeded')
+    assert done['result'] == {'score': 42}
+    assert done['attempts'] == 1
+
+
+def test_failed_attempts_are_retried_then_fail(make_queue):
+    calls = []
+
+    def handler(payload):
+        calls.append(payload)
+        raise ValueError('unreadable resume')
+
+    queue = make_queue(handler, max_attempts=3)
+    job = queue.enqueue({'n': 1})
+    done = wait_for(queue, job['job_id'], 'failed')
+    assert len(calls) == 3
+    assert done['attempts'] == 3
+    assert done['error'] == 'unreadable resume'
+
+
+def test_job_longer_than_lease_runs_once(make_queue):
+    calls = []
+
+    def handler(payload):
+        calls.append(payload)
+        time.sleep(1.0)
+        return {'ok': True}
+
+    queue = make_queue(handler, lease_seconds=0.3)
+    job = queue.enqueue({'n': 1})
+    done = wait_for(queue, job['job_id'], 'succeeded')
+    assert len(calls) == 1
+    assert done['attempts'] == 1
+
+
+def test_taken_over_attempt_does_not_overwrite_outcome(make_queue):
+    first_started, release_first = threading.Event(), threading.Event()
+    runs = []
+
+    def handler(payload):
+        runs.append(1)
+        run = len(runs)
+        if run == 1:
+            first_started.set()
+            release_first.wait(10)
+        return {'run': run}
+
+    queue = make_queue(handler, lease_seconds=600)
+    job = queue.enqueue({'n': 1})
+    assert first_started.wait(10)
+
+    # The first worker stalls past its lease: another worker takes the job over
+    with queue._lock:
+        queue._conn.execute("UPDATE screening_jobs SET started_at = 0 WHERE job_id = ?", (job['job_id'],))
+        queue._conn.commit()
+    done = wait_for(queue, job['job_id'], 'succeeded')
+    assert done['result'] == {'run': 2}
+
+    release_first.set()
+    time.sleep(0.2)
+    assert queue.get(job['job_id'])['result'] == {'run': 2}
+    assert queue.get(job['job_id'])['attempts'] == 2
+
+
+def test_higher_priority_runs_first(make_queue):
+    order, gate = [], threading.Event()
+
+    def handler(payload):
+        gate.wait(10)
+        order.append(payload['name'])
+        return {}
+
+    queue = make_queue(handler, workers=1)
+    blocker = queue.enqueue({'name': 'blocker'})
+    wait_for(queue, blocker['job_id'], 'running')
+    low = queue.enqueue({'name': 'low'}, priority=0)
+    high = queue.enqueue({'name': 'high'}, priority=5)
+    gate.set()
+    wait_for(queue, low['job_id'], 'succeeded')
+    wait_for(queue, high['job_id'], 'succeeded')
+    assert order == ['blocker', 'high', 'low']
+
+
+def test_permanent_error_fails_without_retry(make_queue):
+    calls = []
+
+    def handler(payload):
+        calls.append(payload)
+        raise PermanentJobError('Invalid resume_base64: Incorrect padding')
+
+    queue = make_queue(handler, max_attempts=3)
+    job = queue.enqueue({'n': 1})
+    done = wait_for(queue, job['job_id'], 'failed')
+    assert len(calls) == 1
+    assert done['attempts'] == 1
+    assert done['error'] == 'Invalid resume_base64: Incorrect padding'
+
+
+def test_hung_attempt_loses_its_lease_and_is_retried(make_queue):
+    release = threading.Event()
+    runs = []
+
+    def handler(payload):
+        runs.append(1)
+        if len(runs) == 1:
+            release.wait(10)
+        return {'run': len(runs)}
+
+    queue = make_queue(handler, lease_seconds=0.3, attempt_seconds=0.2)
+    job = queue.enqueue({'n': 1})
+    done = wait_for(queue, job['job_id'], 'succeeded')
+    assert done['result'] == {'run': 2}
+    assert done['attempts'] == 2
+
+    release.set()
+    time.sleep(0.2)
+    assert queue.get(job['job_id'])['result'] == {'run': 2}
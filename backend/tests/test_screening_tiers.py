@@ -0,0 +1,18 @@
+import pytest
+
+from screening_tiers import ScreeningTier, create_tiers
+
+
+def test_pdf_workers_default_to_the_pool_size(monkeypatch):
+    monkeypatch.setenv('PDF_POOL_WORKERS', '3')
+    monkeypatch.setenv('SCREENING_FAST_PDF_WORKERS', '5')
+    monkeypatch.setenv('SCREENING_DEEP_PDF_WORKERS', '0')
+    tiers = create_tiers()
+
+    assert {name: tier.pdf_workers for name, tier in tiers.items()} == {'fast': 5, 'standard': 3, 'deep': 0}
+    assert all(tier.pdf_pool is None and tier.stats()['pdf_workers'] == 0 for tier in tiers.values())
+
+
+def test_unknown_tier_is_rejected():
+    with pytest.raises(ValueError, match='Unknown screening tier'):
+        ScreeningTier('bulk')
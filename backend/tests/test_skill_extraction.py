@@ -0,0 +1,65 @@
+import re
+
+import pytest
+
+from enhanced_resume_parser import compile_skill_set
+from skill_ontology import SKILL_CATEGORIES
+
+DEFAULT_SKILLS = [skill for skills in SKILL_CATEGORIES.values() for skill in skills]
+CUSTOM_SKILLS = ['Node.js', 'ExpressJS', 'Vue.js', 'ASP.NET', '.NET', 'C', 'C++', 'C#', 'R', 'Machine Learning',
+                 'CI/CD', 'Power BI', 'nextjs', 'Go']
+
+RESUMES = [
+    "Full-stack developer: Node.js/Express, expressjs middleware, vue js, React & Redux. CI/CD on AWS.",
+    "Data scientist (R, Python, SQL); machine-learning models in TensorFlow, PyTorch; Power BI dashboards.",
+    "Embedded engineer - C, C++ and C# on .NET / ASP.NET Core; Linux, Git, Docker, Kubernetes.",
+    "Worked with nodejs, next.js and Go microservices; golang; mongodb, PostgreSQL, Redis.",
+    "Sales lead with CRM experience, Excel, communication, leadership and negotiation skills.",
+    "",
+]
+
+
+def baseline_extract(skills, text):
+    """Skills found by the per-variant regex loop extract_skills used before the trie"""
+    text_lower = text.lower()
+    found_skills = []
+    for skill in skills:
+        skill_lower = skill.lower().strip()
+        variations = set([skill_lower])
+        if '.' in skill_lower:
+            variations.add(skill_lower.replace('.', ''))
+            variations.add(skill_lower.replace('.', ' '))
+            variations.add(skill_lower.split('.')[0])
+        else:
+            if skill_lower.endswith('js') and len(skill_lower) > 2:
+                base = skill_lower[:-2]
+                variations.update({base + '.js', base + ' js', base})
+        if 'js' in skill_lower and skill_lower.endswith('js') and len(skill_lower) > 2:
+            base = skill_lower[:-2]
+            variations.update({base + '.js', base + ' js', base})
+        if skill_lower in ['c', 'c++', 'c#', 'r']:
+            variations = {skill_lower}
+        # Dropped on purpose by the trie: an empty variant (".net") matched any punctuation
+        variations.discard('')
+
+        for variant in variations:
+            if skill_lower in ['c', 'c++', 'c#', 'r']:
+                pattern = r'\b' + re.escape(variant) + r'\b'
+            else:
+                pattern = r'(?:^|[^a-zA-Z])' + re.escape(variant) + r'(?:[^a-zA-Z]|$)'
+            if re.search(pattern, text_lower):
+                found_skills.append(skill)
+                break
+    return found_skills
+
+
+@pytest.mark.parametrize('text', RESUMES)
+@pytest.mark.parametrize('skills', [DEFAULT_SKILLS, CUSTOM_SKILLS], ids=['default', 'custom'])
+def test_trie_matches_regex_loop(skills, text):
+    assert compile_skill_set(tuple(skills)).find(text.lower()) == baseline_extract(skills, text)
+
+
+def test_overlapping_variants_are_all_found():
+    skills = ('Node.js', 'Node', 'Express', 'ExpressJS')
+    found = compile_skill_set(skills).find('node.js/expressjs')
+    assert found == baseline_extract(skills, 'node.js/expressjs') == ['Node.js', 'Node', 'ExpressJS']
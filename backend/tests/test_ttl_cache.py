@@ -0,0 +1,81 @@
+import threading
+import time
+
+import ttl_cache
+from ttl_cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+def test_expired_entries_are_pruned_on_store(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(ttl_cache.time, 'monotonic', clock.monotonic)
+    cache = TTLCache(ttl_seconds=10)
+
+    for key in range(100):
+        cache.get_or_load(key, lambda: ('value', True))
+    clock.now += 11
+    cache.get_or_load('fresh', lambda: ('value', True))
+
+    assert cache.stats()['entries'] == 1
+    assert cache.stats()['expired'] == 100
+
+
+def test_invalidation_generations_are_not_kept():
+    cache = TTLCache(ttl_seconds=60)
+    for key in range(100):
+        cache.get_or_load(key, lambda: ('value', True))
+        cache.invalidate(key)
+    cache.clear()
+
+    assert cache._generations == {}
+    assert cache.stats()['entries'] == 0
+
+
+def test_invalidation_during_load_skips_the_store():
+    cache = TTLCache(ttl_seconds=60)
+    started, release = threading.Event(), threading.Event()
+
+    def slow_loader():
+        started.set()
+        release.wait(5)
+        return 'stale', True
+
+    loader = threading.Thread(target=cache.get_or_load, args=('job', slow_loader))
+    loader.start()
+    started.wait(5)
+    cache.invalidate('job')
+    release.set()
+    loader.join(5)
+
+    assert cache.get_or_load('job', lambda: ('fresh', True)) == 'fresh'
+    assert cache._generations == {}
+
+
+def test_concurrent_misses_load_once():
+    cache = TTLCache(ttl_seconds=60)
+    calls, release = [], threading.Event()
+
+    def loader():
+        calls.append(1)
+        release.wait(5)
+        return 'value', True
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_load('job', loader))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    while cache.stats()['misses'] + cache.stats()['coalesced'] < 8:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert results == ['value'] * 8
@@ -0,0 +1,113 @@
+"""
+TTL Cache
+Thread-safe read-through cache with expiry, explicit invalidation and
+coalescing of concurrent misses (only one loader runs per key at a time)
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+class TTLCache:
+    """
+    Read-through cache whose entries expire after ``ttl_seconds``.
+
+    ``get_or_load`` runs the loader once per key even when many threads miss
+    at the same time; the others wait for and share its result (or exception).
+    Expired entries are swept out on store, at most once per ``ttl_seconds``,
+    and invalidation generations are only kept for keys being loaded.
+    """
+
+    def __init__(self, ttl_seconds: float = 300.0) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._inflight: Dict[Hashable, Future] = {}
+        # Invalidations of keys whose load is in flight (the load's result is then not stored)
+        self._generations: Dict[Hashable, int] = {}
+        self._next_prune = time.monotonic() + ttl_seconds
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "coalesced": 0, "loads": 0, "invalidations": 0, "expired": 0}
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Tuple[Any, bool]]) -> Any:
+        """
+        Return the cached value for key, loading it on a miss
+
+        Args:
+            key: Cache key
+            loader: Zero-argument callable returning (value, cacheable). Values
+                with cacheable=False are returned to every waiter but not stored.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._stats["hits"] += 1
+                return entry[1]
+
+            future = self._inflight.get(key)
+            if future is not None:
+                self._stats["coalesced"] += 1
+                leader = False
+            else:
+                self._stats["misses"] += 1
+                future = Future()
+                self._inflight[key] = future
+                generation = self._generations.get(key, 0)
+                leader = True
+
+        if not leader:
+            return future.result()
+
+        try:
+            value, cacheable = loader()
+        except BaseException as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+                self._generations.pop(key, None)
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._stats["loads"] += 1
+            self._inflight.pop(key, None)
+            # Skip the store if the key was invalidated while we were loading
+            if cacheable and self._generations.pop(key, 0) == generation:
+                now = time.monotonic()
+                self._entries[key] = (now + self.ttl_seconds, value)
+                if now >= self._next_prune:
+                    self._prune(now)
+        future.set_result(value)
+        return value
+
+    def _prune(self, now: float) -> None:
+        """Drop expired entries (caller holds the lock)"""
+        expired = [key for key, (expires_at, _) in self._entries.items() if expires_at <= now]
+        for key in expired:
+            del self._entries[key]
+        self._stats["expired"] += len(expired)
+        self._next_prune = now + self.ttl_seconds
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a key so the next read reloads it"""
+        with self._lock:
+            self._entries.pop(key, None)
+            if key in self._inflight:
+                self._generations[key] = self._generations.get(key, 0) + 1
+            self._stats["invalidations"] += 1
+
+    def clear(self) -> None:
+        """Drop every entry"""
+        with self._lock:
+            for key in self._inflight:
+                self._generations[key] = self._generations.get(key, 0) + 1
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss/coalescing counters"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+        return stats